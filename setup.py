@@ -27,13 +27,17 @@ setup(
     python_requires=">=3.8",
     install_requires=base_requirements,
     extras_require={
-        "openai": ["openai>=1.0.0"],
+        "openai": ["openai>=1.0.0", "tiktoken>=0.5.0"],
+        "onnx": ["optimum[onnxruntime]>=1.16.0"],
         "dev": read_requirements("requirements/dev.txt"),
         "all": read_requirements("requirements/optional.txt")
     },
     entry_points={
         "console_scripts": [
             "analyze-transcript=src.main:main",
+            "transcribe-batch=src.batch_transcribe:main",
+            "transcript-pipeline=src.pipeline:main",
+            "search-transcripts=src.search_index:main",
         ],
     },
     classifiers=[
@@ -1,10 +1,45 @@
+import importlib
+
 from .basic_analyzer import BasicAnalyzer
-from .openai_analyzer import OpenAIAnalyzer, OPENAI_AVAILABLE
-from .huggingface_analyzer import HuggingFaceAnalyzer, HUGGING_FACE_AVAILABLE
+
+# Analyseurs disponibles : nom (option --analyzer) -> (module, classe).
+# Les modules qui dépendent de torch/transformers ou d'openai ne sont importés
+# qu'à la première utilisation, pour que l'analyseur basique démarre vite.
+ANALYZERS = {
+    "basic": (".basic_analyzer", "BasicAnalyzer"),
+    "huggingface": (".huggingface_analyzer", "HuggingFaceAnalyzer"),
+    "openai": (".openai_analyzer", "OpenAIAnalyzer"),
+}
+
+# Noms exportés par les modules chargés à la demande
+_LAZY_EXPORTS = {
+    "OpenAIAnalyzer": ".openai_analyzer",
+    "AsyncOpenAIAnalyzer": ".openai_analyzer",
+    "OPENAI_AVAILABLE": ".openai_analyzer",
+    "HuggingFaceAnalyzer": ".huggingface_analyzer",
+    "HUGGING_FACE_AVAILABLE": ".huggingface_analyzer",
+}
+
+
+def load_analyzer_module(analyzer_type: str):
+    """Importe et retourne le module d'un analyseur enregistré dans ANALYZERS."""
+    if analyzer_type not in ANALYZERS:
+        raise ValueError(f"Analyseur inconnu : {analyzer_type} (attendu : {', '.join(ANALYZERS)})")
+    return importlib.import_module(ANALYZERS[analyzer_type][0], __name__)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
+    'ANALYZERS',
+    'load_analyzer_module',
     'BasicAnalyzer',
     'OpenAIAnalyzer',
+    'AsyncOpenAIAnalyzer',
     'HuggingFaceAnalyzer',
     'OPENAI_AVAILABLE',
     'HUGGING_FACE_AVAILABLE'
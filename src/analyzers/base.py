@@ -1,9 +1,33 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict
+from contextlib import nullcontext
+from typing import ContextManager, Dict, Iterable, Optional, Tuple, Union
 
 class TextAnalyzer(ABC):
     """Classe abstraite pour l'analyse de texte"""
-    
+
+    # Nom de la méthode d'analyse affiché dans les documents générés
+    display_name = "basique"
+
+    # Exécution par DocumentGenerator des étapes indépendantes (sections et résumé) :
+    # None (l'une après l'autre, ou concurrence gérée par l'analyseur lui-même),
+    # "thread" pour un analyseur limité par les entrées-sorties ou qui libère le GIL,
+    # "process" pour un analyseur limité par le calcul en Python (il doit alors
+    # pouvoir être transmis à un autre processus)
+    stage_concurrency: Optional[str] = None
+
+    # Analyse incrémentale par DocumentGenerator : pour les analyseurs coûteux,
+    # le texte est traité paragraphe par paragraphe et section par section avec
+    # les méthodes clean_paragraph, split_sections, refine_section et
+    # summarize_text, dont les résultats sont conservés dans un manifeste et
+    # réutilisés tant que leur entrée ne change pas. Ces méthodes sont appelées
+    # depuis plusieurs threads.
+    incremental = False
+
+    # Nombre d'étapes de l'analyse incrémentale exécutées en même temps
+    # (None : analysis.incremental_workers dans la configuration)
+    stage_workers: Optional[int] = None
+
     @abstractmethod
     def clean_text(self, text: str) -> str:
         """Nettoie le texte en supprimant les répétitions et en améliorant la ponctuation."""
@@ -17,4 +41,79 @@ class TextAnalyzer(ABC):
     @abstractmethod
     def extract_sections(self, text: str) -> Dict[str, str]:
         """Extrait les sections principales du texte."""
-        pass 
\ No newline at end of file
+        pass 
+
+    def analyze(self, text: str, max_length: int = 1500) -> Tuple[str, Dict[str, str]]:
+        """Enchaîne nettoyage, extraction des sections et résumé.
+
+        Les analyseurs capables de paralléliser ces étapes peuvent surcharger
+        cette méthode.
+
+        Returns:
+            Tuple (résumé, sections)
+        """
+        logging.info("Nettoyage du texte...")
+        cleaned_text = self.clean_text(text)
+
+        logging.info("Extraction des sections...")
+        sections = self.extract_sections(cleaned_text)
+
+        logging.info("Création du résumé...")
+        summary = self.create_summary(cleaned_text, max_length)
+        return summary, sections
+
+    def analyze_stream(self, chunks: Iterable[str],
+                       max_length: int = 1500) -> Tuple[str, Dict[str, Union[str, Iterable[str]]]]:
+        """Analyse un texte fourni par morceaux successifs (par exemple lu par blocs dans un fichier).
+
+        Par défaut les morceaux sont réunis puis analysés avec `analyze` ; les
+        analyseurs capables de traiter le texte au fil de l'eau surchargent
+        cette méthode.
+
+        Returns:
+            Tuple (résumé, sections) ; le contenu d'une section peut être un
+            itérable de morceaux, à parcourir une seule fois
+        """
+        return self.analyze("".join(chunks), max_length)
+
+    # --- Étapes de l'analyse incrémentale ---------------------------------
+    # Contrairement aux méthodes ci-dessus, elles lèvent une exception en cas
+    # d'échec au lieu de se replier sur une analyse dégradée, qui serait
+    # sinon conservée dans le manifeste.
+
+    def cache_key(self) -> str:
+        """Réglages dont dépendent les résultats de l'analyseur (modèle, variante, version des consignes).
+
+        Ils font partie de la clé du manifeste de l'analyse incrémentale :
+        les résultats obtenus avec d'autres réglages ne sont pas réutilisés.
+        """
+        return ""
+
+    def stage_session(self) -> ContextManager:
+        """Contexte dans lequel DocumentGenerator appelle les étapes d'un document.
+
+        Un analyseur qui partage une ressource entre les étapes (boucle
+        d'événements, client réseau) la crée à l'entrée et la libère à la
+        sortie ; le contexte peut être ouvert par plusieurs documents à la fois.
+        Par défaut, rien.
+        """
+        return nullcontext()
+
+    def clean_paragraph(self, text: str) -> str:
+        """Nettoie un paragraphe de la transcription (par défaut `clean_text`)."""
+        return self.clean_text(text)
+
+    def split_sections(self, text: str) -> Dict[str, str]:
+        """Répartit un texte nettoyé entre les sections, sans retravailler leur contenu.
+
+        Par défaut `extract_sections`, qui est alors considéré comme le résultat final.
+        """
+        return self.extract_sections(text)
+
+    def refine_section(self, title: str, content: str) -> str:
+        """Retravaille le contenu réuni d'une section (par défaut inchangé)."""
+        return content
+
+    def summarize_text(self, text: str, max_length: int = 1500) -> str:
+        """Résume le texte nettoyé complet (par défaut `create_summary`)."""
+        return self.create_summary(text, max_length)
@@ -1,57 +1,255 @@
 import re
-from typing import Dict
+import random
+import logging
+import tempfile
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from .base import TextAnalyzer
+from .extractive import MAX_TEXTRANK_SENTENCES, METHODS, NUMPY_AVAILABLE, summarize
+from .keywords import KeywordMatcher, iter_spans
+from ..utils.config import get_setting
+
+# Mots-clés par défaut, remplacés par analysis.summary_keywords et
+# analysis.section_keywords dans la configuration
+SUMMARY_KEYWORDS = ["important", "clé", "essentiel", "principal", "permet", "fonction", "capable"]
+SECTION_KEYWORDS = {
+    "Installation et Configuration": ["installer", "télécharger", "configuration", "setup"],
+    "Fonctionnalités": ["fonctionnalité", "capable", "permet"],
+    "Utilisation": ["utiliser", "exemple", "comment"],
+    "Conclusion": ["conclusion", "finalement", "bref"]
+}
+
+# Phrases : texte entre deux signes de ponctuation finale
+_SENTENCE = re.compile(r'[^.!?]+')
+_SENTENCE_END = re.compile(r'[.!?]+')
+_WHITESPACE = re.compile(r'\s+')
+_MISSING_PERIOD = re.compile(r'([a-zA-Z])\s+([A-Z])')
+
+# Taille des blocs relus dans le texte nettoyé mis de côté (en caractères)
+SPOOL_BLOCK_SIZE = 1 << 20
+
+
+def _sentence_spans(text: str):
+    return ((match.start(), match.end()) for match in _SENTENCE.finditer(text))
+
+
+def _paragraph_spans(text: str):
+    return iter_spans(text, '\n\n')
+
+
+def _candidate_sentences(text: str) -> Iterator[str]:
+    """Phrases assez longues pour figurer dans un résumé."""
+    for start, end in _sentence_spans(text):
+        sentence = text[start:end].strip()
+        if len(sentence) > 20:
+            yield sentence
+
+
+def _iter_sentence_blocks(pieces: Iterable[str]) -> Iterator[str]:
+    """Regroupe un texte fourni par morceaux en blocs qui se terminent en fin de phrase."""
+    pending = []
+    for piece in pieces:
+        end = max(piece.rfind("."), piece.rfind("!"), piece.rfind("?"))
+        if end == -1:
+            pending.append(piece)
+            continue
+        pending.append(piece[:end + 1])
+        yield "".join(pending)
+        pending = [piece[end + 1:]]
+    yield "".join(pending)
+
+
+def _iter_spooled(spool: IO[str], suffix: str = "") -> Iterator[str]:
+    """Relit par blocs un texte mis de côté dans un fichier temporaire, puis ferme ce fichier."""
+    with spool:
+        spool.seek(0)
+        while True:
+            block = spool.read(SPOOL_BLOCK_SIZE)
+            if not block:
+                break
+            yield block
+    yield suffix
+
 
 class BasicAnalyzer(TextAnalyzer):
     """Analyseur de texte basique sans IA"""
-    
+
+    def __init__(self, summary_keywords: Optional[Iterable[str]] = None,
+                 section_keywords: Optional[Dict[str, List[str]]] = None,
+                 accent_insensitive: bool = True, summary_method: Optional[str] = None):
+        """
+        Args:
+            summary_keywords: Mots-clés des phrases retenues pour le résumé (méthode "keywords")
+            section_keywords: Mots-clés qui ouvrent chaque section, par ordre de priorité
+            accent_insensitive: Ignore les accents lors de la recherche des mots-clés
+            summary_method: "textrank" ou "tfidf" (phrases les plus représentatives, avec NumPy)
+                            ou "keywords" (premières phrases contenant un mot-clé) ;
+                            par défaut analysis.basic_summary_method
+        """
+        if summary_keywords is None:
+            summary_keywords = get_setting("analysis", "summary_keywords", SUMMARY_KEYWORDS)
+        if section_keywords is None:
+            section_keywords = get_setting("analysis", "section_keywords", SECTION_KEYWORDS)
+        self.summary_matcher = KeywordMatcher({"summary": summary_keywords}, accent_insensitive)
+        self.section_matcher = KeywordMatcher(section_keywords, accent_insensitive)
+        self.summary_method = summary_method or get_setting("analysis", "basic_summary_method", "textrank")
+        if self.summary_method not in METHODS + ("keywords",):
+            raise ValueError(f"Méthode de résumé inconnue : {self.summary_method}")
+        if self.summary_method in METHODS and not NUMPY_AVAILABLE:
+            logging.warning("NumPy n'est pas disponible, résumé par mots-clés")
+            self.summary_method = "keywords"
+
+    def cache_key(self) -> str:
+        """Méthode de résumé utilisée."""
+        return self.summary_method
+
+    @staticmethod
+    def _clean_piece(text: str) -> str:
+        return _MISSING_PERIOD.sub(r'\1. \2', _WHITESPACE.sub(' ', text))
+
+    def iter_clean(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Nettoie un texte fourni par morceaux, avec le même résultat que `clean_text` sur le texte entier."""
+        carry = ""
+        started = False
+        for chunk in chunks:
+            buffer = carry + chunk
+            end = len(buffer.rstrip())
+            # Coupe entre les deux derniers caractères non blancs : aucune
+            # substitution ne traverse cette limite
+            if end < 2 or buffer[end - 2].isspace():
+                carry = buffer
+                continue
+            piece, carry = self._clean_piece(buffer[:end - 1]), buffer[end - 1:]
+            if not started:
+                piece = piece.lstrip()
+                started = bool(piece)
+            if piece:
+                yield piece
+        piece = self._clean_piece(carry).rstrip()
+        if not started:
+            piece = piece.lstrip()
+        if piece:
+            yield piece
+
     def clean_text(self, text: str) -> str:
         """Nettoie le texte en supprimant les répétitions et en améliorant la ponctuation."""
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'([a-zA-Z])\s+([A-Z])', r'\1. \2', text)
-        return text.strip()
+        return "".join(self.iter_clean([text]))
+
+    @staticmethod
+    def _join_summary(sentences: List[str], max_length: int) -> str:
+        summary = ". ".join(sentences)
+        if len(summary) > max_length:
+            summary = summary[:max_length] + "..."
+        return summary
 
     def create_summary(self, text: str, max_length: int = 1500) -> str:
         """Crée un résumé synthétique du texte."""
-        sentences = re.split(r'[.!?]+', text)
+        if self.summary_method != "keywords":
+            return self._join_summary(summarize(list(_candidate_sentences(text)), max_length,
+                                                method=self.summary_method), max_length)
+
         important_sentences = []
-        
-        keywords = ["important", "clé", "essentiel", "principal", "permet", "fonction", "capable"]
-        
-        for sentence in sentences:
+
+        for sentence, label in self.summary_matcher.classify_spans(text, _sentence_spans):
             sentence = sentence.strip()
-            if any(keyword in sentence.lower() for keyword in keywords) and len(sentence) > 20:
+            if label and len(sentence) > 20:
                 important_sentences.append(sentence)
-        
-        summary = ". ".join(important_sentences[:5])
-        if len(summary) > max_length:
-            summary = summary[:max_length] + "..."
-        
-        return summary
+                if len(important_sentences) == 5:
+                    break
+
+        return self._join_summary(important_sentences, max_length)
 
     def extract_sections(self, text: str) -> Dict[str, str]:
         """Extrait les sections du texte."""
+        # Paragraphes accumulés dans des listes puis joints une seule fois
         sections = {
+            "Introduction": [],
+            "Installation et Configuration": [],
+            "Fonctionnalités": [],
+            "Utilisation": [],
+            "Conclusion": []
+        }
+
+        current_section = "Introduction"
+
+        for para, label in self.section_matcher.classify_spans(text, _paragraph_spans):
+            current_section = label or current_section
+            sections.setdefault(current_section, []).append(para + "\n\n")
+
+        return {title: "".join(paragraphs) for title, paragraphs in sections.items()}
+
+    def analyze_stream(self, chunks: Iterable[str],
+                       max_length: int = 1500) -> Tuple[str, Dict[str, Union[str, Iterator[str]]]]:
+        """
+        Analyse un texte fourni par morceaux, au fil de la lecture, en mémoire bornée.
+
+        Le texte est nettoyé morceau par morceau, puis regroupé en blocs de
+        phrases complètes qui alimentent le résumé et le choix de la section.
+        Le texte nettoyé est mis de côté dans un fichier temporaire : le
+        contenu de sa section est un itérable qui le relit par blocs (à
+        parcourir une seule fois), les autres sections sont vides. Les
+        méthodes "textrank" et "tfidf" classent au plus MAX_TEXTRANK_SENTENCES
+        phrases, tirées uniformément dans le texte (échantillonnage par
+        réservoir) ; en deçà, le résultat est celui de `analyze` sur le texte
+        entier.
+
+        Returns:
+            Tuple (résumé, sections)
+        """
+        logging.info("Analyse du texte au fil de la lecture...")
+        spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+        important_sentences = []
+        priorities = {label: index for index, (label, _) in enumerate(self.section_matcher.groups)}
+        section = None
+
+        def spooled(pieces: Iterable[str]) -> Iterator[str]:
+            for piece in pieces:
+                spool.write(piece)
+                yield piece
+
+        ranked = self.summary_method != "keywords"
+        # Réservoir des phrases à classer : (rang dans le texte, phrase) ; graine
+        # fixe pour qu'un même texte donne toujours le même résumé
+        reservoir: List[Tuple[int, str]] = []
+        seen = 0
+        rng = random.Random(0)
+        try:
+            for block in _iter_sentence_blocks(spooled(self.iter_clean(chunks))):
+                if ranked:
+                    for sentence in _candidate_sentences(block):
+                        if len(reservoir) < MAX_TEXTRANK_SENTENCES:
+                            reservoir.append((seen, sentence))
+                        else:
+                            slot = rng.randrange(seen + 1)
+                            if slot < MAX_TEXTRANK_SENTENCES:
+                                reservoir[slot] = (seen, sentence)
+                        seen += 1
+                elif len(important_sentences) < 5:
+                    for sentence, label in self.summary_matcher.classify_spans(block, _sentence_spans):
+                        sentence = sentence.strip()
+                        if label and len(sentence) > 20:
+                            important_sentences.append(sentence)
+                            if len(important_sentences) == 5:
+                                break
+                # Le texte nettoyé ne forme qu'un paragraphe : sa section est celle du
+                # mot-clé le plus prioritaire rencontré
+                if section is None or priorities[section] > 0:
+                    label = self.section_matcher.search(block)
+                    if label and (section is None or priorities[label] < priorities[section]):
+                        section = label
+        except BaseException:
+            spool.close()
+            raise
+
+        sections: Dict[str, Union[str, Iterator[str]]] = {
             "Introduction": "",
             "Installation et Configuration": "",
             "Fonctionnalités": "",
             "Utilisation": "",
             "Conclusion": ""
         }
-        
-        paragraphs = text.split('\n\n')
-        current_section = "Introduction"
-        
-        for para in paragraphs:
-            if any(word in para.lower() for word in ["installer", "télécharger", "configuration", "setup"]):
-                current_section = "Installation et Configuration"
-            elif any(word in para.lower() for word in ["fonctionnalité", "capable", "permet"]):
-                current_section = "Fonctionnalités"
-            elif any(word in para.lower() for word in ["utiliser", "exemple", "comment"]):
-                current_section = "Utilisation"
-            elif any(word in para.lower() for word in ["conclusion", "finalement", "bref"]):
-                current_section = "Conclusion"
-                
-            sections[current_section] += para + "\n\n"
-        
-        return sections 
\ No newline at end of file
+        sections[section or "Introduction"] = _iter_spooled(spool, "\n\n")
+        if ranked:
+            # Le réservoir est remis dans l'ordre du texte avant le classement
+            important_sentences = summarize([sentence for _, sentence in sorted(reservoir)], max_length,
+                                            method=self.summary_method)
+        return self._join_summary(important_sentences, max_length), sections
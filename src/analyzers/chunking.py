@@ -0,0 +1,180 @@
+import re
+import bisect
+import logging
+from itertools import accumulate
+from typing import Callable, Iterator, List, NamedTuple, Tuple
+
+# Fin de phrase : ponctuation finale suivie d'espaces, ou saut de paragraphe
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])["»)\]]*\s+|\n\s*\n')
+
+
+class TextChunk(NamedTuple):
+    """Morceau de texte aligné sur des fins de phrases."""
+    text: str
+    start: int      # Position du premier caractère dans le texte d'origine
+    end: int        # Position après le dernier caractère
+    n_tokens: int   # Nombre de tokens estimé
+
+
+def iter_sentences(text: str) -> Iterator[Tuple[int, int]]:
+    """Retourne les positions (début, fin) de chaque phrase du texte, sans les espaces qui les séparent."""
+    position = 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        if match.start() > position:
+            yield position, match.start()
+        position = match.end()
+    if position < len(text) and text[position:].strip():
+        yield position, len(text.rstrip())
+
+
+class TokenCounter:
+    """Compteur de tokens qui sait aussi situer les tokens dans le texte.
+
+    Appelé avec un texte, il retourne son nombre de tokens comme un simple
+    compteur ; `token_ends` encode le texte une seule fois et retourne la
+    position après le dernier caractère de chaque token.
+    """
+
+    def __init__(self, count: Callable[[str], int], token_ends: Callable[[str], List[int]]):
+        self.count = count
+        self.token_ends = token_ends
+
+    def __call__(self, text: str) -> int:
+        return self.count(text)
+
+
+def approximate_token_count(text: str) -> int:
+    """Estimation grossière du nombre de tokens (environ 4 caractères par token)."""
+    return len(text) // 4 + 1
+
+
+def _approximate_token_ends(text: str) -> List[int]:
+    return list(range(4, len(text), 4)) + [len(text)]
+
+
+def openai_token_counter(model: str) -> TokenCounter:
+    """Retourne un compteur de tokens pour un modèle OpenAI (tiktoken si disponible)."""
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except ImportError:
+        logging.debug("tiktoken n'est pas installé, estimation approximative du nombre de tokens")
+        return TokenCounter(approximate_token_count, _approximate_token_ends)
+
+    def token_ends(text: str) -> List[int]:
+        _, starts = encoding.decode_with_offsets(encoding.encode(text, disallowed_special=()))
+        return starts[1:] + [len(text)] if starts else []
+
+    return TokenCounter(lambda text: len(encoding.encode(text, disallowed_special=())), token_ends)
+
+
+def tokenizer_token_counter(tokenizer) -> Callable[[str], int]:
+    """Retourne un compteur de tokens basé sur un tokenizer Hugging Face (sans les tokens spéciaux)."""
+    def count(text: str) -> int:
+        return len(tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"])
+
+    if not getattr(tokenizer, "is_fast", False):
+        # Seuls les tokenizers « rapides » (Rust) donnent la position des tokens
+        return count
+
+    def token_ends(text: str) -> List[int]:
+        offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True,
+                            verbose=False)["offset_mapping"]
+        return [end for _, end in offsets]
+
+    return TokenCounter(count, token_ends)
+
+
+def _split_long_sentence(text: str, start: int, end: int, max_tokens: int,
+                         count_tokens: Callable[[str], int]) -> Iterator[Tuple[int, int]]:
+    """
+    Découpe une phrase trop longue sur des espaces pour respecter le budget de tokens.
+
+    La phrase est encodée une seule fois (mot par mot pour un compteur qui ne
+    situe pas ses tokens) : le nombre de tokens d'un morceau est la différence
+    des nombres cumulés à ses bornes, et le découpage reste linéaire même sur
+    une longue transcription sans ponctuation.
+    """
+    words = [(m.start() + start, m.end() + start) for m in re.finditer(r'\S+', text[start:end])]
+    token_ends = getattr(count_tokens, "token_ends", None)
+    if token_ends is not None:
+        ends = token_ends(text[start:end])
+        # Tokens terminés à la fin de chaque mot
+        cumulative = [bisect.bisect_right(ends, word_end - start) for _, word_end in words]
+    else:
+        # Chaque mot compté avec les espaces qui le précèdent
+        previous_ends = [start] + [word_end for _, word_end in words[:-1]]
+        cumulative = list(accumulate(count_tokens(text[previous_end:word_end])
+                                     for previous_end, (_, word_end) in zip(previous_ends, words)))
+
+    piece_start = None
+    piece_end = None
+    piece_base = 0  # Tokens cumulés avant le morceau en cours
+    for index, (word_start, word_end) in enumerate(words):
+        if piece_start is None:
+            piece_start, piece_end = word_start, word_end
+        elif cumulative[index] - piece_base > max_tokens:
+            yield piece_start, piece_end
+            piece_base = cumulative[index - 1]
+            piece_start, piece_end = word_start, word_end
+        else:
+            piece_end = word_end
+    if piece_start is not None:
+        yield piece_start, piece_end
+
+
+def chunk_text(text: str, max_tokens: int, count_tokens: Callable[[str], int] = approximate_token_count,
+               overlap_tokens: int = 0) -> List[TextChunk]:
+    """
+    Regroupe les phrases du texte en morceaux qui respectent un budget de tokens.
+
+    Les coupures tombent en fin de phrase ; seule une phrase qui dépasse à elle
+    seule le budget est coupée entre deux mots.
+
+    Args:
+        text: Texte à découper
+        max_tokens: Nombre maximal de tokens par morceau
+        count_tokens: Fonction de comptage des tokens (tokenizer du modèle cible)
+        overlap_tokens: Nombre de tokens de fin du morceau précédent répétés au début du suivant
+
+    Returns:
+        Liste des morceaux, avec leurs positions dans le texte et leur nombre de tokens
+    """
+    spans = []
+    for start, end in iter_sentences(text):
+        n_tokens = count_tokens(text[start:end])
+        if n_tokens > max_tokens:
+            for piece in _split_long_sentence(text, start, end, max_tokens, count_tokens):
+                spans.append((piece[0], piece[1], count_tokens(text[piece[0]:piece[1]])))
+        else:
+            spans.append((start, end, n_tokens))
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for span in spans:
+        if current and current_tokens + span[2] > max_tokens:
+            chunks.append(current)
+            # Reprend les dernières phrases du morceau précédent comme contexte
+            overlap = []
+            overlap_total = 0
+            for previous in reversed(current):
+                if overlap_total + previous[2] > overlap_tokens or overlap_total + previous[2] + span[2] > max_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_total += previous[2]
+            current = overlap
+            current_tokens = overlap_total
+        current.append(span)
+        current_tokens += span[2]
+    if current:
+        chunks.append(current)
+
+    result = []
+    for spans_in_chunk in chunks:
+        start, end = spans_in_chunk[0][0], spans_in_chunk[-1][1]
+        result.append(TextChunk(text[start:end], start, end, sum(span[2] for span in spans_in_chunk)))
+    return result
@@ -0,0 +1,172 @@
+import re
+import logging
+from typing import List, Sequence
+
+from .keywords import strip_accents
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logging.debug("NumPy n'est pas installé, résumé extractif indisponible")
+
+# Mots vides du français (sans accents, comme les termes comparés), y compris
+# les tics de langage fréquents dans les transcriptions orales
+FRENCH_STOPWORDS = frozenset("""
+a ai aie aient aies ait alors as au aucun aucune aupres aura aurai auraient aurais aurait aux avaient avais avait
+avec avez aviez avions avoir avons ayant bah ben bien bon c ca car ce ceci cela celle celles celui cependant ces cet
+cette ceux chaque chez ci comme comment d dans de des deja depuis devant donc dont du elle elles en encore entre es
+est et etaient etais etait ete etes etre eu eue eux euh fait faire fais faut hein ici il ils j je jusqu l la le les
+leur leurs lui m ma mais me meme mes moi mon n ne ni nos notre nous on ont or ou par parce pas peu peut plus pour
+pourquoi puis qu quand que quel quelle quelles quels qui quoi s sa sans se ses si sien soit sommes son sont sous
+suis sur t ta te tes toi ton tous tout toute toutes tres tu un une unes uns va vais voila vos votre vous y
+""".split())
+
+# Méthodes de classement des phrases
+METHODS = ("textrank", "tfidf")
+
+# Au-delà, la matrice de similarité (phrases x phrases) de TextRank devient trop
+# coûteuse : les phrases sont classées par similarité au centroïde TF-IDF
+MAX_TEXTRANK_SENTENCES = 1500
+
+# Nombre maximal de paires de phrases (partageant un terme) cumulées à la fois
+# dans la matrice de similarité
+SIMILARITY_PAIR_BATCH = 1 << 18
+
+_WORD = re.compile(r"\w+")
+
+
+def _tokenize(sentence: str) -> List[str]:
+    return [word for word in _WORD.findall(strip_accents(sentence.lower()))
+            if len(word) > 1 and word not in FRENCH_STOPWORDS and not word.isdigit()]
+
+
+def _tfidf(sentences: Sequence[str]):
+    """
+    Pondération TF-IDF des phrases, normalisée par phrase, au format creux.
+
+    Returns:
+        Tuple (indices des phrases, indices des termes, poids, nombre de termes)
+    """
+    vocabulary = {}
+    rows = []
+    cols = []
+    for index, sentence in enumerate(sentences):
+        for word in _tokenize(sentence):
+            rows.append(index)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+    n_terms = max(1, len(vocabulary))
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), n_terms
+
+    # Occurrences de chaque terme dans chaque phrase
+    keys, counts = np.unique(np.asarray(rows, dtype=np.int64) * n_terms + np.asarray(cols, dtype=np.int64),
+                             return_counts=True)
+    rows, cols = keys // n_terms, keys % n_terms
+    document_frequency = np.bincount(cols, minlength=n_terms)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+    weights = counts * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=len(sentences)))
+    return rows, cols, weights / norms[rows], n_terms
+
+
+def _similarity(rows, cols, weights, n: int):
+    """
+    Similarité cosinus entre phrases distinctes (diagonale nulle), calculée à
+    partir des poids TF-IDF creux.
+
+    Seules les paires de phrases qui partagent un terme sont parcourues (index
+    inversé terme -> phrases) : la mémoire dépend de n x n et du nombre de
+    paires, jamais de la taille du vocabulaire.
+    """
+    order = np.argsort(cols, kind="stable")
+    rows, cols, weights = rows[order], cols[order], weights[order]
+    # Pour chaque entrée : début et taille de la liste de phrases de son terme
+    starts = np.searchsorted(cols, cols, side="left")
+    sizes = np.bincount(cols)[cols]
+    # Un terme présent dans une seule phrase ne relie aucune paire
+    entries = np.nonzero(sizes > 1)[0]
+    similarity = np.zeros(n * n)
+    position = 0
+    while position < len(entries):
+        # Lot d'entrées dont les paires tiennent dans SIMILARITY_PAIR_BATCH
+        pairs = np.cumsum(sizes[entries[position:]])
+        stop = position + max(1, int(np.searchsorted(pairs, SIMILARITY_PAIR_BATCH, side="right")))
+        batch = entries[position:stop]
+        counts = sizes[batch]
+        left = np.repeat(batch, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        right = np.repeat(starts[batch], counts) + offsets
+        similarity += np.bincount(rows[left] * n + rows[right], weights[left] * weights[right], minlength=n * n)
+        position = stop
+    similarity = similarity.reshape(n, n)
+    np.fill_diagonal(similarity, 0.0)
+    return similarity
+
+
+def score_sentences(sentences: Sequence[str], method: str = "textrank",
+                    damping: float = 0.85, iterations: int = 50, tolerance: float = 1e-6):
+    """
+    Calcule un score d'importance pour chaque phrase, en une passe vectorisée.
+
+    Args:
+        sentences: Phrases du texte
+        method: "textrank" (centralité dans le graphe de similarité des phrases)
+                ou "tfidf" (similarité au centroïde du document)
+        damping: Facteur d'amortissement de TextRank
+        iterations: Nombre maximal d'itérations de TextRank
+        tolerance: Écart en dessous duquel TextRank s'arrête
+
+    Returns:
+        Tableau NumPy des scores, dans l'ordre des phrases
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method} (attendu : {', '.join(METHODS)})")
+    n = len(sentences)
+    rows, cols, weights, n_terms = _tfidf(sentences)
+    if n == 0 or len(weights) == 0:
+        return np.zeros(n)
+
+    if method == "tfidf" or n > MAX_TEXTRANK_SENTENCES:
+        centroid = np.bincount(cols, weights, minlength=n_terms) / n
+        return np.bincount(rows, weights * centroid[cols], minlength=n)
+
+    similarity = _similarity(rows, cols, weights, n)
+    totals = similarity.sum(axis=1, keepdims=True)
+    # Une phrase sans voisin répartit son score uniformément
+    transition = np.where(totals > 0, similarity / np.where(totals > 0, totals, 1), 1.0 / n)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def summarize(sentences: Sequence[str], max_length: int = 1500, max_sentences: int = 5,
+              method: str = "textrank") -> List[str]:
+    """
+    Choisit les phrases les plus représentatives du texte.
+
+    Les phrases sont retenues par score décroissant tant que le résumé tient
+    dans `max_length` caractères, puis rendues dans l'ordre du texte.
+
+    Returns:
+        Phrases retenues, dans leur ordre d'origine
+    """
+    scores = score_sentences(sentences, method)
+    chosen = []
+    length = 0
+    # Tri stable : à score égal, la phrase la plus tôt dans le texte l'emporte
+    for index in np.argsort(-scores, kind="stable"):
+        if len(chosen) == max_sentences:
+            break
+        added = len(sentences[index]) + (2 if chosen else 0)
+        if chosen and length + added > max_length:
+            continue
+        chosen.append(int(index))
+        length += added
+    return [sentences[index] for index in sorted(chosen)]
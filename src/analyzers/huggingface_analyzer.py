@@ -1,7 +1,12 @@
 import logging
-from typing import Dict
+from contextlib import nullcontext
+from typing import Dict, List, Optional
 from .base import TextAnalyzer
 from .basic_analyzer import BasicAnalyzer
+from .chunking import TextChunk, chunk_text, tokenizer_token_counter
+from ..utils.config import get_setting
+from ..utils.model_registry import ModelRegistry, onnx_model_size, torch_model_size
+from ..utils.response_cache import ResponseCache, get_response_cache
 
 try:
     from transformers import pipeline
@@ -11,38 +16,233 @@ except ImportError as e:
     HUGGING_FACE_AVAILABLE = False
     logging.error(f"Erreur d'importation Hugging Face: {str(e)}")
 
+SUMMARIZER_MODEL = "moussaKam/barthez-orangesum-title"
+CLASSIFIER_MODEL = "dbmdz/bert-base-french-europeana-cased"
+# Pipelines utilisés par l'analyseur : (tâche, modèle)
+MODELS = (("summarization", SUMMARIZER_MODEL), ("text-classification", CLASSIFIER_MODEL))
+DEFAULT_BATCH_SIZE = 8
+# Longueur d'entrée utilisée quand ni le tokenizer ni le modèle n'en déclarent une
+DEFAULT_MAX_INPUT_TOKENS = 512
+# Variantes CPU des modèles : PyTorch standard, quantifié en int8, ou ONNX Runtime (optimum)
+BACKENDS = ("pytorch", "int8", "onnx")
+
+
+def _load_pipeline(task: str, model_name: str, backend: str):
+    """Charge un pipeline Hugging Face sur CPU avec la variante demandée."""
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+        from transformers import AutoTokenizer
+        model_class = ORTModelForSeq2SeqLM if task == "summarization" else ORTModelForSequenceClassification
+        model = model_class.from_pretrained(model_name, export=True)
+        return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model_name), device=-1)
+
+    pipe = pipeline(task, model=model_name, device=-1)  # Force CPU
+    if backend == "int8":
+        import torch
+        # Quantification dynamique des couches linéaires : poids en int8, activations en float
+        pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipe
+
+
+def _pipeline_size(pipe) -> int:
+    """Mémoire estimée d'un pipeline : poids PyTorch, ou fichiers ONNX pour la variante ONNX Runtime."""
+    return torch_model_size(pipe.model) or onnx_model_size(pipe.model)
+
+
+# Pipelines partagés par tous les analyseurs du processus, clés (tâche, modèle, variante)
+HF_PIPELINES = ModelRegistry(
+    _load_pipeline,
+    size_of=_pipeline_size,
+    max_memory_bytes=get_setting("analysis", "hf_model_cache_max_mb", 0) * 1024 ** 2,
+    name="Hugging Face"
+)
+
+
+def _inference_mode():
+    """Désactive le suivi des gradients pendant l'inférence (torch.inference_mode si disponible)."""
+    try:
+        import torch
+        return torch.inference_mode()
+    except ImportError:
+        return nullcontext()
+
+
 class HuggingFaceAnalyzer(TextAnalyzer):
     """Analyseur de texte utilisant les modèles Hugging Face"""
+
+    # L'inférence PyTorch libère le GIL et les modèles sont partagés entre threads
+    stage_concurrency = "thread"
+    # L'inférence est coûteuse : les paragraphes et sections inchangés sont réutilisés
+    incremental = True
     
-    def __init__(self):
-        self.models_loaded = False
+    def __init__(self, use_cache: bool = True, cache: Optional[ResponseCache] = None,
+                 batch_size: Optional[int] = None, chunk_overlap_tokens: Optional[int] = None,
+                 backend: Optional[str] = None):
+        """
+        Les modèles ne sont pas chargés ici : ils le sont à leur première
+        utilisation, puis partagés par tous les analyseurs du processus.
+
+        Args:
+            use_cache: Réutilise les résumés déjà calculés
+            cache: Cache de réponses à utiliser (cache partagé par défaut)
+            batch_size: Nombre de textes envoyés ensemble aux modèles
+                        (par défaut analysis.hf_batch_size dans la configuration)
+            chunk_overlap_tokens: Tokens répétés entre deux morceaux consécutifs à résumer
+                                  (par défaut analysis.hf_chunk_overlap_tokens)
+            backend: Variante des modèles, voir BACKENDS (par défaut analysis.hf_backend)
+        """
+        self.cache = (cache or get_response_cache()) if use_cache else None
+        self.fallback = BasicAnalyzer()
+        self.batch_size = max(1, batch_size or get_setting("analysis", "hf_batch_size", DEFAULT_BATCH_SIZE))
+        if chunk_overlap_tokens is None:
+            chunk_overlap_tokens = get_setting("analysis", "hf_chunk_overlap_tokens", 0)
+        self.chunk_overlap_tokens = chunk_overlap_tokens
+        self.backend = backend or get_setting("analysis", "hf_backend", "pytorch")
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Variante inconnue : {self.backend} (attendu : {', '.join(BACKENDS)})")
         if not HUGGING_FACE_AVAILABLE:
             logging.error("Hugging Face n'est pas disponible, utilisation de l'analyseur basique")
-            self.fallback = BasicAnalyzer()
-            return
-        
+
+    @property
+    def models_loaded(self) -> bool:
+        """
+        Indique si les modèles sont utilisables : Hugging Face est installé et
+        aucun modèle n'a échoué à se charger récemment. Après un échec, les
+        modèles sont retentés une fois le délai de HF_PIPELINES écoulé.
+        """
+        return HUGGING_FACE_AVAILABLE and not any(HF_PIPELINES.failed(task, model_name, self.backend)
+                                                  for task, model_name in MODELS)
+
+    @property
+    def display_name(self) -> str:
+        """Nom affiché dans les documents : signale le repli sur l'analyseur basique."""
+        if self.models_loaded:
+            return "Hugging Face"
+        return "basique (repli : modèles Hugging Face indisponibles)"
+
+    def cache_key(self) -> str:
+        """Modèles, variante et chevauchement des morceaux à résumer."""
+        return f"{SUMMARIZER_MODEL}|{CLASSIFIER_MODEL}|{self.backend}|overlap={self.chunk_overlap_tokens}"
+
+    def _pipeline(self, task: str, model_name: str):
+        """
+        Retourne un pipeline partagé. Si son chargement échoue, l'analyseur
+        passe à l'analyseur basique jusqu'au prochain essai de chargement.
+        """
         try:
-            logging.info("Initialisation des modèles Hugging Face...")
-            
-            # Modèle BART français pour le résumé
-            self.summarizer = pipeline(
-                "summarization",
-                model="moussaKam/barthez-orangesum-title",
-                device=-1  # Force CPU
-            )
-            
-            # Modèle CamemBERT pour la classification
-            self.classifier = pipeline(
-                "text-classification",
-                model="dbmdz/bert-base-french-europeana-cased",
-                device=-1  # Force CPU
-            )
-            
-            self.models_loaded = True
-            logging.info("Modèles Hugging Face initialisés avec succès")
-        except Exception as e:
-            logging.error(f"Erreur lors de l'initialisation des modèles Hugging Face: {str(e)}")
-            self.fallback = BasicAnalyzer()
+            return HF_PIPELINES.get(task, model_name, self.backend)
+        except Exception:
+            logging.error(f"Modèle {model_name} indisponible, utilisation de l'analyseur basique")
+            raise
+
+    @property
+    def summarizer(self):
+        """Modèle BART français pour le résumé, chargé à la première utilisation."""
+        return self._pipeline("summarization", SUMMARIZER_MODEL)
+
+    @property
+    def classifier(self):
+        """Modèle CamemBERT pour la classification, chargé à la première utilisation."""
+        return self._pipeline("text-classification", CLASSIFIER_MODEL)
+
+    def warm_up(self):
+        """Précharge les deux modèles (par exemple au démarrage d'un worker)."""
+        if self.models_loaded:
+            self._pipeline("summarization", SUMMARIZER_MODEL)
+            self._pipeline("text-classification", CLASSIFIER_MODEL)
+
+    @staticmethod
+    def _max_input_tokens(pipe) -> int:
+        """Nombre de tokens de texte qu'un modèle accepte, hors tokens spéciaux."""
+        tokenizer = pipe.tokenizer
+        limits = [getattr(tokenizer, "model_max_length", None),
+                  getattr(pipe.model.config, "max_position_embeddings", None)]
+        # Certains tokenizers déclarent une longueur « infinie » (très grand entier)
+        limits = [limit for limit in limits if limit and limit < 100_000]
+        max_length = min(limits) if limits else DEFAULT_MAX_INPUT_TOKENS
+        return max_length - tokenizer.num_special_tokens_to_add()
+
+    def chunk(self, text: str, pipe=None, overlap_tokens: Optional[int] = None) -> List[TextChunk]:
+        """
+        Découpe le texte en morceaux alignés sur les phrases, remplis jusqu'à la
+        longueur d'entrée réelle du modèle.
+
+        Args:
+            text: Texte à découper
+            pipe: Pipeline dont le tokenizer et la longueur maximale sont utilisés (résumeur par défaut)
+            overlap_tokens: Chevauchement entre morceaux (par défaut `chunk_overlap_tokens`)
+
+        Returns:
+            Morceaux avec leurs positions dans le texte et leur nombre de tokens
+        """
+        pipe = pipe or self.summarizer
+        if overlap_tokens is None:
+            overlap_tokens = self.chunk_overlap_tokens
+        max_tokens = self._max_input_tokens(pipe)
+        chunks = chunk_text(text, max_tokens, tokenizer_token_counter(pipe.tokenizer), overlap_tokens)
+        logging.debug(f"Texte découpé en {len(chunks)} morceau(x) de {max_tokens} tokens au plus : "
+                      + ", ".join(f"[{c.start}:{c.end}] {c.n_tokens}" for c in chunks))
+        return chunks
+
+    def _run_batched(self, pipe, texts: List[str], **params) -> List:
+        """
+        Passe une liste de textes dans un pipeline, par lots de `batch_size`.
+
+        Les textes sont triés par longueur avant d'être regroupés, pour que chaque
+        lot contienne des textes de taille proche et limite le remplissage
+        (padding). Les résultats sont rendus dans l'ordre d'entrée.
+        """
+        if not texts:
+            return []
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        with _inference_mode():
+            outputs = pipe([texts[i] for i in order], batch_size=self.batch_size, **params)
+        results = [None] * len(texts)
+        for i, output in zip(order, outputs):
+            # Selon le pipeline, chaque résultat est un dictionnaire ou une liste d'un dictionnaire
+            results[i] = output[0] if isinstance(output, list) else output
+        return results
+
+    def _classify(self, texts: List[str]) -> List[float]:
+        """
+        Retourne le score du classifieur pour chaque texte.
+
+        Un texte trop long est tronqué par le tokenizer à la longueur d'entrée
+        du modèle (en tokens, et non à un nombre fixe de caractères).
+        """
+        return [result['score'] for result in self._run_batched(self.classifier, texts, truncation=True)]
+
+    def _summarize(self, texts: List[str], **params) -> List[str]:
+        """Résume une liste de textes avec le modèle BART, en réutilisant les résultats en cache."""
+        summaries = [None] * len(texts)
+        keys = {}
+        if self.cache is not None:
+            for i, text in enumerate(texts):
+                keys[i] = self.cache.make_key(SUMMARIZER_MODEL, "summarization", params, text)
+                summaries[i] = self.cache.get(keys[i])
+
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        results = self._run_batched(self.summarizer, [texts[i] for i in missing], **params)
+        for i, result in zip(missing, results):
+            summaries[i] = result['summary_text']
+            if self.cache is not None:
+                self.cache.set(keys[i], summaries[i])
+        return summaries
+
+    def _require_models(self):
+        if not self.models_loaded:
+            raise RuntimeError("Les modèles Hugging Face ne sont pas disponibles")
+
+    def clean_paragraph(self, text: str) -> str:
+        """Nettoie un texte avec le classifieur, sans repli en cas d'erreur."""
+        self._require_models()
+        # Utilise le modèle CamemBERT pour identifier les parties importantes
+        # (sans chevauchement, les morceaux conservés sont mis bout à bout)
+        chunks = [chunk.text for chunk in self.chunk(text, self.classifier, overlap_tokens=0)]
+        scores = self._classify(chunks)
+        # Garde les chunks considérés comme importants
+        cleaned_chunks = [chunk for chunk, score in zip(chunks, scores) if score > 0.5]
+        return " ".join(cleaned_chunks)
 
     def clean_text(self, text: str) -> str:
         """Nettoie le texte."""
@@ -51,23 +251,30 @@ class HuggingFaceAnalyzer(TextAnalyzer):
             
         try:
             logging.info("Nettoyage du texte avec Hugging Face...")
-            # Utilise le modèle CamemBERT pour identifier les parties importantes
-            chunks = [text[i:i + 512] for i in range(0, len(text), 512)]
-            cleaned_chunks = []
-            
-            for chunk in chunks:
-                # Classifie l'importance du chunk
-                result = self.classifier(chunk)
-                if result[0]['score'] > 0.5:  # Si le chunk est considéré comme important
-                    cleaned_chunks.append(chunk)
-            
-            cleaned_text = " ".join(cleaned_chunks)
+            cleaned_text = self.clean_paragraph(text)
             logging.info("Texte nettoyé avec succès")
             return cleaned_text
         except Exception as e:
             logging.error(f"Erreur lors du nettoyage du texte avec Hugging Face: {str(e)}")
             return self.fallback.clean_text(text)
 
+    def summarize_text(self, text: str, max_length: int = 1500) -> str:
+        """Résume un texte avec le modèle BART, sans repli en cas d'erreur."""
+        self._require_models()
+        # Découpe le texte en morceaux de la longueur d'entrée du modèle
+        chunks = [chunk.text for chunk in self.chunk(text)]
+        summaries = self._summarize(
+            chunks,
+            max_length=150,
+            min_length=40,
+            do_sample=False
+        )
+        
+        final_summary = " ".join(summaries)
+        if len(final_summary) > max_length:
+            final_summary = final_summary[:max_length] + "..."
+        return final_summary
+
     def create_summary(self, text: str, max_length: int = 1500) -> str:
         """Crée un résumé avec le modèle BART."""
         if not self.models_loaded:
@@ -75,23 +282,7 @@ class HuggingFaceAnalyzer(TextAnalyzer):
             
         try:
             logging.info("Création du résumé avec Hugging Face...")
-            # Découpe le texte en morceaux de 512 tokens maximum
-            chunks = [text[i:i + 512] for i in range(0, len(text), 512)]
-            summaries = []
-            
-            for chunk in chunks:
-                summary = self.summarizer(
-                    chunk,
-                    max_length=150,
-                    min_length=40,
-                    do_sample=False
-                )[0]['summary_text']
-                summaries.append(summary)
-            
-            final_summary = " ".join(summaries)
-            if len(final_summary) > max_length:
-                final_summary = final_summary[:max_length] + "..."
-                
+            final_summary = self.summarize_text(text, max_length)
             logging.info("Résumé créé avec succès")
             return final_summary
             
@@ -99,6 +290,64 @@ class HuggingFaceAnalyzer(TextAnalyzer):
             logging.error(f"Erreur lors de la génération du résumé avec Hugging Face: {str(e)}")
             return self.fallback.create_summary(text, max_length)
 
+    def split_sections(self, text: str) -> Dict[str, str]:
+        """Répartit les paragraphes entre les sections avec le classifieur, sans repli en cas d'erreur."""
+        self._require_models()
+        sections = {
+            "Introduction": "",
+            "Installation et Configuration": "",
+            "Fonctionnalités": "",
+            "Utilisation": "",
+            "Conclusion": ""
+        }
+        
+        # Découpe le texte en paragraphes
+        paragraphs = [para for para in text.split('\n\n') if para.strip()]
+        
+        # Classifie tous les paragraphes en lots (tronqués à la longueur d'entrée du modèle)
+        scores = self._classify(paragraphs)
+        
+        for para, score in zip(paragraphs, scores):
+            # Détermine la section appropriée basée sur des mots-clés
+            if "introduction" in para.lower() or "contexte" in para.lower():
+                sections["Introduction"] += para + "\n\n"
+            elif "install" in para.lower() or "config" in para.lower():
+                sections["Installation et Configuration"] += para + "\n\n"
+            elif "fonction" in para.lower() or "caractéristique" in para.lower():
+                sections["Fonctionnalités"] += para + "\n\n"
+            elif "utilis" in para.lower() or "exemple" in para.lower():
+                sections["Utilisation"] += para + "\n\n"
+            elif "conclu" in para.lower() or "synthèse" in para.lower():
+                sections["Conclusion"] += para + "\n\n"
+            else:
+                # Si le score est élevé, met dans Introduction
+                if score > 0.8:
+                    sections["Introduction"] += para + "\n\n"
+                # Sinon, met dans la section la plus appropriée basée sur la position
+                else:
+                    position = len(para) / len(text)
+                    if position < 0.2:
+                        sections["Introduction"] += para + "\n\n"
+                    elif position < 0.4:
+                        sections["Installation et Configuration"] += para + "\n\n"
+                    elif position < 0.6:
+                        sections["Fonctionnalités"] += para + "\n\n"
+                    elif position < 0.8:
+                        sections["Utilisation"] += para + "\n\n"
+                    else:
+                        sections["Conclusion"] += para + "\n\n"
+        return sections
+
+    def _section_summaries(self, contents: List[str]) -> List[str]:
+        return self._summarize(contents, max_length=200, min_length=50, truncation=True)
+
+    def refine_section(self, title: str, content: str) -> str:
+        """Ajoute le résumé d'une section en tête de son contenu ; les sections vides restent vides."""
+        self._require_models()
+        if not content.strip():
+            return content
+        return self._section_summaries([content])[0] + "\n\n" + content
+
     def extract_sections(self, text: str) -> Dict[str, str]:
         """Extrait les sections avec classification."""
         if not self.models_loaded:
@@ -106,67 +355,17 @@ class HuggingFaceAnalyzer(TextAnalyzer):
             
         try:
             logging.info("Extraction des sections avec Hugging Face...")
-            sections = {
-                "Introduction": "",
-                "Installation et Configuration": "",
-                "Fonctionnalités": "",
-                "Utilisation": "",
-                "Conclusion": ""
-            }
-            
-            # Découpe le texte en paragraphes
-            paragraphs = text.split('\n\n')
-            
-            for para in paragraphs:
-                if not para.strip():
-                    continue
-                
-                # Classifie le paragraphe
-                result = self.classifier(para[:512])  # Limite la taille pour éviter les dépassements
-                score = result[0]['score']
-                
-                # Détermine la section appropriée basée sur des mots-clés
-                if "introduction" in para.lower() or "contexte" in para.lower():
-                    sections["Introduction"] += para + "\n\n"
-                elif "install" in para.lower() or "config" in para.lower():
-                    sections["Installation et Configuration"] += para + "\n\n"
-                elif "fonction" in para.lower() or "caractéristique" in para.lower():
-                    sections["Fonctionnalités"] += para + "\n\n"
-                elif "utilis" in para.lower() or "exemple" in para.lower():
-                    sections["Utilisation"] += para + "\n\n"
-                elif "conclu" in para.lower() or "synthèse" in para.lower():
-                    sections["Conclusion"] += para + "\n\n"
-                else:
-                    # Si le score est élevé, met dans Introduction
-                    if score > 0.8:
-                        sections["Introduction"] += para + "\n\n"
-                    # Sinon, met dans la section la plus appropriée basée sur la position
-                    else:
-                        position = len(para) / len(text)
-                        if position < 0.2:
-                            sections["Introduction"] += para + "\n\n"
-                        elif position < 0.4:
-                            sections["Installation et Configuration"] += para + "\n\n"
-                        elif position < 0.6:
-                            sections["Fonctionnalités"] += para + "\n\n"
-                        elif position < 0.8:
-                            sections["Utilisation"] += para + "\n\n"
-                        else:
-                            sections["Conclusion"] += para + "\n\n"
+            sections = self.split_sections(text)
             
-            # Améliore chaque section avec le résumé
-            for section_name, content in sections.items():
-                if content.strip():
-                    try:
-                        summary = self.summarizer(
-                            content[:512],
-                            max_length=200,
-                            min_length=50
-                        )[0]['summary_text']
-                        sections[section_name] = summary + "\n\n" + content
-                        logging.info(f"Section '{section_name}' améliorée avec succès")
-                    except Exception as e:
-                        logging.error(f"Erreur lors de l'amélioration de la section '{section_name}': {str(e)}")
+            # Améliore chaque section avec le résumé, en un seul passage par lots
+            names = [name for name, content in sections.items() if content.strip()]
+            try:
+                summaries = self._section_summaries([sections[name] for name in names])
+                for section_name, summary in zip(names, summaries):
+                    sections[section_name] = summary + "\n\n" + sections[section_name]
+                    logging.info(f"Section '{section_name}' améliorée avec succès")
+            except Exception as e:
+                logging.error(f"Erreur lors de l'amélioration des sections: {str(e)}")
             
             logging.info("Extraction des sections terminée avec succès")
             return sections
@@ -0,0 +1,112 @@
+import re
+import bisect
+import unicodedata
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Diacritiques isolés par la décomposition NFD
+_COMBINING_MARKS = re.compile('[̀-ͯ]')
+
+Spans = Callable[[str], Iterator[Tuple[int, int]]]
+
+
+def strip_accents(text: str) -> str:
+    """Retire les accents d'un texte (« télécharger » -> « telecharger »)."""
+    if text.isascii():
+        return text
+    return _COMBINING_MARKS.sub('', unicodedata.normalize('NFD', text))
+
+
+def iter_spans(text: str, separator: str) -> Iterator[Tuple[int, int]]:
+    """Retourne les positions (début, fin) des morceaux de `text.split(separator)`."""
+    start = 0
+    while True:
+        end = text.find(separator, start)
+        if end == -1:
+            yield start, len(text)
+            return
+        yield start, end
+        start = end + len(separator)
+
+
+class KeywordMatcher:
+    """Classement de portions de texte par mots-clés, préparé une fois pour toutes.
+
+    Les mots-clés sont répartis en groupes ordonnés par priorité (par exemple une
+    section par groupe). Le texte est normalisé une seule fois (minuscules, sans
+    accents si demandé), puis chaque portion est classée dans le premier groupe
+    dont un mot-clé y apparaît.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]], accent_insensitive: bool = True):
+        """
+        Args:
+            groups: Mots-clés par groupe ; l'ordre des groupes fixe leur priorité
+            accent_insensitive: Si True, « cle » et « clé » sont équivalents
+        """
+        self.accent_insensitive = accent_insensitive
+        self.groups = [
+            (label, tuple(dict.fromkeys(self.normalize(keyword) for keyword in keywords if keyword)))
+            for label, keywords in groups.items()
+        ]
+
+    def normalize(self, text: str) -> str:
+        """Met le texte en minuscules, et sans accents si demandé."""
+        text = text.lower()
+        return strip_accents(text) if self.accent_insensitive else text
+
+    def occurrences(self, normalized: str) -> List[List[int]]:
+        """Positions triées des occurrences des mots-clés de chaque groupe, dans un texte normalisé."""
+        result = []
+        for _, keywords in self.groups:
+            positions = []
+            for keyword in keywords:
+                position = normalized.find(keyword)
+                while position != -1:
+                    positions.append(position)
+                    position = normalized.find(keyword, position + 1)
+            positions.sort()
+            result.append(positions)
+        return result
+
+    def search(self, text: str) -> Optional[str]:
+        """Retourne le groupe prioritaire présent dans le texte, ou None."""
+        for (label, _), positions in zip(self.groups, self.occurrences(self.normalize(text))):
+            if positions:
+                return label
+        return None
+
+    def classify_spans(self, text: str, spans: Spans) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Découpe le texte et classe chaque portion dans le premier groupe dont un mot-clé y commence.
+
+        Le texte est normalisé une seule fois et chaque mot-clé n'y est cherché
+        qu'une fois : classer une portion revient ensuite à une recherche
+        dichotomique par groupe.
+
+        Args:
+            text: Texte complet
+            spans: Fonction qui retourne les positions (début, fin) des portions d'un
+                   texte ; elle ne doit dépendre que de caractères que la
+                   normalisation ne modifie pas (ponctuation, sauts de ligne)
+
+        Returns:
+            Pour chaque portion, (texte d'origine de la portion, groupe ou None)
+        """
+        normalized = self.normalize(text)
+        groups = [(label, positions) for (label, _), positions in zip(self.groups, self.occurrences(normalized))
+                  if positions]
+        # Retirer les accents peut raccourcir le texte : les portions sont alors
+        # repérées séparément dans le texte normalisé
+        normalized_spans = spans(normalized) if len(normalized) != len(text) else None
+        for start, end in spans(text):
+            if normalized_spans is not None:
+                normalized_start, normalized_end = next(normalized_spans)
+            else:
+                normalized_start, normalized_end = start, end
+            label = None
+            for group_label, positions in groups:
+                index = bisect.bisect_left(positions, normalized_start)
+                if index < len(positions) and positions[index] < normalized_end:
+                    label = group_label
+                    break
+            yield text[start:end], label
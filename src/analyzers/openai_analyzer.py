@@ -1,7 +1,15 @@
+import random
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Optional
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 from .base import TextAnalyzer
 from .basic_analyzer import BasicAnalyzer
+from .chunking import chunk_text, openai_token_counter
+from ..utils.response_cache import ResponseCache, get_response_cache
 
 try:
     import openai
@@ -9,43 +17,248 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
+MODEL = "gpt-3.5-turbo"
+
+CLEAN_PROMPT = "You are a text correction expert. Clean this text by: 1) Correcting grammar and spelling, 2) Improving punctuation, 3) Removing unnecessary repetitions."
+
+SUMMARY_PROMPT = """You are a content synthesis expert. Create a structured summary by:
+1) Identifying 3-4 main key points
+2) Explaining important concepts
+3) Highlighting relationships between different parts
+4) Using structure markers (First, Then, Finally, etc.)"""
+
+SECTIONS_PROMPT = """You are a content organization expert. Analyze this text and organize it into coherent sections.
+For each section:
+1) Identify key concepts and main ideas
+2) Organize content logically
+3) Add relevant subtitles if needed
+4) Ensure smooth transitions between sections
+
+Main sections should be:
+- Introduction (context and objectives)
+- Installation and Configuration (technical steps)
+- Features (capabilities and characteristics)
+- Usage (concrete examples and use cases)
+- Conclusion (synthesis and perspectives)"""
+
+IMPROVE_PROMPT = """Improve this '{section_name}' section by:
+1) Adding bullet points for important points
+2) Making key concepts bold
+3) Structuring content clearly
+4) Adding examples if relevant"""
+
+MERGE_SUMMARIES_PROMPT = """You are a content synthesis expert. The following texts are summaries of consecutive parts of the same document.
+Merge them into a single structured summary by:
+1) Identifying 3-4 main key points across all parts
+2) Removing redundancy between parts
+3) Highlighting relationships between different parts
+4) Using structure markers (First, Then, Finally, etc.)"""
+
+# Token budget per request. Cleaning returns about as many tokens as it
+# receives, so a chunk must leave room for the answer in the context window.
+MAX_CHUNK_TOKENS = 3000
+
+# Version of the prompts, part of the manifest key: editing a prompt invalidates the kept results
+PROMPT_VERSION = hashlib.sha256("\0".join(
+    (CLEAN_PROMPT, SUMMARY_PROMPT, SECTIONS_PROMPT, IMPROVE_PROMPT, MERGE_SUMMARIES_PROMPT)).encode("utf-8")
+).hexdigest()[:12]
+
+SECTION_NAMES = ["Introduction", "Installation and Configuration", "Features", "Usage", "Conclusion"]
+
+
+# Clients partagés par toutes les instances d'analyseur : chaque client garde
+# son propre pool de connexions HTTP, réutilisé d'une requête à l'autre.
+_clients: Dict[Tuple[str, Optional[str]], "openai.OpenAI"] = {}
+_validated_keys: Dict[Tuple[str, Optional[str]], bool] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str, base_url: Optional[str] = None) -> "openai.OpenAI":
+    """Return the process-wide OpenAI client for these credentials, creating it on first use."""
+    key = (api_key, base_url)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = openai.OpenAI(api_key=api_key, base_url=base_url)
+        return _clients[key]
+
+
+def parse_sections(sections_text: str) -> Dict[str, str]:
+    """Split the model's organized text into the known sections."""
+    sections = {name: "" for name in SECTION_NAMES}
+    current_section = "Introduction"
+    current_content = []
+
+    for line in sections_text.split('\n'):
+        section_match = None
+        for section_name in sections.keys():
+            if section_name.upper() in line.upper():
+                section_match = section_name
+                break
+
+        if section_match:
+            if current_content:
+                sections[current_section] = '\n'.join(current_content)
+            current_section = section_match
+            current_content = []
+        else:
+            current_content.append(line)
+
+    if current_content:
+        sections[current_section] = '\n'.join(current_content)
+    return sections
+
+
+def merge_sections(parts: List[Dict[str, str]]) -> Dict[str, str]:
+    """Merge the sections extracted from consecutive chunks, keeping their order."""
+    merged = {name: [] for name in SECTION_NAMES}
+    for sections in parts:
+        for name, content in sections.items():
+            if content.strip():
+                merged.setdefault(name, []).append(content.strip())
+    return {name: "\n\n".join(contents) for name, contents in merged.items()}
+
 class OpenAIAnalyzer(TextAnalyzer):
-    """Analyseur de texte utilisant OpenAI"""
+    """Analyseur de texte utilisant OpenAI
+
+    Long texts are split on sentence boundaries into chunks that fit the token
+    budget. Chunks are processed in parallel, and partial summaries are merged
+    in a reduce step. Responses are memoized in a disk cache, so reruns on
+    unchanged transcripts cost no API calls.
+
+    Construction makes no network request: the client is created on first use
+    and shared between instances. An invalid key surfaces on the first real
+    call, or at construction with `validate=True`.
+    """
+
+    display_name = "OpenAI"
+    # Summary and section requests mostly wait on the network, so they can share threads
+    stage_concurrency = "thread"
+    # Every request is paid for: unchanged paragraphs and sections are reused on reruns
+    incremental = True
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_chunk_tokens: int = MAX_CHUNK_TOKENS, max_workers: int = 4,
+                 use_cache: bool = True, cache: Optional[ResponseCache] = None,
+                 validate: bool = False):
         if not OPENAI_AVAILABLE:
             raise ImportError("OpenAI package is not installed. Install it with 'pip install openai'")
         if not api_key:
             raise ValueError("An OpenAI API key is required to use this analyzer.")
         
         logging.info("Initializing OpenAI analyzer...")
-        self.client = openai.OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_chunk_tokens = max_chunk_tokens
+        self.max_workers = max(1, max_workers)
+        self.count_tokens = openai_token_counter(MODEL)
+        self.cache = (cache or get_response_cache()) if use_cache else None
+        if validate:
+            self.validate_credentials()
+
+    def cache_key(self) -> str:
+        """Model, prompt version and chunk size the results depend on."""
+        return f"{MODEL}|prompts={PROMPT_VERSION}|chunk={self.max_chunk_tokens}"
+
+    @property
+    def client(self) -> "openai.OpenAI":
+        """Shared OpenAI client, created on first use without any network request."""
+        return get_client(self.api_key, self.base_url)
+
+    def validate_credentials(self):
+        """Check the API key once per process (free models listing request).
+
+        Raises:
+            ValueError: If the key is rejected or the API cannot be reached
+        """
+        key = (self.api_key, self.base_url)
+        if _validated_keys.get(key):
+            return
         try:
-            # Test API key
-            self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "system", "content": "Connection test"}, {"role": "user", "content": "Test"}],
-                max_tokens=5
-            )
+            self.client.models.list()
+            _validated_keys[key] = True
             logging.info("OpenAI connection established successfully")
         except Exception as e:
             logging.error(f"Error initializing OpenAI: {str(e)}")
             raise ValueError(f"Could not initialize OpenAI: {str(e)}")
 
+    def _chunks(self, text: str) -> List[str]:
+        """Split text into sentence-aligned chunks within the token budget."""
+        if self.count_tokens(text) <= self.max_chunk_tokens:
+            return [text]
+        chunks = [chunk.text for chunk in chunk_text(text, self.max_chunk_tokens, self.count_tokens)]
+        logging.info(f"Long text split into {len(chunks)} chunks of at most {self.max_chunk_tokens} tokens")
+        return chunks
+
+    def _chat(self, system: str, content: str, max_tokens: Optional[int] = None) -> str:
+        """Send one chat completion request (or reuse its cached answer) and return the answer text."""
+        options = {"max_tokens": max_tokens} if max_tokens else {}
+
+        def request() -> str:
+            response = self.client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": content}
+                ],
+                **options
+            )
+            return response.choices[0].message.content
+
+        if self.cache is None:
+            return request()
+        return self.cache.get_or_compute(MODEL, system, options, content, request)
+
+    def _map(self, func: Callable[[str], str], items: List[str]) -> List[str]:
+        """Apply `func` to every item, in parallel when there are several."""
+        if len(items) == 1:
+            return [func(items[0])]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
+
+    def _merge_groups(self, summaries: List[str]) -> List[str]:
+        """Group partial summaries for one merge round, raising if the round would not reduce their count."""
+        groups = self._chunks("\n\n".join(summaries))
+        if len(groups) >= len(summaries):
+            raise ValueError(f"{len(summaries)} partial summaries cannot be merged within "
+                             f"{self.max_chunk_tokens} tokens per request")
+        return groups
+
+    def _reduce_summaries(self, summaries: List[str]) -> str:
+        """Merge partial summaries, in several rounds if they do not fit in one request."""
+        while len(summaries) > 1:
+            groups = self._merge_groups(summaries)
+            summaries = self._map(lambda group: self._chat(MERGE_SUMMARIES_PROMPT, group, max_tokens=500), groups)
+        return summaries[0]
+
+    def clean_paragraph(self, text: str) -> str:
+        """Clean text using GPT, raising on failure."""
+        return "\n\n".join(self._map(lambda chunk: self._chat(CLEAN_PROMPT, chunk), self._chunks(text)))
+
+    def summarize_text(self, text: str, max_length: int = 1500) -> str:
+        """Summarize text using GPT, raising on failure."""
+        partials = self._map(lambda chunk: self._chat(SUMMARY_PROMPT, chunk, max_tokens=500), self._chunks(text))
+        return self._reduce_summaries(partials)
+
+    def split_sections(self, text: str) -> Dict[str, str]:
+        """Organize text into sections using GPT, without improving them; raises on failure."""
+        parts = self._map(lambda chunk: self._chat(SECTIONS_PROMPT, chunk, max_tokens=1500), self._chunks(text))
+        return merge_sections([parse_sections(part) for part in parts])
+
+    def refine_section(self, title: str, content: str) -> str:
+        """Improve one section using GPT; empty sections are left as they are."""
+        if not content.strip():
+            return content
+        return self._chat(IMPROVE_PROMPT.format(section_name=title), content, max_tokens=500)
+
     def clean_text(self, text: str) -> str:
         """Clean text using GPT."""
         try:
             logging.info("Cleaning text with OpenAI...")
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a text correction expert. Clean this text by: 1) Correcting grammar and spelling, 2) Improving punctuation, 3) Removing unnecessary repetitions."},
-                    {"role": "user", "content": text}
-                ]
-            )
-            cleaned_text = response.choices[0].message.content
+            cleaned_text = self.clean_paragraph(text)
             logging.info("Text cleaned successfully")
             return cleaned_text
+        except openai.AuthenticationError:
+            raise
         except Exception as e:
             logging.error(f"Error cleaning text with OpenAI: {str(e)}")
             return BasicAnalyzer().clean_text(text)
@@ -54,21 +267,11 @@ class OpenAIAnalyzer(TextAnalyzer):
         """Create summary using GPT."""
         try:
             logging.info("Creating summary with OpenAI...")
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": """You are a content synthesis expert. Create a structured summary by:
-1) Identifying 3-4 main key points
-2) Explaining important concepts
-3) Highlighting relationships between different parts
-4) Using structure markers (First, Then, Finally, etc.)"""},
-                    {"role": "user", "content": text}
-                ],
-                max_tokens=500
-            )
-            summary = response.choices[0].message.content
+            summary = self.summarize_text(text, max_length)
             logging.info("Summary created successfully")
             return summary
+        except openai.AuthenticationError:
+            raise
         except Exception as e:
             logging.error(f"Error generating summary with OpenAI: {str(e)}")
             return BasicAnalyzer().create_summary(text, max_length)
@@ -77,75 +280,14 @@ class OpenAIAnalyzer(TextAnalyzer):
         """Extract sections using GPT."""
         try:
             logging.info("Extracting sections with OpenAI...")
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": """You are a content organization expert. Analyze this text and organize it into coherent sections.
-For each section:
-1) Identify key concepts and main ideas
-2) Organize content logically
-3) Add relevant subtitles if needed
-4) Ensure smooth transitions between sections
-
-Main sections should be:
-- Introduction (context and objectives)
-- Installation and Configuration (technical steps)
-- Features (capabilities and characteristics)
-- Usage (concrete examples and use cases)
-- Conclusion (synthesis and perspectives)"""},
-                    {"role": "user", "content": text}
-                ],
-                max_tokens=1500
-            )
-            
-            sections_text = response.choices[0].message.content
-            sections = {
-                "Introduction": "",
-                "Installation and Configuration": "",
-                "Features": "",
-                "Usage": "",
-                "Conclusion": ""
-            }
-            
-            current_section = "Introduction"
-            current_content = []
-            
-            for line in sections_text.split('\n'):
-                section_match = None
-                for section_name in sections.keys():
-                    if section_name.upper() in line.upper():
-                        section_match = section_name
-                        break
-                
-                if section_match:
-                    if current_content:
-                        sections[current_section] = '\n'.join(current_content)
-                    current_section = section_match
-                    current_content = []
-                else:
-                    current_content.append(line)
-            
-            if current_content:
-                sections[current_section] = '\n'.join(current_content)
+            sections = self.split_sections(text)
             
             # Second pass to improve each section
             logging.info("Improving sections...")
             for section_name, content in sections.items():
                 if content.strip():
                     try:
-                        response = self.client.chat.completions.create(
-                            model="gpt-3.5-turbo",
-                            messages=[
-                                {"role": "system", "content": f"""Improve this '{section_name}' section by:
-1) Adding bullet points for important points
-2) Making key concepts bold
-3) Structuring content clearly
-4) Adding examples if relevant"""},
-                                {"role": "user", "content": content}
-                            ],
-                            max_tokens=500
-                        )
-                        sections[section_name] = response.choices[0].message.content
+                        sections[section_name] = self.refine_section(section_name, content)
                         logging.info(f"Section '{section_name}' improved successfully")
                     except Exception as e:
                         logging.error(f"Error improving section '{section_name}': {str(e)}")
@@ -153,6 +295,252 @@ Main sections should be:
             logging.info("Sections extraction completed successfully")
             return sections
             
+        except openai.AuthenticationError:
+            raise
         except Exception as e:
             logging.error(f"Error extracting sections with OpenAI: {str(e)}")
-            return BasicAnalyzer().extract_sections(text) 
\ No newline at end of file
+            return BasicAnalyzer().extract_sections(text)
+
+
+class AsyncOpenAIAnalyzer(OpenAIAnalyzer):
+    """OpenAI analyzer issuing independent requests concurrently with asyncio.
+
+    A document costs one round trip per dependency level: cleaning, then the
+    summary and the section split together, then all section improvements
+    together. Rate-limited requests are retried with backoff, honoring the
+    server's Retry-After header when present.
+    """
+
+    # analyze() already runs the summary and the sections concurrently in its event loop
+    stage_concurrency = None
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: int = 5, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+                 use_cache: bool = True, cache: Optional[ResponseCache] = None,
+                 validate: bool = False):
+        super().__init__(api_key, base_url, max_chunk_tokens, use_cache=use_cache, cache=cache, validate=validate)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # DocumentGenerator runs as many incremental stages at once as requests are allowed
+        self.stage_workers = self.max_concurrency
+        self._session = None
+        self._session_users = 0
+        self._session_lock = threading.Lock()
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Delay before the next attempt: Retry-After if provided, else exponential backoff with jitter."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms"):
+                return min(float(headers["retry-after-ms"]) / 1000, self.backoff_max)
+            if headers.get("retry-after"):
+                return min(float(headers["retry-after"]), self.backoff_max)
+        except ValueError:
+            pass
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay + random.uniform(0, delay / 2), self.backoff_max)
+
+    async def _chat_async(self, client, semaphore: asyncio.Semaphore, system: str, content: str,
+                          max_tokens: Optional[int] = None) -> str:
+        """Send one chat completion under the concurrency limit, retrying transient failures."""
+        options = {"max_tokens": max_tokens} if max_tokens else {}
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(MODEL, system, options, content)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        model=MODEL,
+                        messages=[
+                            {"role": "system", "content": system},
+                            {"role": "user", "content": content}
+                        ],
+                        **options
+                    )
+                answer = response.choices[0].message.content
+                if key is not None:
+                    self.cache.set(key, answer)
+                return answer
+            except (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                logging.warning(f"OpenAI request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def _async_client(self):
+        # Retries are handled by _chat_async, which knows about the concurrency limit
+        return openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+
+    async def _map_async(self, client, semaphore, system: str, items: List[str],
+                         max_tokens: Optional[int] = None) -> List[str]:
+        return await asyncio.gather(
+            *(self._chat_async(client, semaphore, system, item, max_tokens) for item in items)
+        )
+
+    async def _clean_paragraph_async(self, client, semaphore, text: str) -> str:
+        return "\n\n".join(await self._map_async(client, semaphore, CLEAN_PROMPT, self._chunks(text)))
+
+    async def _summarize_text_async(self, client, semaphore, text: str) -> str:
+        summaries = await self._map_async(client, semaphore, SUMMARY_PROMPT, self._chunks(text), 500)
+        while len(summaries) > 1:
+            groups = self._merge_groups(summaries)
+            summaries = await self._map_async(client, semaphore, MERGE_SUMMARIES_PROMPT, groups, 500)
+        return summaries[0]
+
+    async def _split_sections_async(self, client, semaphore, text: str) -> Dict[str, str]:
+        parts = await self._map_async(client, semaphore, SECTIONS_PROMPT, self._chunks(text), 1500)
+        return merge_sections([parse_sections(part) for part in parts])
+
+    async def _refine_section_async(self, client, semaphore, title: str, content: str) -> str:
+        return await self._chat_async(client, semaphore, IMPROVE_PROMPT.format(section_name=title), content, 500)
+
+    async def _clean_async(self, client, semaphore, text: str) -> str:
+        try:
+            logging.info("Cleaning text with OpenAI...")
+            return await self._clean_paragraph_async(client, semaphore, text)
+        except openai.AuthenticationError:
+            raise
+        except Exception as e:
+            logging.error(f"Error cleaning text with OpenAI: {str(e)}")
+            return BasicAnalyzer().clean_text(text)
+
+    async def _summary_async(self, client, semaphore, text: str, max_length: int) -> str:
+        try:
+            logging.info("Creating summary with OpenAI...")
+            return await self._summarize_text_async(client, semaphore, text)
+        except openai.AuthenticationError:
+            raise
+        except Exception as e:
+            logging.error(f"Error generating summary with OpenAI: {str(e)}")
+            return BasicAnalyzer().create_summary(text, max_length)
+
+    async def _sections_async(self, client, semaphore, text: str) -> Dict[str, str]:
+        try:
+            logging.info("Extracting sections with OpenAI...")
+            sections = await self._split_sections_async(client, semaphore, text)
+        except openai.AuthenticationError:
+            raise
+        except Exception as e:
+            logging.error(f"Error extracting sections with OpenAI: {str(e)}")
+            return BasicAnalyzer().extract_sections(text)
+
+        # Second pass: all sections are improved concurrently
+        logging.info("Improving sections...")
+        names = [name for name, content in sections.items() if content.strip()]
+        improved = await asyncio.gather(
+            *(self._refine_section_async(client, semaphore, name, sections[name]) for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, improved):
+            if isinstance(result, Exception):
+                logging.error(f"Error improving section '{name}': {str(result)}")
+            else:
+                sections[name] = result
+                logging.info(f"Section '{name}' improved successfully")
+        return sections
+
+    async def analyze_async(self, text: str, max_length: int = 1500) -> Tuple[str, Dict[str, str]]:
+        """Clean the text, then build the summary and the sections concurrently.
+
+        Returns:
+            Tuple (summary, sections)
+        """
+        async with self._async_client() as client:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            cleaned_text = await self._clean_async(client, semaphore, text)
+            summary, sections = await asyncio.gather(
+                self._summary_async(client, semaphore, cleaned_text, max_length),
+                self._sections_async(client, semaphore, cleaned_text)
+            )
+        logging.info("Sections extraction completed successfully")
+        return summary, sections
+
+    async def _run_with_client(self, method, *args):
+        async with self._async_client() as client:
+            return await method(client, asyncio.Semaphore(self.max_concurrency), *args)
+
+    async def _open_session(self):
+        # The semaphore must be created inside the session's event loop
+        return self._async_client(), asyncio.Semaphore(self.max_concurrency)
+
+    @contextmanager
+    def stage_session(self):
+        """Share one event loop, client and concurrency limit between all the stages run meanwhile.
+
+        DocumentGenerator calls the stage methods from several threads: inside
+        the session, their requests all go through this loop, so the
+        concurrency limit and the rate-limit backoff apply to all of them.
+        """
+        with self._session_lock:
+            if self._session_users == 0:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="openai-session", daemon=True)
+                thread.start()
+                client, semaphore = asyncio.run_coroutine_threadsafe(self._open_session(), loop).result()
+                self._session = (loop, thread, client, semaphore)
+            self._session_users += 1
+        try:
+            yield
+        finally:
+            with self._session_lock:
+                self._session_users -= 1
+                if self._session_users == 0:
+                    loop, thread, client, _ = self._session
+                    self._session = None
+                    asyncio.run_coroutine_threadsafe(client.close(), loop).result()
+                    loop.call_soon_threadsafe(loop.stop)
+                    thread.join()
+                    loop.close()
+
+    def _run(self, method, *args):
+        """Run a coroutine method in the current session, or with a client of its own outside any session."""
+        session = self._session
+        if session is None:
+            return asyncio.run(self._run_with_client(method, *args))
+        loop, _, client, semaphore = session
+        return asyncio.run_coroutine_threadsafe(method(client, semaphore, *args), loop).result()
+
+    def analyze(self, text: str, max_length: int = 1500) -> Tuple[str, Dict[str, str]]:
+        """Run the whole document analysis in a single event loop."""
+        return asyncio.run(self.analyze_async(text, max_length))
+
+    def clean_paragraph(self, text: str) -> str:
+        """Clean text using GPT, raising on failure."""
+        return self._run(self._clean_paragraph_async, text)
+
+    def summarize_text(self, text: str, max_length: int = 1500) -> str:
+        """Summarize text using GPT, raising on failure."""
+        return self._run(self._summarize_text_async, text)
+
+    def split_sections(self, text: str) -> Dict[str, str]:
+        """Organize text into sections using GPT, without improving them; raises on failure."""
+        return self._run(self._split_sections_async, text)
+
+    def refine_section(self, title: str, content: str) -> str:
+        """Improve one section using GPT; empty sections are left as they are."""
+        if not content.strip():
+            return content
+        return self._run(self._refine_section_async, title, content)
+
+    def clean_text(self, text: str) -> str:
+        """Clean text using GPT."""
+        return self._run(self._clean_async, text)
+
+    def create_summary(self, text: str, max_length: int = 1500) -> str:
+        """Create summary using GPT."""
+        return self._run(self._summary_async, text, max_length)
+
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        """Extract sections using GPT, improving all sections concurrently."""
+        return self._run(self._sections_async, text)
@@ -0,0 +1,111 @@
+import wave
+import logging
+import subprocess
+from typing import Iterator, Tuple
+import numpy as np
+
+# Fréquence d'échantillonnage attendue par Whisper
+SAMPLE_RATE = 16000
+
+
+def _is_native_pcm(audio_path: str, sample_rate: int) -> bool:
+    """Indique si le fichier est déjà un WAV PCM 16 bits mono à la bonne fréquence."""
+    if not audio_path.lower().endswith(".wav"):
+        return False
+    try:
+        with wave.open(audio_path, "rb") as f:
+            return f.getnchannels() == 1 and f.getsampwidth() == 2 and f.getframerate() == sample_rate
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+def _iter_wav(audio_path: str, block_samples: int) -> Iterator[np.ndarray]:
+    with wave.open(audio_path, "rb") as f:
+        while True:
+            data = f.readframes(block_samples)
+            if not data:
+                break
+            yield np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+
+
+def iter_pcm(audio_path: str, block_seconds: float = 30.0, sample_rate: int = SAMPLE_RATE) -> Iterator[np.ndarray]:
+    """
+    Décode un fichier audio par blocs en PCM mono float32, sans le charger entièrement.
+
+    Les WAV déjà en PCM 16 bits mono à la bonne fréquence sont lus directement,
+    sans lancer ffmpeg ; les autres formats sont décodés par un pipe ffmpeg,
+    sans fichier intermédiaire.
+
+    Args:
+        audio_path: Chemin vers le fichier audio (tout format lisible par ffmpeg)
+        block_seconds: Durée de chaque bloc renvoyé, en secondes
+        sample_rate: Fréquence d'échantillonnage de sortie
+
+    Yields:
+        Blocs d'échantillons normalisés entre -1 et 1 (le dernier peut être plus court)
+    """
+    if _is_native_pcm(audio_path, sample_rate):
+        yield from _iter_wav(audio_path, int(block_seconds * sample_rate))
+        return
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0", "-i", audio_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate), "-"
+    ]
+    block_bytes = int(block_seconds * sample_rate) * 2
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"Échec du décodage de {audio_path} : {stderr.decode(errors='replace')}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def load_audio(audio_path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Décode un fichier audio complet en PCM mono float32 (équivalent de whisper.load_audio)."""
+    blocks = list(iter_pcm(audio_path, sample_rate=sample_rate))
+    return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+
+
+def iter_windows(audio_path: str, window_seconds: float = 600.0, overlap_seconds: float = 5.0,
+                 sample_rate: int = SAMPLE_RATE) -> Iterator[Tuple[float, np.ndarray, bool]]:
+    """
+    Découpe un fichier audio en fenêtres de durée fixe qui se chevauchent.
+
+    La mémoire utilisée est bornée par la taille d'une fenêtre, quelle que soit
+    la durée de l'enregistrement.
+
+    Args:
+        audio_path: Chemin vers le fichier audio
+        window_seconds: Durée de chaque fenêtre, en secondes
+        overlap_seconds: Chevauchement entre deux fenêtres consécutives, en secondes
+
+    Yields:
+        Tuples (début de la fenêtre en secondes, échantillons, dernière fenêtre ?)
+    """
+    if overlap_seconds >= window_seconds:
+        raise ValueError("Le chevauchement doit être plus court que la fenêtre")
+
+    window = int(window_seconds * sample_rate)
+    step = window - int(overlap_seconds * sample_rate)
+    buffer = np.zeros(0, dtype=np.float32)
+    offset = 0
+
+    for block in iter_pcm(audio_path, block_seconds=min(window_seconds, 30.0), sample_rate=sample_rate):
+        buffer = np.concatenate([buffer, block])
+        while len(buffer) > window:
+            yield offset / sample_rate, buffer[:window], False
+            buffer = buffer[step:].copy()
+            offset += step
+
+    if len(buffer) or offset == 0:
+        logging.debug(f"Dernière fenêtre de {len(buffer) / sample_rate:.1f}s à {offset / sample_rate:.1f}s")
+        yield offset / sample_rate, buffer, True
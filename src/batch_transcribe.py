@@ -0,0 +1,228 @@
+import os
+import glob
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Union
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".aac", ".flac", ".ogg", ".opus", ".webm", ".mp4", ".mkv"}
+
+# Options du worker courant, fixées une fois par processus par _init_worker
+_worker_options: Dict = {}
+
+
+def collect_audio_files(source: str) -> List[str]:
+    """
+    Liste les fichiers audio à transcrire.
+
+    Args:
+        source: Dossier, motif glob (ex: "downloads/*.wav") ou manifeste
+                (.txt avec un chemin par ligne, ou .json contenant une liste de chemins)
+
+    Returns:
+        Liste triée et dédoublonnée des chemins audio
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)
+                 if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS]
+    elif os.path.isfile(source) and source.endswith(".json"):
+        with open(source, 'r', encoding='utf-8') as f:
+            paths = json.load(f)
+    elif os.path.isfile(source) and source.endswith(".txt"):
+        with open(source, 'r', encoding='utf-8') as f:
+            paths = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(set(paths))
+
+
+class WhisperTranscriber:
+    """Transcripteur des workers : Whisper et PyTorch ne sont importés que dans le processus du worker."""
+
+    def warm_up(self, model_name: str, device: Optional[str], dtype: str, threads: int):
+        """Fixe le nombre de threads PyTorch et charge le modèle Whisper une seule fois."""
+        from .transcribe_audio import warm_up
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        warm_up([model_name], device, dtype)
+
+    def __call__(self, audio_path: str, output_dir: str, model_name: str, device: Optional[str], dtype: str,
+                 stream: bool, use_cache: bool) -> str:
+        from .transcribe_audio import transcribe_audio
+        return transcribe_audio(audio_path, output_dir, model_name, device, dtype, stream=stream, use_cache=use_cache)
+
+
+def _init_worker(model_name: str, output_dir: str, device: Optional[str], dtype: str, threads: int,
+                 stream: bool, use_cache: bool, transcriber: WhisperTranscriber):
+    """Initialise un worker : fixe le nombre de threads et charge son modèle Whisper une seule fois."""
+    _worker_options.update(output_dir=output_dir, model_name=model_name, device=device, dtype=dtype, stream=stream,
+                           use_cache=use_cache, transcriber=transcriber)
+    transcriber.warm_up(model_name, device, dtype, threads)
+
+
+def _failed_result(audio_path: str, error: str) -> Dict:
+    """Résultat d'un fichier qu'aucun worker n'a pu transcrire."""
+    return {"audio_path": audio_path, "transcript_path": None, "status": "error", "error": error,
+            "pid": None, "duration": 0.0}
+
+
+def _transcribe_one(audio_path: str) -> Dict:
+    """Transcrit un fichier dans le worker courant et retourne son résultat détaillé."""
+    start = time.perf_counter()
+    result = {"audio_path": audio_path, "transcript_path": None, "status": "ok", "error": None, "pid": os.getpid()}
+    try:
+        result["transcript_path"] = _worker_options["transcriber"](
+            audio_path,
+            _worker_options["output_dir"],
+            _worker_options["model_name"],
+            _worker_options["device"],
+            _worker_options["dtype"],
+            _worker_options["stream"],
+            _worker_options["use_cache"]
+        )
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    result["duration"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def transcribe_batch(source: Union[str, Iterable[str]], output_dir: str = "transcriptions",
+                     model_name: str = "base", workers: Optional[int] = None,
+                     device: Optional[str] = None, dtype: str = "float32",
+                     threads_per_worker: Optional[int] = None,
+                     report_path: Optional[str] = None, stream: bool = False,
+                     use_cache: bool = True, transcriber: Optional[WhisperTranscriber] = None) -> Dict:
+    """
+    Transcrit un lot de fichiers audio avec un pool de processus.
+
+    Chaque worker charge son modèle Whisper une seule fois puis traite
+    plusieurs fichiers. Les échecs n'interrompent pas le lot : si un worker
+    ne démarre pas ou s'arrête brutalement, les fichiers qui restaient à
+    transcrire sont comptés en échec et le rapport est tout de même écrit.
+
+    Args:
+        source: Dossier, motif glob, manifeste, ou liste de chemins audio
+        output_dir: Dossier de sortie pour les transcriptions
+        model_name: Nom du modèle Whisper à utiliser
+        workers: Nombre de processus (par défaut : nombre de cœurs, borné par le nombre de fichiers)
+        device: Périphérique de calcul (détecté automatiquement si None)
+        dtype: Précision des poids du modèle
+        threads_per_worker: Threads PyTorch par worker (par défaut : cœurs / workers)
+        report_path: Chemin du rapport JSON à écrire (optionnel)
+        stream: Si True, transcrit chaque fichier par fenêtres (mémoire bornée)
+        use_cache: Si True, réutilise les transcriptions déjà en cache
+        transcriber: Transcripteur des workers (par défaut WhisperTranscriber), transmis
+                     aux processus par sérialisation
+
+    Returns:
+        Rapport récapitulatif (résultats par fichier, échecs, durées)
+    """
+    audio_files = collect_audio_files(source) if isinstance(source, str) else sorted(set(source))
+    transcriber = transcriber or WhisperTranscriber()
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or cpu_count, len(audio_files) or 1))
+    threads = threads_per_worker or max(1, cpu_count // workers)
+    logging.info(f"Transcription de {len(audio_files)} fichier(s) avec {workers} worker(s) de {threads} thread(s)")
+
+    start = time.perf_counter()
+    results = []
+    if workers == 1:
+        # Pas de pool : évite le coût de démarrage d'un processus supplémentaire
+        try:
+            _init_worker(model_name, output_dir, device, dtype, threads_per_worker or 0, stream, use_cache,
+                         transcriber)
+        except Exception as e:
+            logging.error(f"Échec de l'initialisation du worker : {str(e)}")
+            results = [_failed_result(audio_path, f"Initialisation du worker : {str(e)}")
+                       for audio_path in audio_files]
+        else:
+            for audio_path in audio_files:
+                results.append(_transcribe_one(audio_path))
+                _log_result(results[-1], len(results), len(audio_files))
+    else:
+        # "spawn" évite de dupliquer l'état de PyTorch du processus parent
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(model_name, output_dir, device, dtype, threads, stream, use_cache,
+                                           transcriber)) as executor:
+            futures = {}
+            for audio_path in audio_files:
+                try:
+                    futures[executor.submit(_transcribe_one, audio_path)] = audio_path
+                except BrokenProcessPool as e:
+                    # Un worker a déjà échoué : le pool n'accepte plus de fichiers
+                    results.append(_failed_result(audio_path, f"Worker interrompu : {str(e)}"))
+                    _log_result(results[-1], len(results), len(audio_files))
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except BrokenProcessPool as e:
+                    # Échec de l'initialisation ou arrêt brutal d'un worker
+                    results.append(_failed_result(futures[future], f"Worker interrompu : {str(e)}"))
+                _log_result(results[-1], len(results), len(audio_files))
+
+    results.sort(key=lambda r: r["audio_path"])
+    failures = [r for r in results if r["status"] != "ok"]
+    report = {
+        "model": model_name,
+        "workers": workers,
+        "total": len(results),
+        "succeeded": len(results) - len(failures),
+        "failed": len(failures),
+        "wall_time": round(time.perf_counter() - start, 3),
+        "transcription_time": round(sum(r["duration"] for r in results), 3),
+        "results": results
+    }
+
+    if report_path:
+        Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logging.info(f"Rapport de transcription sauvegardé : {report_path}")
+
+    logging.info(f"Lot terminé : {report['succeeded']} réussi(s), {report['failed']} échec(s) en {report['wall_time']}s")
+    return report
+
+
+def _log_result(result: Dict, done: int, total: int):
+    if result["status"] == "ok":
+        logging.info(f"[{done}/{total}] {result['audio_path']} transcrit en {result['duration']}s")
+    else:
+        logging.error(f"[{done}/{total}] Échec pour {result['audio_path']} : {result['error']}")
+
+
+def main():
+    from .utils.logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Transcrit un lot de fichiers audio en parallèle")
+    parser.add_argument("source", help="Dossier, motif glob ou manifeste (.txt/.json) de fichiers audio")
+    parser.add_argument("--output-dir", default="transcriptions", help="Dossier de sortie pour les transcriptions")
+    parser.add_argument("--model", default="base", help="Modèle Whisper à utiliser")
+    parser.add_argument("--workers", type=int, help="Nombre de processus de transcription")
+    parser.add_argument("--threads-per-worker", type=int, help="Threads PyTorch par worker")
+    parser.add_argument("--device", help="Périphérique de calcul (cpu, cuda...)")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32",
+                        help="Précision des poids du modèle")
+    parser.add_argument("--report", help="Chemin du rapport JSON récapitulatif")
+    parser.add_argument("--stream", action="store_true", help="Transcrit chaque fichier par fenêtres (mémoire bornée)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore le cache des transcriptions")
+    parser.add_argument("--debug", action="store_true", help="Active le mode debug avec plus de logs")
+    args = parser.parse_args()
+
+    setup_logging(args.debug)
+    report = transcribe_batch(args.source, args.output_dir, args.model, args.workers, args.device,
+                              args.dtype, args.threads_per_worker, args.report, args.stream, not args.no_cache)
+    print(f"Transcriptions : {report['succeeded']}/{report['total']} réussie(s) en {report['wall_time']}s")
+    if report["failed"]:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,200 @@
 import os
+import time
 import logging
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
 import yt_dlp
 
-def download_audio(url: str, output_dir: str = "downloads") -> str:
+# Une instance YoutubeDL par thread et par configuration : YoutubeDL n'est pas
+# prévu pour être partagé entre threads, mais peut être réutilisé d'une URL à l'autre.
+_thread_local = threading.local()
+
+
+# Formats de sortie disponibles :
+# - "wav" : WAV réencodé (comportement historique, fichier volumineux)
+# - "native" : flux audio compressé d'origine, sans passe ffmpeg
+# - "pcm16k" : WAV PCM 16 kHz mono, directement lisible par le transcripteur sans ffmpeg
+AUDIO_FORMATS = ("wav", "native", "pcm16k")
+
+
+def _build_ydl_opts(output_dir: str, archive_file: Optional[str] = None, audio_format: str = "wav") -> Dict:
+    """Construit la configuration yt-dlp."""
+    if audio_format not in AUDIO_FORMATS:
+        raise ValueError(f"Format audio inconnu : {audio_format} (attendu : {', '.join(AUDIO_FORMATS)})")
+
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
+        'continuedl': True,  # Reprend les fichiers .part interrompus
+        'quiet': True,
+        'no_warnings': True
+    }
+    if audio_format == "wav":
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'wav',
+            'preferredquality': '192',
+        }]
+    elif audio_format == "pcm16k":
+        # Rééchantillonne au format attendu par Whisper pendant l'extraction
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'wav',
+        }]
+        ydl_opts['postprocessor_args'] = {'extractaudio': ['-ar', '16000', '-ac', '1', '-c:a', 'pcm_s16le']}
+    if archive_file:
+        ydl_opts['download_archive'] = archive_file
+    return ydl_opts
+
+
+def _get_downloader(output_dir: str, archive_file: Optional[str] = None,
+                    audio_format: str = "wav") -> yt_dlp.YoutubeDL:
+    """Retourne l'instance YoutubeDL du thread courant pour cette configuration."""
+    downloaders = getattr(_thread_local, "downloaders", None)
+    if downloaders is None:
+        downloaders = _thread_local.downloaders = {}
+    key = (output_dir, archive_file, audio_format)
+    if key not in downloaders:
+        downloaders[key] = yt_dlp.YoutubeDL(_build_ydl_opts(output_dir, archive_file, audio_format))
+    return downloaders[key]
+
+
+def _audio_path(ydl: yt_dlp.YoutubeDL, info: Dict, audio_format: str) -> str:
+    """Retrouve le chemin du fichier audio final à partir des informations yt-dlp."""
+    downloads = info.get('requested_downloads') or []
+    if downloads and downloads[0].get('filepath'):
+        return downloads[0]['filepath']
+    # Vidéo déjà présente dans l'archive : le chemin est reconstruit depuis le modèle de nom
+    filename = ydl.prepare_filename(info)
+    if audio_format == "native":
+        return filename
+    return os.path.splitext(filename)[0] + ".wav"
+
+
+def download_audio(url: str, output_dir: str = "downloads", archive_file: Optional[str] = None,
+                   audio_format: str = "wav") -> Optional[str]:
     """
     Télécharge l'audio d'une vidéo YouTube.
-    
+
     Args:
         url: URL de la vidéo YouTube
         output_dir: Dossier de sortie pour l'audio
-    
+        archive_file: Archive yt-dlp des vidéos déjà téléchargées (optionnel)
+        audio_format: "wav", "native" (flux compressé d'origine) ou "pcm16k" (WAV 16 kHz mono)
+
     Returns:
-        Chemin vers le fichier audio téléchargé
+        Chemin vers le fichier audio téléchargé, ou None si la vidéo figure déjà
+        dans l'archive (yt-dlp l'ignore alors sans même extraire ses informations)
     """
     try:
         # Crée le dossier de sortie s'il n'existe pas
         Path(output_dir).mkdir(parents=True, exist_ok=True)
-        
-        # Configuration de yt-dlp
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'wav',
-                'preferredquality': '192',
-            }],
-            'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
-            'quiet': True,
-            'no_warnings': True
-        }
-        
+
         logging.info(f"Téléchargement de l'audio depuis : {url}")
-        
-        # Télécharge l'audio
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            audio_path = os.path.join(output_dir, f"{info['title']}.wav")
-            
+
+        # Télécharge l'audio (ignoré si la vidéo figure déjà dans l'archive)
+        ydl = _get_downloader(output_dir, archive_file, audio_format)
+        info = ydl.extract_info(url, download=True)
+        if info is None:
+            logging.info(f"Vidéo déjà présente dans l'archive, ignorée : {url}")
+            return None
+        audio_path = _audio_path(ydl, info, audio_format)
+
         logging.info(f"Audio téléchargé avec succès : {audio_path}")
         return audio_path
-        
+
     except Exception as e:
         logging.error(f"Erreur lors du téléchargement de l'audio : {str(e)}")
         raise
 
+
+def read_urls(url_file: str) -> List[str]:
+    """Lit un fichier d'URLs (une par ligne, lignes vides et commentaires '#' ignorés)."""
+    with open(url_file, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+
+def download_audio_batch(urls: Iterable[str], output_dir: str = "downloads", max_workers: int = 4,
+                         archive_file: Optional[str] = None, audio_format: str = "wav") -> List[Dict]:
+    """
+    Télécharge l'audio de plusieurs vidéos avec un pool de threads borné.
+
+    Args:
+        urls: URLs des vidéos
+        output_dir: Dossier de sortie pour l'audio
+        max_workers: Nombre maximal de téléchargements simultanés
+        archive_file: Archive yt-dlp des vidéos déjà téléchargées
+                      (par défaut : download_archive.txt dans le dossier de sortie)
+        audio_format: Format de sortie, voir AUDIO_FORMATS
+
+    Returns:
+        Résultats par URL, dans l'ordre d'entrée (chemin audio, statut "ok", "skipped"
+        pour une vidéo déjà dans l'archive ou "error", erreur, durée)
+    """
+    urls = list(dict.fromkeys(urls))  # Dédoublonne en conservant l'ordre
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    archive_file = archive_file or os.path.join(output_dir, "download_archive.txt")
+    logging.info(f"Téléchargement de {len(urls)} URL(s) avec {max_workers} thread(s)")
+
+    def download_one(url: str) -> Dict:
+        start = time.perf_counter()
+        result = {"url": url, "audio_path": None, "status": "ok", "error": None}
+        try:
+            result["audio_path"] = download_audio(url, output_dir, archive_file, audio_format)
+            if result["audio_path"] is None:
+                result["status"] = "skipped"
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["duration"] = round(time.perf_counter() - start, 3)
+        return result
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(download_one, url): url for url in urls}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["url"]] = result
+            logging.info(f"[{len(results)}/{len(urls)}] {result['url']} : {result['status']}")
+
+    return [results[url] for url in urls]
+
+
 if __name__ == "__main__":
     import argparse
-    parser = argparse.ArgumentParser(description="Télécharge l'audio d'une vidéo YouTube")
-    parser.add_argument("url", help="URL de la vidéo YouTube")
+    parser = argparse.ArgumentParser(description="Télécharge l'audio d'une ou plusieurs vidéos YouTube")
+    parser.add_argument("urls", nargs="*", help="URL(s) des vidéos YouTube")
+    parser.add_argument("--url-file", help="Fichier contenant une URL par ligne")
     parser.add_argument("--output-dir", default="downloads", help="Dossier de sortie pour l'audio")
+    parser.add_argument("--workers", type=int, default=4, help="Nombre de téléchargements simultanés")
+    parser.add_argument("--archive", help="Archive des vidéos déjà téléchargées (ignorées)")
+    parser.add_argument("--format", choices=AUDIO_FORMATS, default="wav",
+                        help="Format de sortie : wav, native (sans réencodage) ou pcm16k (16 kHz mono)")
     args = parser.parse_args()
-    
+
+    urls = list(args.urls)
+    if args.url_file:
+        urls.extend(read_urls(args.url_file))
+    if not urls:
+        parser.error("au moins une URL ou --url-file est requis")
+
     try:
-        audio_path = download_audio(args.url, args.output_dir)
-        print(f"Audio téléchargé : {audio_path}")
+        if len(urls) == 1 and not args.url_file:
+            audio_path = download_audio(urls[0], args.output_dir, args.archive, args.format)
+            print(f"Audio téléchargé : {audio_path}" if audio_path else "Vidéo déjà dans l'archive, ignorée")
+        else:
+            results = download_audio_batch(urls, args.output_dir, args.workers, args.archive, args.format)
+            for result in results:
+                if result["status"] == "ok":
+                    print(f"Audio téléchargé : {result['audio_path']}")
+                elif result["status"] == "skipped":
+                    print(f"Déjà dans l'archive, ignorée : {result['url']}")
+                else:
+                    print(f"Erreur pour {result['url']} : {result['error']}")
+            if any(result["status"] == "error" for result in results):
+                exit(1)
     except Exception as e:
         print(f"Erreur : {str(e)}")
-        exit(1) 
\ No newline at end of file
+        exit(1)
@@ -0,0 +1,186 @@
+import os
+import re
+import json
+import zlib
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from ..analyzers.chunking import iter_sentences
+
+# Version du format : un manifeste d'une autre version est ignoré
+MANIFEST_VERSION = 2
+
+# Taille visée des paragraphes d'analyse (en caractères)
+DEFAULT_PARAGRAPH_CHARS = 2000
+
+# Taille maximale d'un groupe de paragraphes analysés ensemble (en caractères)
+DEFAULT_BATCH_CHARS = 12000
+
+# Une fin de phrase sur CUT_MODULUS en moyenne termine un paragraphe, une fois
+# la moitié de la taille visée atteinte
+CUT_MODULUS = 4
+
+_BLANK_LINE = re.compile(r'\n\s*\n')
+
+
+class Paragraph(NamedTuple):
+    """Portion de transcription nettoyée et répartie entre les sections d'un seul tenant."""
+    text: str
+    separator: str  # Séparateur avec le paragraphe suivant dans le texte nettoyé
+
+
+def fingerprint(*parts: str) -> str:
+    """Empreinte SHA-256 d'une suite de textes."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _content_defined_pieces(block: str, target_chars: int) -> Iterator[str]:
+    """Coupe un bloc sans ligne vide en fins de phrases choisies d'après leur contenu."""
+    min_chars, max_chars = target_chars // 2, target_chars * 2
+    start = None
+    end = 0
+    for sentence_start, end in iter_sentences(block):
+        if start is None:
+            start = sentence_start
+        size = end - start
+        if size >= max_chars or (size >= min_chars and
+                                 zlib.crc32(block[sentence_start:end].encode('utf-8')) % CUT_MODULUS == 0):
+            yield block[start:end].strip()
+            start = None
+    if start is not None:
+        yield block[start:end].strip()
+
+
+def split_paragraphs(text: str, target_chars: int = DEFAULT_PARAGRAPH_CHARS) -> List[Paragraph]:
+    """
+    Découpe une transcription en paragraphes d'analyse.
+
+    Les paragraphes du texte (séparés par une ligne vide) sont conservés ; les
+    plus longs, comme une transcription Whisper d'un seul tenant, sont coupés
+    en fins de phrases. Une phrase termine un paragraphe selon son propre
+    contenu et non selon sa position : corriger une phrase ne déplace que les
+    coupures voisines, et les autres paragraphes gardent leur empreinte.
+
+    Args:
+        text: Transcription complète
+        target_chars: Taille visée des paragraphes coupés (en caractères)
+
+    Returns:
+        Paragraphes dans l'ordre du texte
+    """
+    paragraphs = []
+    for block in _BLANK_LINE.split(text):
+        pieces = [piece for piece in _content_defined_pieces(block, target_chars) if piece]
+        for index, piece in enumerate(pieces):
+            paragraphs.append(Paragraph(piece, " " if index < len(pieces) - 1 else "\n\n"))
+    return paragraphs
+
+
+def run_key(paragraph_fingerprints: List[str]) -> str:
+    """Clé d'une suite de paragraphes analysés ensemble."""
+    return fingerprint(*paragraph_fingerprints)
+
+
+class AnalysisManifest:
+    """Empreintes et résultats d'une analyse, conservés à côté du document généré.
+
+    Chaque résultat est enregistré avec l'empreinte de son entrée :
+    - runs : suite de paragraphes consécutifs analysés ensemble (un seul pour
+      une petite correction, plusieurs pour une première analyse) -> empreintes
+      des paragraphes, texte nettoyé et sa répartition entre les sections
+    - sections : titre -> empreinte du contenu réuni de la section et section retravaillée
+    - summary : empreinte du texte nettoyé complet et résumé
+    """
+
+    def __init__(self, analyzer_key: str):
+        """
+        Args:
+            analyzer_key: Identifiant de l'analyseur ; les résultats d'un autre analyseur ne sont pas réutilisés
+        """
+        self.analyzer_key = analyzer_key
+        self.runs: Dict[str, Dict] = {}
+        self.sections: Dict[str, Dict[str, str]] = {}
+        self.summary: Optional[Dict[str, str]] = None
+
+    @staticmethod
+    def path_for(output_path: str) -> str:
+        """Chemin du manifeste d'un document (« x_analysis.md » -> « x_analysis.manifest.json »)."""
+        return str(Path(output_path).with_suffix(".manifest.json"))
+
+    @classmethod
+    def load(cls, path: str, analyzer_key: str) -> "AnalysisManifest":
+        """Charge un manifeste ; retourne un manifeste vide s'il est absent, illisible ou d'un autre analyseur."""
+        manifest = cls(analyzer_key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError) as e:
+            logging.warning(f"Manifeste illisible, ignoré : {path} ({str(e)})")
+            return manifest
+        if data.get("version") != MANIFEST_VERSION or data.get("analyzer") != analyzer_key:
+            logging.info(f"Manifeste d'une autre version ou d'un autre analyseur, ignoré : {path}")
+            return manifest
+        manifest.runs = data.get("runs", {})
+        manifest.sections = data.get("sections", {})
+        manifest.summary = data.get("summary")
+        return manifest
+
+    def reusable_runs(self, paragraph_fingerprints: List[str]) -> Dict[int, str]:
+        """
+        Repère les suites de paragraphes déjà analysées.
+
+        Returns:
+            Position du premier paragraphe de chaque suite réutilisable -> clé de la suite
+        """
+        by_first: Dict[str, List[str]] = {}
+        for key, run in self.runs.items():
+            by_first.setdefault(run["paragraphs"][0], []).append(key)
+
+        reusable = {}
+        position = 0
+        while position < len(paragraph_fingerprints):
+            # La plus longue suite qui reprend exactement les paragraphes à partir d'ici
+            candidates = [key for key in by_first.get(paragraph_fingerprints[position], [])
+                          if paragraph_fingerprints[position:position + len(self.runs[key]["paragraphs"])]
+                          == self.runs[key]["paragraphs"]]
+            if candidates:
+                key = max(candidates, key=lambda k: len(self.runs[k]["paragraphs"]))
+                reusable[position] = key
+                position += len(self.runs[key]["paragraphs"])
+            else:
+                position += 1
+        return reusable
+
+    def section_output(self, title: str, input_fingerprint: str) -> Optional[str]:
+        """Section retravaillée enregistrée pour ce contenu, ou None."""
+        entry = self.sections.get(title)
+        if entry is not None and entry.get("input") == input_fingerprint:
+            return entry["output"]
+        return None
+
+    def summary_output(self, input_fingerprint: str) -> Optional[str]:
+        """Résumé enregistré pour ce texte nettoyé, ou None."""
+        if self.summary is not None and self.summary.get("input") == input_fingerprint:
+            return self.summary["output"]
+        return None
+
+    def save(self, path: str):
+        """Enregistre le manifeste atomiquement."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "analyzer": self.analyzer_key,
+                "runs": self.runs,
+                "sections": self.sections,
+                "summary": self.summary
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
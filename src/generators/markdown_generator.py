@@ -1,84 +1,356 @@
-import logging
 import time
-from typing import Dict
-from pathlib import Path
+import logging
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from ..analyzers.base import TextAnalyzer
-from ..analyzers.basic_analyzer import BasicAnalyzer
-from ..analyzers.openai_analyzer import OpenAIAnalyzer
-from ..analyzers.huggingface_analyzer import HuggingFaceAnalyzer
+from ..utils.config import get_setting
+from ..utils.segment_index import SegmentIndex
+from .manifest import (DEFAULT_BATCH_CHARS, DEFAULT_PARAGRAPH_CHARS, AnalysisManifest, Paragraph,
+                       fingerprint, run_key, split_paragraphs)
+from .markdown_writer import MarkdownWriter
+
+# Taille des blocs lus dans les transcriptions (en caractères)
+READ_BLOCK_SIZE = 1 << 20
+
+# Au-delà de cette part de paragraphes à analyser, l'analyse incrémentale
+# regroupe les paragraphes consécutifs au lieu de les analyser un par un
+BATCH_CHANGED_RATIO = 0.5
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Pool de processus partagé par les générateurs, pour les analyseurs limités par le calcul."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # "spawn" évite de dupliquer l'état de PyTorch du processus parent
+            _process_pool = ProcessPoolExecutor(max_workers=get_setting("analysis", "stage_processes", 2),
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+
+def _timed_call(function: Callable, *args) -> Tuple[object, float]:
+    """Appelle une fonction et retourne son résultat avec sa durée (mesurée là où elle s'exécute)."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, round(time.perf_counter() - start, 3)
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        # Cumulé : une étape peut être mesurée en plusieurs fois (écritures entrecoupées)
+        timings[stage] = round(timings.get(stage, 0.0) + time.perf_counter() - start, 3)
+
+
+def read_blocks(path: str, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    """Lit un fichier texte par blocs successifs."""
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+def read_transcript(path: str) -> Iterator[str]:
+    """
+    Lit une transcription par morceaux successifs.
+
+    Si analysis.min_avg_logprob est défini et que la table des segments de la
+    transcription est disponible, les segments dont la confiance moyenne est
+    inférieure sont écartés.
+    """
+    min_avg_logprob = get_setting("analysis", "min_avg_logprob", None)
+    index = SegmentIndex.open(path) if min_avg_logprob is not None else None
+    if index is None:
+        yield from read_blocks(path)
+        return
+    with index:
+        yield from index.iter_text(min_avg_logprob=min_avg_logprob)
 
 class DocumentGenerator:
-    """Classe pour générer la documentation Markdown"""
+    """Classe pour générer la documentation Markdown
+
+    Avec un analyseur incrémental (voir `TextAnalyzer.incremental`), un
+    manifeste des empreintes et des résultats par paragraphe et par section est
+    conservé à côté du document : à l'analyse suivante, seuls les paragraphes
+    modifiés et les sections concernées repassent par l'analyseur.
+    """
     
-    def __init__(self, analyzer: TextAnalyzer):
+    def __init__(self, analyzer: TextAnalyzer, use_manifest: bool = True):
+        """
+        Args:
+            analyzer: Analyseur de texte
+            use_manifest: Si False, les résultats d'un manifeste existant ne sont pas
+                          réutilisés (le manifeste est tout de même réécrit)
+        """
         self.analyzer = analyzer
+        self.use_manifest = use_manifest
+
+    def generate_markdown(self, transcript_path: str, output_path: str) -> Dict[str, float]:
+        """Génère un document Markdown à partir de la transcription.
 
-    def generate_markdown(self, transcript_path: str, output_path: str):
-        """Génère un document Markdown à partir de la transcription."""
+        Returns:
+            Durée de chaque étape, en secondes
+        """
+        timings = {}
+        manifest = None
         try:
-            with open(transcript_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-            
-            logging.info("Nettoyage du texte...")
-            cleaned_text = self.analyzer.clean_text(text)
-            
-            logging.info("Extraction des sections...")
-            sections = self.analyzer.extract_sections(cleaned_text)
-            
-            logging.info("Création du résumé...")
-            summary = self.analyzer.create_summary(cleaned_text)
-            
             logging.info("Génération du document Markdown...")
-            markdown = self._create_markdown_content(summary, sections)
-            
-            # Crée le répertoire de sortie si nécessaire
-            output_dir = Path(output_path).parent
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(markdown)
+            if self.analyzer.incremental:
+                manifest = self._analyze_incremental(transcript_path, output_path, timings)
+            else:
+                self._analyze(transcript_path, output_path, timings)
+            if manifest is not None:
+                self._save_manifest(manifest, output_path)
                 
-            logging.info(f"Documentation générée avec succès : {output_path}")
+            logging.info(f"Documentation générée avec succès : {output_path} "
+                         f"({', '.join(f'{stage} {duration:.2f}s' for stage, duration in timings.items())})")
+            return timings
             
         except Exception as e:
             logging.error(f"Erreur lors de la génération de la documentation : {str(e)}")
             raise
 
-    def _create_markdown_content(self, summary: str, sections: Dict[str, str]) -> str:
-        """Crée le contenu Markdown."""
-        # Détermine le type d'analyseur utilisé
-        analyzer_type = "basique"
-        if isinstance(self.analyzer, HuggingFaceAnalyzer):
-            analyzer_type = "Hugging Face"
-        elif isinstance(self.analyzer, OpenAIAnalyzer):
-            analyzer_type = "OpenAI"
-
-        markdown = f"""# Analyse de la Transcription
-
-## Méthode d'analyse
-Cette analyse a été générée en utilisant l'analyseur **{analyzer_type}**.
-
-## Résumé
-{summary}
-
-## Table des Matières
-1. [Introduction](#introduction)
-2. [Installation et Configuration](#installation-et-configuration)
-3. [Fonctionnalités](#fonctionnalités)
-4. [Utilisation](#utilisation)
-5. [Conclusion](#conclusion)
-
-"""
-        for title, content in sections.items():
-            if content.strip():
-                # Convertit le titre en ancre valide pour le lien
-                anchor = title.lower().replace(' ', '-').replace('é', 'e')
-                markdown += f"## {title}\n{content}\n\n"
-
-        markdown += f"""---
-Généré automatiquement à partir de la transcription
-Méthode d'analyse : {analyzer_type}
-Date de génération : {time.strftime('%Y-%m-%d %H:%M:%S')}
----"""
-
-        return markdown 
\ No newline at end of file
+    def _open_writer(self, output_path: str) -> MarkdownWriter:
+        # Écrit dans un fichier temporaire, renommé à la fin : pas de document tronqué en cas d'erreur
+        return MarkdownWriter(output_path, self.analyzer.display_name)
+
+    def _write_summary(self, writer: MarkdownWriter, summary: str, timings: Dict[str, float]):
+        with _timed(timings, "écriture"):
+            # Le nom n'est connu qu'après l'analyse (repli éventuel de l'analyseur)
+            writer.analyzer_name = self.analyzer.display_name
+            writer.write_summary(summary)
+
+    @staticmethod
+    def _write_section(writer: MarkdownWriter, title: str, content, timings: Dict[str, float]):
+        with _timed(timings, "écriture"):
+            writer.write_section(title, content)
+
+    def _analyze(self, transcript_path: str, output_path: str, timings: Dict[str, float]):
+        """
+        Analyse la transcription selon `stage_concurrency` de l'analyseur et écrit le document.
+
+        Sans concurrence, l'analyseur traite la transcription au fil de la
+        lecture. Sinon, le texte est nettoyé puis les sections et le résumé, qui
+        ne dépendent que du texte nettoyé, sont calculés en parallèle : chacun
+        est écrit dès qu'il est prêt, les sections terminées avant le résumé
+        étant mises de côté par le `MarkdownWriter`.
+        """
+        mode = self.analyzer.stage_concurrency
+        if mode is None:
+            # Les analyseurs qui le permettent traitent la transcription au fil de la lecture
+            with _timed(timings, "analyse"):
+                summary, sections = self.analyzer.analyze_stream(read_transcript(transcript_path))
+            with self._open_writer(output_path) as writer:
+                self._write_summary(writer, summary, timings)
+                for title, content in sections.items():
+                    self._write_section(writer, title, content, timings)
+            return
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Mode d'exécution des étapes inconnu : {mode}")
+
+        with _timed(timings, "lecture"):
+            text = "".join(read_transcript(transcript_path))
+        logging.info("Nettoyage du texte...")
+        with _timed(timings, "nettoyage"):
+            cleaned_text = self.analyzer.clean_text(text)
+
+        logging.info(f"Extraction des sections et création du résumé en parallèle ({mode})...")
+        executor: Executor = _get_process_pool() if mode == "process" else ThreadPoolExecutor(max_workers=2)
+        try:
+            with _timed(timings, "sections et résumé"), self._open_writer(output_path) as writer:
+                sections_future = executor.submit(_timed_call, self.analyzer.extract_sections, cleaned_text)
+                summary_future = executor.submit(_timed_call, self.analyzer.create_summary, cleaned_text)
+                for future in as_completed((sections_future, summary_future)):
+                    if future is summary_future:
+                        summary, timings["résumé"] = future.result()
+                        self._write_summary(writer, summary, timings)
+                    else:
+                        sections, timings["sections"] = future.result()
+                        for title, content in sections.items():
+                            self._write_section(writer, title, content, timings)
+        finally:
+            if mode == "thread":
+                executor.shutdown(wait=True)
+
+    @staticmethod
+    def _save_manifest(manifest: AnalysisManifest, output_path: str):
+        manifest_path = AnalysisManifest.path_for(output_path)
+        try:
+            manifest.save(manifest_path)
+        except OSError as e:
+            # Sans manifeste, la prochaine analyse est simplement complète
+            logging.warning(f"Impossible d'enregistrer le manifeste {manifest_path} : {str(e)}")
+
+    def _analyze_incremental(self, transcript_path: str, output_path: str, timings: Dict[str, float]):
+        """
+        Analyse la transcription en réutilisant les résultats du manifeste.
+
+        Si l'analyseur échoue, le document en cours est abandonné et la
+        transcription est analysée en entier comme pour un analyseur non
+        incrémental, et aucun manifeste n'est produit : un résultat de repli ne
+        doit pas être réutilisé aux analyses suivantes.
+
+        Returns:
+            Nouveau manifeste, ou None après un repli
+        """
+        try:
+            return self._analyze_with_manifest(transcript_path, output_path, timings)
+        except Exception as e:
+            logging.warning(f"Échec de l'analyse incrémentale ({str(e)}), analyse complète de la transcription")
+            timings.clear()
+            self._analyze(transcript_path, output_path, timings)
+            return None
+
+    def _analyze_with_manifest(self, transcript_path: str, output_path: str, timings: Dict[str, float]):
+        analyzer = self.analyzer
+        analyzer_key = f"{type(analyzer).__module__}.{type(analyzer).__qualname__}"
+        if analyzer.cache_key():
+            # Modèle, variante, consignes... : d'autres réglages invalident les résultats conservés
+            analyzer_key += f":{analyzer.cache_key()}"
+        manifest_path = AnalysisManifest.path_for(output_path)
+        previous = (AnalysisManifest.load(manifest_path, analyzer_key) if self.use_manifest
+                    else AnalysisManifest(analyzer_key))
+        manifest = AnalysisManifest(analyzer_key)
+
+        with _timed(timings, "lecture"):
+            paragraphs = split_paragraphs("".join(read_transcript(transcript_path)),
+                                          get_setting("analysis", "incremental_paragraph_chars",
+                                                      DEFAULT_PARAGRAPH_CHARS))
+            fingerprints = [fingerprint(paragraph.text) for paragraph in paragraphs]
+        runs = self._plan_runs(paragraphs, fingerprints, previous)
+
+        def analyze_run(start: int, end: int) -> Dict:
+            text = "".join(paragraph.text + (paragraph.separator if index < end - 1 else "")
+                           for index, paragraph in enumerate(paragraphs[start:end], start))
+            cleaned = analyzer.clean_paragraph(text)
+            return {"paragraphs": fingerprints[start:end], "cleaned": cleaned,
+                    "sections": analyzer.split_sections(cleaned)}
+
+        workers = analyzer.stage_workers or get_setting("analysis", "incremental_workers", 4)
+        with analyzer.stage_session(), ThreadPoolExecutor(max_workers=workers) as executor:
+            new_runs = [(start, end) for start, end, key in runs if key is None]
+            logging.info(f"Analyse incrémentale : {sum(end - start for start, end in new_runs)}/{len(paragraphs)} "
+                         f"paragraphe(s) à analyser en {len(new_runs)} appel(s)")
+            with _timed(timings, "paragraphes"):
+                futures = {run: executor.submit(analyze_run, *run) for run in new_runs}
+                results = [previous.runs[key] if key is not None else futures[(start, end)].result()
+                           for start, end, key in runs]
+            for result in results:
+                manifest.runs[run_key(result["paragraphs"])] = result
+
+            cleaned_text = "".join(
+                result["cleaned"] + (paragraphs[end - 1].separator if end < len(paragraphs) else "")
+                for (_, end, _), result in zip(runs, results)
+            )
+            contents: Dict[str, List[str]] = {}
+            for result in results:
+                for title, content in result["sections"].items():
+                    contents.setdefault(title, [])
+                    if content.strip():
+                        contents[title].append(content.strip())
+
+            with _timed(timings, "sections et résumé"), self._open_writer(output_path) as writer:
+                summary_input = fingerprint(cleaned_text)
+                summary: Union[str, Future, None] = previous.summary_output(summary_input)
+                if summary is None:
+                    summary = executor.submit(analyzer.summarize_text, cleaned_text)
+                sections: List[Tuple[str, Union[str, Future]]] = []
+                for title, parts in contents.items():
+                    content = "\n\n".join(parts)
+                    section_input = fingerprint(title, content)
+                    output = previous.section_output(title, section_input)
+                    if output is None:
+                        output = executor.submit(analyzer.refine_section, title, content)
+                    sections.append((title, output))
+                    manifest.sections[title] = {"input": section_input, "output": output}
+                refined = sum(isinstance(output, Future) for _, output in sections)
+                logging.info(f"Analyse incrémentale : {refined}/{len(contents)} section(s) à retravailler, "
+                             f"résumé {'à refaire' if isinstance(summary, Future) else 'inchangé'}")
+                summary = self._write_as_completed(writer, summary, sections, timings)
+                for title, output in sections:
+                    if isinstance(output, Future):
+                        manifest.sections[title]["output"] = output.result()
+                manifest.summary = {"input": summary_input, "output": summary}
+        return manifest
+
+    def _write_as_completed(self, writer: MarkdownWriter, summary: Union[str, Future],
+                            sections: List[Tuple[str, Union[str, Future]]], timings: Dict[str, float]) -> str:
+        """
+        Écrit le résumé et les sections, dans l'ordre, à mesure que leurs calculs se terminent.
+
+        Returns:
+            Le résumé
+        """
+        def ready(value) -> bool:
+            return not isinstance(value, Future) or value.done()
+
+        def result(value) -> str:
+            return value.result() if isinstance(value, Future) else value
+
+        summary_written = False
+        position = 0
+        pending = [value for value in (summary, *(output for _, output in sections)) if isinstance(value, Future)]
+        for _ in [None, *as_completed(pending)]:
+            if not summary_written and ready(summary):
+                self._write_summary(writer, result(summary), timings)
+                summary_written = True
+            # Les sections suivent l'ordre du texte : une section prête attend celles qui la précèdent
+            while position < len(sections) and ready(sections[position][1]):
+                title, output = sections[position]
+                self._write_section(writer, title, result(output), timings)
+                position += 1
+        return result(summary)
+
+    @staticmethod
+    def _plan_runs(paragraphs: List[Paragraph], fingerprints: List[str],
+                   previous: AnalysisManifest) -> List[Tuple[int, int, Optional[str]]]:
+        """
+        Répartit les paragraphes en suites analysées d'un seul appel.
+
+        Les suites du manifeste précédent dont les paragraphes n'ont pas changé
+        sont réutilisées. Sans manifeste, ou si la plupart des paragraphes sont
+        à analyser, les paragraphes à analyser consécutifs sont regroupés (dans
+        la limite de analysis.incremental_batch_chars) : une première analyse
+        coûte autant d'appels qu'une analyse complète. Pour une petite
+        correction, chaque paragraphe est analysé seul, et la correction
+        suivante n'invalide que lui.
+
+        Returns:
+            Suites (premier paragraphe, paragraphe après le dernier, clé de la
+            suite réutilisée ou None), dans l'ordre du texte
+        """
+        reusable = previous.reusable_runs(fingerprints)
+        covered = sum(len(previous.runs[key]["paragraphs"]) for key in reusable.values())
+        batch = not reusable or len(paragraphs) - covered > BATCH_CHANGED_RATIO * len(paragraphs)
+        batch_chars = get_setting("analysis", "incremental_batch_chars", DEFAULT_BATCH_CHARS) if batch else 0
+
+        runs: List[Tuple[int, int, Optional[str]]] = []
+        run_chars = 0
+        position = 0
+        while position < len(paragraphs):
+            key = reusable.get(position)
+            if key is not None:
+                end = position + len(previous.runs[key]["paragraphs"])
+                runs.append((position, end, key))
+            else:
+                end = position + 1
+                size = len(paragraphs[position].text)
+                if runs and runs[-1][2] is None and run_chars + size <= batch_chars:
+                    runs[-1] = (runs[-1][0], end, None)
+                    run_chars += size
+                else:
+                    runs.append((position, end, None))
+                    run_chars = size
+            position = end
+        return runs
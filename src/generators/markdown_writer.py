@@ -0,0 +1,147 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+from pathlib import Path
+from typing import IO, Iterable, Optional, Union
+
+TABLE_OF_CONTENTS = """## Table des Matières
+1. [Introduction](#introduction)
+2. [Installation et Configuration](#installation-et-configuration)
+3. [Fonctionnalités](#fonctionnalités)
+4. [Utilisation](#utilisation)
+5. [Conclusion](#conclusion)
+
+"""
+
+
+class MarkdownWriter:
+    """Écriture progressive et atomique d'un document d'analyse Markdown.
+
+    Le document est écrit dans un fichier temporaire du dossier de destination,
+    puis renommé d'un seul coup à la validation : en cas d'erreur, le fichier de
+    sortie précédent reste intact. Les sections peuvent être écrites avant que
+    le résumé soit prêt ; elles sont alors mises de côté dans un second fichier
+    temporaire et recopiées par blocs derrière le résumé dès qu'il est écrit.
+    L'en-tête est écrit avec le résumé : le nom de la méthode d'analyse peut
+    encore être modifié jusque-là (par exemple après un repli de l'analyseur).
+
+    Utilisation :
+        with MarkdownWriter(output_path, "basique") as writer:
+            writer.write_section("Introduction", texte)
+            writer.write_summary(resume)
+    """
+
+    def __init__(self, output_path: str, analyzer_name: str):
+        """
+        Args:
+            output_path: Chemin du document à produire
+            analyzer_name: Nom de la méthode d'analyse affiché dans le document
+                           (attribut modifiable jusqu'à l'écriture du résumé)
+        """
+        self.output_path = output_path
+        self.analyzer_name = analyzer_name
+        self._summary_written = False
+        self._spool: Optional[IO[str]] = None
+        self._closed = False
+
+        output_dir = Path(output_path).parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(prefix=f".{Path(output_path).name}.", suffix=".tmp",
+                                               dir=str(output_dir))
+        self._file = os.fdopen(fd, 'w', encoding='utf-8')
+
+    def __enter__(self) -> "MarkdownWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def write_summary(self, summary: str):
+        """Écrit le résumé et la table des matières (une seule fois, à tout moment avant la validation)."""
+        if self._summary_written:
+            raise RuntimeError("Le résumé a déjà été écrit")
+        self._file.write(f"""# Analyse de la Transcription
+
+## Méthode d'analyse
+Cette analyse a été générée en utilisant l'analyseur **{self.analyzer_name}**.
+
+""")
+        self._file.write(f"## Résumé\n{summary}\n\n")
+        self._file.write(TABLE_OF_CONTENTS)
+        self._summary_written = True
+        if self._spool is not None:
+            # Recopie les sections écrites avant le résumé
+            self._spool.seek(0)
+            shutil.copyfileobj(self._spool, self._file)
+            self._spool.close()
+            self._spool = None
+
+    def write_section(self, title: str, content: Union[str, Iterable[str]]):
+        """
+        Écrit une section, à partir d'un texte ou de morceaux successifs.
+
+        Une section vide (ou faite uniquement d'espaces) n'est pas écrite.
+        """
+        if isinstance(content, str):
+            content = (content,)
+        target = self._file if self._summary_written else self._section_spool()
+        started = False
+        leading = []
+        for piece in content:
+            if not started:
+                # Les morceaux blancs en tête ne sont écrits que si la section a un contenu
+                if not piece.strip():
+                    leading.append(piece)
+                    continue
+                target.write(f"## {title}\n")
+                target.write("".join(leading))
+                started = True
+            target.write(piece)
+        if started:
+            target.write("\n\n")
+
+    def _section_spool(self) -> IO[str]:
+        if self._spool is None:
+            self._spool = tempfile.TemporaryFile('w+', encoding='utf-8', dir=str(Path(self._temp_path).parent))
+        return self._spool
+
+    def commit(self):
+        """Termine le document et le met en place atomiquement."""
+        if self._closed:
+            return
+        try:
+            if not self._summary_written:
+                self.write_summary("")
+            self._file.write(f"""---
+Généré automatiquement à partir de la transcription
+Méthode d'analyse : {self.analyzer_name}
+Date de génération : {time.strftime('%Y-%m-%d %H:%M:%S')}
+---""")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.chmod(self._temp_path, 0o644)
+            os.replace(self._temp_path, self.output_path)
+        except BaseException:
+            self.abort()
+            raise
+        self._closed = True
+
+    def abort(self):
+        """Abandonne le document : les fichiers temporaires sont supprimés, la sortie existante est conservée."""
+        if self._closed:
+            return
+        self._closed = True
+        self._file.close()
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        try:
+            os.remove(self._temp_path)
+        except OSError as e:
+            logging.warning(f"Impossible de supprimer le fichier temporaire {self._temp_path} : {str(e)}")
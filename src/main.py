@@ -1,60 +1,157 @@
 import os
+import time
+import fnmatch
 import logging
 import argparse
 from pathlib import Path
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .analyzers.basic_analyzer import BasicAnalyzer
-from .analyzers.openai_analyzer import OpenAIAnalyzer, OPENAI_AVAILABLE
-from .analyzers.huggingface_analyzer import HuggingFaceAnalyzer, HUGGING_FACE_AVAILABLE
+from .analyzers import ANALYZERS, BasicAnalyzer, load_analyzer_module
 from .generators.markdown_generator import DocumentGenerator
 from .utils.logging_config import setup_logging
 
-def get_analyzer(analyzer_type: str = "basic", openai_api_key: Optional[str] = None):
-    """Retourne l'analyseur approprié selon le type demandé."""
-    logging.info(f"Initialisation de l'analyseur de type '{analyzer_type}'")
+# Paquet requis par chaque analyseur : (indicateur de disponibilité du module, paquet à installer)
+_ANALYZER_REQUIREMENTS = {
+    "huggingface": ("HUGGING_FACE_AVAILABLE", "transformers"),
+    "openai": ("OPENAI_AVAILABLE", "openai"),
+}
+
+
+def _openai_options(api_key: Optional[str], concurrency: int, use_cache: bool,
+                    validate: bool) -> Tuple[Optional[str], Dict[str, Any]]:
+    options = {"api_key": api_key, "use_cache": use_cache, "validate": validate}
+    if concurrency > 1:
+        # Requêtes indépendantes envoyées en parallèle (asyncio)
+        return "AsyncOpenAIAnalyzer", dict(options, max_concurrency=concurrency)
+    return None, options
+
+
+# Arguments du constructeur de chaque analyseur, d'après les options de get_analyzer :
+# (classe à utiliser à la place de celle de ANALYZERS ou None, arguments)
+_ANALYZER_OPTIONS: Dict[str, Callable[..., Tuple[Optional[str], Dict[str, Any]]]] = {
+    "basic": lambda api_key, concurrency, use_cache, validate: (None, {}),
+    "huggingface": lambda api_key, concurrency, use_cache, validate: (None, {"use_cache": use_cache}),
+    "openai": _openai_options,
+}
+
+
+def get_analyzer(analyzer_type: str = "basic", openai_api_key: Optional[str] = None,
+                 openai_concurrency: int = 1, use_cache: bool = True, validate_openai_key: bool = False):
+    """Retourne l'analyseur approprié selon le type demandé.
     
-    if analyzer_type == "openai":
-        if not OPENAI_AVAILABLE:
-            logging.error("OpenAI n'est pas installé. Installation avec 'pip install openai' requise.")
-            logging.info("Utilisation de l'analyseur basique comme fallback")
-            return BasicAnalyzer()
-        
-        if not openai_api_key:
-            logging.error("Clé API OpenAI manquante. Une clé valide est requise pour utiliser l'analyseur OpenAI.")
-            logging.info("Utilisation de l'analyseur basique comme fallback")
-            return BasicAnalyzer()
-        
-        try:
-            return OpenAIAnalyzer(openai_api_key)
-        except Exception as e:
-            logging.error(f"Erreur lors de l'initialisation de l'analyseur OpenAI: {str(e)}")
-            logging.info("Utilisation de l'analyseur basique comme fallback")
-            return BasicAnalyzer()
-            
-    elif analyzer_type == "huggingface":
-        if not HUGGING_FACE_AVAILABLE:
-            logging.error("Hugging Face n'est pas installé. Installation avec 'pip install transformers' requise.")
+    Avec `openai_concurrency` > 1, l'analyseur OpenAI envoie ses requêtes
+    indépendantes en parallèle (asyncio) dans cette limite. Avec `use_cache`,
+    les réponses des modèles sont réutilisées d'une exécution à l'autre.
+    La clé OpenAI n'est vérifiée au démarrage que si `validate_openai_key` est vrai ;
+    sinon une clé invalide est signalée au premier appel.
+
+    La classe est résolue d'après ANALYZERS et seul le module de l'analyseur
+    demandé est importé : l'analyseur basique ne charge ni torch, ni
+    transformers, ni openai. Si l'analyseur ne peut pas être créé, l'analyseur
+    basique est utilisé.
+    """
+    logging.info(f"Initialisation de l'analyseur de type '{analyzer_type}'")
+    module = load_analyzer_module(analyzer_type)
+
+    if analyzer_type in _ANALYZER_REQUIREMENTS:
+        flag, package = _ANALYZER_REQUIREMENTS[analyzer_type]
+        if not getattr(module, flag):
+            logging.error(f"{package} n'est pas installé. Installation avec 'pip install {package}' requise.")
             logging.info("Utilisation de l'analyseur basique comme fallback")
             return BasicAnalyzer()
-        
+
+    class_name, options = _ANALYZER_OPTIONS[analyzer_type](openai_api_key, openai_concurrency, use_cache,
+                                                           validate_openai_key)
+    try:
+        return getattr(module, class_name or ANALYZERS[analyzer_type][1])(**options)
+    except Exception as e:
+        logging.error(f"Erreur lors de l'initialisation de l'analyseur '{analyzer_type}': {str(e)}")
+        logging.info("Utilisation de l'analyseur basique comme fallback")
+        return BasicAnalyzer()
+
+def get_output_path(transcript_path: str, analyzer_type: str) -> str:
+    """Retourne le chemin de l'analyse Markdown associée à une transcription."""
+    return transcript_path.replace('_transcription.txt', f'_{analyzer_type}_analysis.md')
+
+
+def find_transcripts(directory: str = 'transcriptions', pattern: Optional[str] = None) -> List[str]:
+    """Liste les transcriptions d'un dossier, éventuellement filtrées par un motif glob sur le nom."""
+    names = sorted(f for f in os.listdir(directory) if f.endswith('_transcription.txt'))
+    if pattern:
+        names = [f for f in names if fnmatch.fnmatch(f, pattern)]
+    return [os.path.join(directory, f) for f in names]
+
+
+def is_up_to_date(transcript_path: str, output_path: str) -> bool:
+    """Indique si l'analyse existe déjà et est plus récente que la transcription."""
+    return os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(transcript_path)
+
+
+def analyze_transcripts(transcript_paths: List[str], analyzer, analyzer_type: str,
+                        jobs: int = 1, force: bool = False, use_manifest: bool = True) -> List[Dict]:
+    """
+    Analyse un lot de transcriptions avec un seul analyseur partagé.
+
+    Args:
+        transcript_paths: Chemins des transcriptions à analyser
+        analyzer: Analyseur initialisé une seule fois pour tout le lot
+        analyzer_type: Nom de l'analyseur, utilisé pour nommer les fichiers de sortie
+        jobs: Nombre d'analyses simultanées
+        force: Si True, réanalyse aussi les transcriptions déjà à jour
+        use_manifest: Si False, ne réutilise pas les résultats des analyses incrémentales précédentes
+
+    Returns:
+        Résultats par transcription (chemin de sortie, statut, durée totale et par étape)
+    """
+    generator = DocumentGenerator(analyzer, use_manifest)
+
+    def analyze_one(transcript_path: str) -> Dict:
+        output_path = get_output_path(transcript_path, analyzer_type)
+        result = {"transcript_path": transcript_path, "output_path": output_path, "status": "ok", "error": None}
+        if not force and is_up_to_date(transcript_path, output_path):
+            logging.info(f"Analyse déjà à jour, ignorée : {output_path}")
+            result["status"] = "skipped"
+            return result
+        start = time.perf_counter()
         try:
-            return HuggingFaceAnalyzer()
+            result["timings"] = generator.generate_markdown(transcript_path, output_path)
         except Exception as e:
-            logging.error(f"Erreur lors de l'initialisation de l'analyseur Hugging Face: {str(e)}")
-            logging.info("Utilisation de l'analyseur basique comme fallback")
-            return BasicAnalyzer()
-    
-    logging.info("Utilisation de l'analyseur basique")
-    return BasicAnalyzer()
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["duration"] = round(time.perf_counter() - start, 3)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        return list(executor.map(analyze_one, transcript_paths))
+
+
+def log_cache_stats(analyzer):
+    """Affiche les compteurs du cache de réponses utilisé par l'analyseur, s'il en a un."""
+    cache = getattr(analyzer, "cache", None)
+    if cache is not None:
+        stats = cache.stats()
+        logging.info(f"Cache des réponses : {stats['hits']} succès, {stats['misses']} échec(s), "
+                     f"{stats['entries']} entrée(s)")
+
 
 def main():
     parser = argparse.ArgumentParser(description="Analyse une transcription et génère une documentation Markdown")
-    parser.add_argument("--analyzer", choices=["basic", "huggingface", "openai"], default="basic",
+    parser.add_argument("--analyzer", choices=list(ANALYZERS), default="basic",
                       help="Type d'analyseur à utiliser")
     parser.add_argument("--openai-key", help="Clé API OpenAI (requise pour l'analyseur OpenAI)")
+    parser.add_argument("--openai-concurrency", type=int, default=1,
+                        help="Requêtes OpenAI simultanées par document (asyncio si > 1)")
+    parser.add_argument("--validate-openai-key", action="store_true",
+                        help="Vérifie la clé OpenAI au démarrage (fallback sur l'analyseur basique si invalide)")
     parser.add_argument("--debug", action="store_true", help="Active le mode debug avec plus de logs")
     parser.add_argument("--log-file", help="Fichier de log (optionnel)")
+    parser.add_argument("--all", action="store_true",
+                        help="Analyse toutes les transcriptions au lieu de la plus récente")
+    parser.add_argument("--pattern", help="Analyse les transcriptions dont le nom correspond au motif glob")
+    parser.add_argument("--jobs", type=int, default=1, help="Nombre d'analyses simultanées (mode lot)")
+    parser.add_argument("--force", action="store_true", help="Réanalyse aussi les transcriptions déjà à jour")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore le cache des réponses des modèles et les résultats des analyses précédentes")
     args = parser.parse_args()
 
     # Configuration du logging
@@ -69,21 +166,41 @@ def main():
         if not transcription_files:
             logging.error("Aucun fichier de transcription trouvé.")
             return
+        
+        if args.all or args.pattern:
+            transcript_paths = find_transcripts('transcriptions', args.pattern)
+            if not transcript_paths:
+                logging.error(f"Aucune transcription ne correspond au motif '{args.pattern}'.")
+                return
+            
+            # L'analyseur est initialisé une seule fois pour tout le lot
+            analyzer = get_analyzer(args.analyzer, args.openai_key, args.openai_concurrency, not args.no_cache,
+                                    args.validate_openai_key)
+            results = analyze_transcripts(transcript_paths, analyzer, args.analyzer, args.jobs, args.force,
+                                          not args.no_cache)
+            counts = {status: sum(1 for r in results if r["status"] == status) for status in ("ok", "skipped", "error")}
+            for result in results:
+                if result["status"] == "error":
+                    logging.error(f"Échec pour {result['transcript_path']} : {result['error']}")
+            logging.info(f"Lot terminé : {counts['ok']} analysée(s), {counts['skipped']} à jour, "
+                         f"{counts['error']} échec(s) avec l'analyseur {args.analyzer}")
+            log_cache_stats(analyzer)
+            return
             
         latest_transcription = max(transcription_files, key=lambda x: os.path.getctime(os.path.join('transcriptions', x)))
         transcript_path = os.path.join('transcriptions', latest_transcription)
         logging.debug(f"Fichier de transcription sélectionné : {transcript_path}")
         
-        analyzer_suffix = f"_{args.analyzer}"
-        output_filename = latest_transcription.replace('_transcription.txt', f'{analyzer_suffix}_analysis.md')
-        output_path = os.path.join('transcriptions', output_filename)
+        output_path = get_output_path(transcript_path, args.analyzer)
         logging.debug(f"Fichier de sortie : {output_path}")
         
-        analyzer = get_analyzer(args.analyzer, args.openai_key)
-        generator = DocumentGenerator(analyzer)
+        analyzer = get_analyzer(args.analyzer, args.openai_key, args.openai_concurrency, not args.no_cache,
+                                    args.validate_openai_key)
+        generator = DocumentGenerator(analyzer, use_manifest=not args.no_cache)
         generator.generate_markdown(transcript_path, output_path)
         
         logging.info(f"Documentation générée avec l'analyseur {args.analyzer}")
+        log_cache_stats(analyzer)
         
     except Exception as e:
         logging.error(f"Erreur lors de la génération de la documentation : {str(e)}")
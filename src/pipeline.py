@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .download_audio import AUDIO_FORMATS, download_audio, read_urls
+from .generators.markdown_generator import DocumentGenerator
+from .analyzers import ANALYZERS
+from .main import get_analyzer, get_output_path
+from .utils.logging_config import setup_logging
+
+# Marqueur de fin de flux entre deux étapes
+_DONE = object()
+
+
+def _start_stage(stage: str, process: Callable[[Dict], None], inbox: queue.Queue, outbox: queue.Queue,
+                 workers: int, after: Optional[Callable[[Dict], None]] = None) -> threading.Thread:
+    """
+    Démarre les threads d'une étape du pipeline.
+
+    Chaque thread lit les éléments de `inbox`, les traite s'ils n'ont pas déjà
+    échoué, puis les transmet à `outbox`. Quand tous les threads ont terminé,
+    un marqueur de fin est transmis à l'étape suivante.
+
+    Returns:
+        Thread qui se termine avec l'étape
+    """
+    def worker():
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            try:
+                if item["status"] == "ok":
+                    start = time.perf_counter()
+                    try:
+                        process(item)
+                    except Exception as e:
+                        item["status"] = "error"
+                        item["error"] = f"{stage} : {str(e)}"
+                        logging.error(f"Échec de l'étape '{stage}' pour {item['url']} : {str(e)}")
+                    item["timings"][stage] = round(time.perf_counter() - start, 3)
+            finally:
+                if after:
+                    after(item)
+            outbox.put(item)
+
+    threads = [threading.Thread(target=worker, name=f"{stage}-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    def close():
+        for thread in threads:
+            thread.join()
+        outbox.put(_DONE)
+
+    closer = threading.Thread(target=close, name=f"{stage}-closer", daemon=True)
+    closer.start()
+    return closer
+
+
+def _fan_out(inbox: queue.Queue, workers: int) -> queue.Queue:
+    """Relaie un flux vers une file lue par plusieurs threads, en dupliquant le marqueur de fin."""
+    outbox = queue.Queue(maxsize=max(1, workers))
+
+    def relay():
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                for _ in range(workers):
+                    outbox.put(_DONE)
+                break
+            outbox.put(item)
+
+    threading.Thread(target=relay, daemon=True).start()
+    return outbox
+
+
+def run_stages(urls: Iterable[str], download: Callable[[Dict], None], transcribe: Callable[[Dict], None],
+               analyze: Callable[[Dict], None], download_workers: int = 4, transcribe_workers: int = 1,
+               analyze_workers: int = 2, max_pending_downloads: int = 4) -> List[Dict]:
+    """
+    Fait passer chaque URL par les étapes de téléchargement, de transcription et d'analyse.
+
+    Chaque étape reçoit l'élément d'une URL (dictionnaire) et le complète ; une
+    exception le marque en échec, et un élément dont le statut n'est plus "ok"
+    traverse les étapes suivantes sans être traité. Le nombre d'éléments
+    téléchargés (ou en cours de téléchargement) et pas encore transcrits est
+    limité à `max_pending_downloads`.
+
+    Returns:
+        Éléments, dans l'ordre d'entrée
+    """
+    urls = list(dict.fromkeys(urls))
+    pending_slots = threading.BoundedSemaphore(max(1, max_pending_downloads))
+
+    def acquire_slot(item: Dict):
+        # Contre-pression : attend qu'un fichier en attente soit transcrit avant de télécharger
+        pending_slots.acquire()
+        item["slot"] = True
+
+    def release_slot(item: Dict):
+        if item.pop("slot", False):
+            pending_slots.release()
+
+    url_queue = queue.Queue()
+    download_queue = queue.Queue(maxsize=max(1, max_pending_downloads))
+    transcript_queue = queue.Queue(maxsize=max(1, analyze_workers))
+    results_queue = queue.Queue()
+
+    # Les URLs sont distribuées une à une, après réservation d'une place en attente
+    admitted_queue = queue.Queue(maxsize=max(1, download_workers))
+    _start_stage("admission", acquire_slot, url_queue, admitted_queue, 1)
+    _start_stage("téléchargement", download, _fan_out(admitted_queue, download_workers), download_queue,
+                 download_workers)
+    _start_stage("transcription", transcribe, _fan_out(download_queue, transcribe_workers), transcript_queue,
+                 transcribe_workers, after=release_slot)
+    _start_stage("analyse", analyze, _fan_out(transcript_queue, analyze_workers), results_queue, analyze_workers)
+
+    for url in urls:
+        url_queue.put({"url": url, "status": "ok", "error": None, "audio_path": None,
+                       "transcript_path": None, "analysis_path": None, "timings": {}})
+    url_queue.put(_DONE)
+
+    results = {}
+    while True:
+        item = results_queue.get()
+        if item is _DONE:
+            break
+        results[item["url"]] = item
+        logging.info(f"[{len(results)}/{len(urls)}] {item['url']} : {item['status']}")
+
+    return [results[url] for url in urls]
+
+
+def run_pipeline(urls: Iterable[str], analyzer, analyzer_name: str = "basic",
+                 downloads_dir: str = "downloads", transcriptions_dir: str = "transcriptions",
+                 model_name: str = "base", audio_format: str = "pcm16k",
+                 download_workers: int = 4, transcribe_workers: int = 1, analyze_workers: int = 2,
+                 max_pending_downloads: int = 4, stream: bool = False, use_cache: bool = True) -> List[Dict]:
+    """
+    Enchaîne téléchargement, transcription et analyse avec des files bornées entre les étapes.
+
+    Les étapes se recouvrent : l'élément N+1 se télécharge pendant que l'élément N
+    est transcrit et que l'élément N-1 est analysé. Le nombre de fichiers
+    téléchargés (ou en cours de téléchargement) en attente de transcription est
+    limité à `max_pending_downloads`, pour qu'un téléchargement rapide ne remplisse
+    pas le disque devant une transcription lente.
+
+    Le modèle Whisper est partagé : avec plusieurs threads de transcription,
+    ses appels s'exécutent l'un après l'autre, et seuls le décodage de l'audio
+    et le cache des transcriptions se recouvrent.
+
+    Args:
+        urls: URLs des vidéos à traiter
+        analyzer: Analyseur partagé par tous les threads d'analyse
+        analyzer_name: Nom de l'analyseur, utilisé pour nommer les fichiers de sortie
+        downloads_dir: Dossier des fichiers audio
+        transcriptions_dir: Dossier des transcriptions et des analyses
+        model_name: Modèle Whisper à utiliser
+        audio_format: Format des fichiers audio téléchargés, voir AUDIO_FORMATS
+        download_workers: Téléchargements simultanés
+        transcribe_workers: Transcriptions simultanées
+        analyze_workers: Analyses simultanées
+        max_pending_downloads: Fichiers audio en attente de transcription au maximum
+        stream: Si True, transcrit chaque fichier par fenêtres (mémoire bornée)
+        use_cache: Si False, ne réutilise ni les transcriptions en cache ni les
+                   résultats des analyses incrémentales précédentes
+
+    Returns:
+        Résultats par URL, dans l'ordre d'entrée (chemins produits, statut "ok", "skipped"
+        pour une vidéo déjà dans l'archive ou "error", durées par étape)
+    """
+    # Whisper et torch ne sont importés qu'au lancement du pipeline
+    from .transcribe_audio import transcribe_audio, warm_up
+
+    urls = list(urls)
+    archive_file = os.path.join(downloads_dir, "download_archive.txt")
+    generator = DocumentGenerator(analyzer, use_manifest=use_cache)
+    logging.info(f"Pipeline : {len(urls)} URL(s), {download_workers}/{transcribe_workers}/{analyze_workers} "
+                 f"worker(s) (téléchargement/transcription/analyse), {max_pending_downloads} fichier(s) en attente max")
+
+    def download(item: Dict):
+        item["audio_path"] = download_audio(item["url"], downloads_dir, archive_file, audio_format)
+        if item["audio_path"] is None:
+            # Déjà dans l'archive : les étapes suivantes ne traitent pas l'élément
+            item["status"] = "skipped"
+
+    def transcribe(item: Dict):
+        item["transcript_path"] = transcribe_audio(item["audio_path"], transcriptions_dir, model_name,
+                                                   stream=stream, use_cache=use_cache)
+
+    def analyze(item: Dict):
+        output_path = get_output_path(item["transcript_path"], analyzer_name)
+        generator.generate_markdown(item["transcript_path"], output_path)
+        item["analysis_path"] = output_path
+
+    # Charge le modèle Whisper avant l'arrivée du premier fichier
+    warm_up([model_name])
+
+    return run_stages(urls, download, transcribe, analyze, download_workers, transcribe_workers,
+                      analyze_workers, max_pending_downloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Télécharge, transcrit et analyse des vidéos en une seule commande")
+    parser.add_argument("urls", nargs="*", help="URL(s) des vidéos")
+    parser.add_argument("--url-file", help="Fichier contenant une URL par ligne")
+    parser.add_argument("--analyzer", choices=list(ANALYZERS), default="basic",
+                        help="Type d'analyseur à utiliser")
+    parser.add_argument("--openai-key", help="Clé API OpenAI (requise pour l'analyseur OpenAI)")
+    parser.add_argument("--openai-concurrency", type=int, default=1,
+                        help="Requêtes OpenAI simultanées par document (asyncio si > 1)")
+    parser.add_argument("--model", default="base", help="Modèle Whisper à utiliser")
+    parser.add_argument("--format", choices=AUDIO_FORMATS, default="pcm16k", help="Format des fichiers audio")
+    parser.add_argument("--downloads-dir", default="downloads", help="Dossier des fichiers audio")
+    parser.add_argument("--transcriptions-dir", default="transcriptions", help="Dossier des transcriptions")
+    parser.add_argument("--download-workers", type=int, default=4, help="Téléchargements simultanés")
+    parser.add_argument("--transcribe-workers", type=int, default=1, help="Transcriptions simultanées (le modèle Whisper, partagé, "
+                             "traite un fichier à la fois ; les autres décodent leur audio)")
+    parser.add_argument("--analyze-workers", type=int, default=2, help="Analyses simultanées")
+    parser.add_argument("--max-pending", type=int, default=4,
+                        help="Fichiers audio en attente de transcription au maximum")
+    parser.add_argument("--stream", action="store_true", help="Transcrit chaque fichier par fenêtres")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore les caches de transcription et de réponses, et les résultats des analyses précédentes")
+    parser.add_argument("--report", help="Chemin du rapport JSON récapitulatif")
+    parser.add_argument("--debug", action="store_true", help="Active le mode debug avec plus de logs")
+    parser.add_argument("--log-file", help="Fichier de log (optionnel)")
+    args = parser.parse_args()
+
+    setup_logging(args.debug, args.log_file)
+
+    urls = list(args.urls)
+    if args.url_file:
+        urls.extend(read_urls(args.url_file))
+    if not urls:
+        parser.error("au moins une URL ou --url-file est requis")
+
+    analyzer = get_analyzer(args.analyzer, args.openai_key, args.openai_concurrency, not args.no_cache)
+    start = time.perf_counter()
+    results = run_pipeline(urls, analyzer, args.analyzer, args.downloads_dir, args.transcriptions_dir,
+                           args.model, args.format, args.download_workers, args.transcribe_workers,
+                           args.analyze_workers, args.max_pending, args.stream, not args.no_cache)
+    failures = [r for r in results if r["status"] == "error"]
+    logging.info(f"Pipeline terminé : {len(results) - len(failures)} réussi(s), {len(failures)} échec(s) "
+                 f"en {time.perf_counter() - start:.1f}s")
+
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    for result in results:
+        if result["status"] == "ok":
+            print(f"Analyse générée : {result['analysis_path']}")
+        elif result["status"] == "skipped":
+            print(f"Déjà dans l'archive, ignorée : {result['url']}")
+        else:
+            print(f"Erreur pour {result['url']} : {result['error']}")
+    if failures:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
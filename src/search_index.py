@@ -0,0 +1,287 @@
+import os
+import re
+import sqlite3
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from .analyzers.chunking import iter_sentences
+from .utils.config import get_setting
+from .utils.segment_index import SegmentIndex, segment_index_path
+
+# Fichiers indexés, par type
+KINDS = {"transcription": "_transcription.txt", "analysis": "_analysis.md"}
+
+# Taille visée des passages d'un texte sans table des segments (en caractères)
+PASSAGE_CHARS = 500
+
+# Le rowid d'un passage combine l'identifiant de son fichier et son rang dans le
+# fichier : les passages d'un fichier se suppriment par plage de rowid
+_PASSAGE_BITS = 24
+
+_WORD = re.compile(r'\w+')
+
+
+class Passage(NamedTuple):
+    """Portion de fichier indexée."""
+    offset: int                # Position du premier caractère dans le fichier (en caractères)
+    text: str
+    start: Optional[float]     # Horodatages (secondes), pour les transcriptions avec table des segments
+    end: Optional[float]
+
+
+class SearchHit(NamedTuple):
+    """Résultat de recherche."""
+    path: str
+    kind: str
+    offset: int
+    start: Optional[float]
+    end: Optional[float]
+    snippet: str
+    score: float               # Score BM25 : plus il est faible, plus le passage est pertinent
+
+
+def _text_passages(text: str, target_chars: int = PASSAGE_CHARS) -> Iterator[Passage]:
+    """Regroupe les phrases d'un texte en passages d'environ `target_chars` caractères."""
+    start = end = None
+    for sentence_start, sentence_end in iter_sentences(text):
+        if start is None:
+            start = sentence_start
+        elif sentence_end - start > target_chars or "\n\n" in text[end:sentence_start]:
+            yield Passage(start, text[start:end], None, None)
+            start = sentence_start
+        end = sentence_end
+    if start is not None:
+        yield Passage(start, text[start:end], None, None)
+
+
+def _segment_passages(index: SegmentIndex) -> Iterator[Passage]:
+    """Un passage par segment Whisper, avec ses horodatages."""
+    offset = 0
+    for position in range(len(index)):
+        segment = index[position]
+        text = segment.text.strip()
+        if text:
+            yield Passage(offset + len(segment.text) - len(segment.text.lstrip()), text, segment.start, segment.end)
+        offset += len(segment.text)
+
+
+def _file_kind(name: str) -> Optional[str]:
+    for kind, suffix in KINDS.items():
+        if name.endswith(suffix):
+            return kind
+    return None
+
+
+def _signature(path: str, kind: str) -> str:
+    """Taille et date de modification du fichier (et de sa table des segments pour une transcription)."""
+    stat = os.stat(path)
+    signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+    if kind == "transcription":
+        index_path = segment_index_path(path)
+        if os.path.exists(index_path):
+            signature += f":{os.stat(index_path).st_mtime_ns}"
+    return signature
+
+
+def build_query(text: str) -> str:
+    """Transforme une saisie libre en requête FTS5 : tous les mots doivent apparaître."""
+    return " ".join(f'"{word}"' for word in _WORD.findall(text))
+
+
+class SearchIndex:
+    """Index plein texte (SQLite FTS5) des transcriptions et des analyses.
+
+    Chaque fichier est découpé en passages : un par segment Whisper pour les
+    transcriptions qui ont une table des segments (avec ses horodatages), sinon
+    des groupes de phrases. La recherche ignore la casse et les accents, et
+    classe les passages par BM25. La mise à jour ne relit que les fichiers
+    nouveaux ou modifiés (taille ou date de modification), et retire ceux qui
+    ont disparu.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Fichier SQLite de l'index (par défaut search.index_path dans la configuration)
+        """
+        self.path = path or get_setting("search", "index_path", ".cache/search.sqlite")
+        self._lock = threading.Lock()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, kind TEXT NOT NULL, signature TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5("
+            "text, char_offset UNINDEXED, start_time UNINDEXED, end_time UNINDEXED, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        self._db.commit()
+
+    def close(self):
+        """Ferme la base de l'index."""
+        with self._lock:
+            self._db.close()
+
+    def _delete_passages(self, file_id: int):
+        self._db.execute("DELETE FROM passages WHERE rowid BETWEEN ? AND ?",
+                         (file_id << _PASSAGE_BITS, ((file_id + 1) << _PASSAGE_BITS) - 1))
+
+    @staticmethod
+    def _read_passages(path: str, kind: str) -> Iterator[Passage]:
+        if kind == "transcription":
+            index = SegmentIndex.open(path)
+            if index is not None:
+                with index:
+                    yield from _segment_passages(index)
+                return
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from _text_passages(f.read())
+
+    def update(self, directory: str = "transcriptions") -> Dict[str, int]:
+        """
+        Met l'index à jour avec les fichiers d'un dossier (sans ses sous-dossiers).
+
+        Returns:
+            Nombre de fichiers indexés, inchangés et retirés
+
+        Raises:
+            FileNotFoundError: Si le dossier n'existe pas
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Dossier introuvable : {directory}")
+        directory = os.path.abspath(directory)
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        found = {}
+        for name in sorted(os.listdir(directory)):
+            kind = _file_kind(name)
+            if kind:
+                path = os.path.join(directory, name)
+                found[path] = kind
+
+        with self._lock:
+            # Le préfixe couvre aussi les sous-dossiers, indexés séparément : seuls
+            # les fichiers placés directement dans le dossier sont concernés
+            known = {path: (file_id, signature) for file_id, path, signature in self._db.execute(
+                "SELECT id, path, signature FROM files WHERE path LIKE ? ESCAPE '\\'",
+                (re.sub(r'([%_\\])', r'\\\1', os.path.join(directory, "")) + "%",)
+            ) if os.path.dirname(path) == directory}
+            for path, (file_id, _) in known.items():
+                if path not in found:
+                    self._delete_passages(file_id)
+                    self._db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                    counts["removed"] += 1
+
+            for path, kind in found.items():
+                try:
+                    signature = _signature(path, kind)
+                    if path in known and known[path][1] == signature:
+                        counts["unchanged"] += 1
+                        continue
+                    passages = list(self._read_passages(path, kind))
+                except (OSError, UnicodeDecodeError) as e:
+                    logging.warning(f"Fichier non indexé : {path} ({str(e)})")
+                    continue
+                if path in known:
+                    file_id = known[path][0]
+                    self._delete_passages(file_id)
+                    self._db.execute("UPDATE files SET signature = ? WHERE id = ?", (signature, file_id))
+                else:
+                    file_id = self._db.execute("INSERT INTO files (path, kind, signature) VALUES (?, ?, ?)",
+                                               (path, kind, signature)).lastrowid
+                self._db.executemany(
+                    "INSERT INTO passages (rowid, text, char_offset, start_time, end_time) VALUES (?, ?, ?, ?, ?)",
+                    (((file_id << _PASSAGE_BITS) + rank, passage.text, passage.offset, passage.start, passage.end)
+                     for rank, passage in enumerate(passages))
+                )
+                counts["indexed"] += 1
+            self._db.commit()
+        logging.info(f"Index de recherche : {counts['indexed']} fichier(s) indexé(s), "
+                     f"{counts['unchanged']} inchangé(s), {counts['removed']} retiré(s)")
+        return counts
+
+    def search(self, query: str, limit: int = 10, raw: bool = False) -> List[SearchHit]:
+        """
+        Recherche des passages.
+
+        Args:
+            query: Mots recherchés (tous doivent apparaître), ou requête FTS5 si `raw`
+            limit: Nombre maximal de résultats
+            raw: Si True, `query` est passée telle quelle à FTS5 (OR, NEAR, "expression"...)
+
+        Returns:
+            Résultats, du plus pertinent au moins pertinent
+        """
+        match = query if raw else build_query(query)
+        if not match:
+            return []
+        with self._lock:
+            # Le classement et les extraits sont calculés dans FTS5 seul : la
+            # jointure ne porte que sur les meilleurs passages
+            rows = self._db.execute(
+                "SELECT files.path, files.kind, hits.char_offset, hits.start_time, hits.end_time, "
+                "hits.snippet, hits.rank FROM ("
+                "SELECT rowid, char_offset, start_time, end_time, "
+                "snippet(passages, 0, '[', ']', '…', 16) AS snippet, rank "
+                "FROM passages WHERE passages MATCH ? ORDER BY rank LIMIT ?"
+                ") AS hits JOIN files ON files.id = (hits.rowid >> ?) ORDER BY hits.rank",
+                (match, limit, _PASSAGE_BITS)
+            ).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return ""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def main():
+    from .utils.logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Recherche plein texte dans les transcriptions et les analyses")
+    parser.add_argument("query", nargs="?", help="Mots recherchés (sans requête : met seulement l'index à jour)")
+    parser.add_argument("--dir", default="transcriptions", help="Dossier des transcriptions")
+    parser.add_argument("--index", help="Fichier de l'index (par défaut search.index_path)")
+    parser.add_argument("--limit", type=int, default=10, help="Nombre maximal de résultats")
+    parser.add_argument("--raw", action="store_true", help="Passe la requête telle quelle à SQLite FTS5")
+    parser.add_argument("--no-update", action="store_true", help="Interroge l'index sans le mettre à jour")
+    parser.add_argument("--debug", action="store_true", help="Active le mode debug avec plus de logs")
+    args = parser.parse_args()
+
+    setup_logging(args.debug)
+    index = SearchIndex(args.index)
+    try:
+        if not args.no_update:
+            try:
+                index.update(args.dir)
+            except FileNotFoundError as e:
+                print(f"Erreur : {str(e)}")
+                exit(1)
+        if not args.query:
+            return
+        try:
+            hits = index.search(args.query, args.limit, args.raw)
+        except sqlite3.OperationalError as e:
+            print(f"Requête invalide : {str(e)}")
+            exit(1)
+        for hit in hits:
+            location = f"{hit.path}:{hit.offset}"
+            if hit.start is not None:
+                location += f" [{_format_time(hit.start)} - {_format_time(hit.end)}]"
+            print(f"{location}\n    {hit.snippet}")
+        if not hits:
+            print("Aucun résultat")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,250 @@
 import os
+import shutil
+import hashlib
 import logging
+import threading
+import weakref
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 import whisper
 
-def transcribe_audio(audio_path: str, output_dir: str = "transcriptions", model_name: str = "base") -> str:
+from .audio_stream import SAMPLE_RATE, load_audio
+from .utils.config import get_setting
+from .utils.model_registry import ModelRegistry
+from .utils.segment_index import segment_index_path, write_segment_index
+from .utils.transcription_cache import TranscriptionCache
+from .vad import extract_speech
+
+LANGUAGE = "fr"
+
+
+def _resolve_device(device: Optional[str]) -> str:
+    """Choisit le périphérique par défaut, comme le fait whisper.load_model."""
+    if device:
+        return device
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _load_whisper_model(model_name: str, device: str, dtype: str):
+    model = whisper.load_model(model_name, device=device)
+    if dtype == "float16":
+        model = model.half()
+    return model
+
+
+# Cache des modèles Whisper partagé par tout le processus, clé (modèle, périphérique, dtype)
+WHISPER_MODELS = ModelRegistry(
+    _load_whisper_model,
+    max_memory_bytes=get_setting("transcription", "model_cache_max_mb", 0) * 1024 ** 2,
+    name="Whisper"
+)
+
+# Cache disque des transcriptions, adressé par le contenu audio
+TRANSCRIPTION_CACHE = TranscriptionCache()
+
+# Verrou par modèle : model.transcribe installe sur le décodeur, le temps de
+# l'appel, les hooks de son cache de clés et de valeurs ; deux threads ne
+# peuvent donc pas transcrire en même temps avec le même modèle
+_model_locks: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_model_locks_guard = threading.Lock()
+
+
+def _model_lock(model) -> threading.Lock:
+    with _model_locks_guard:
+        lock = _model_locks.get(model)
+        if lock is None:
+            lock = _model_locks[model] = threading.Lock()
+        return lock
+
+
+def get_whisper_model(model_name: str = "base", device: Optional[str] = None, dtype: str = "float32"):
+    """
+    Retourne un modèle Whisper chargé, en le réutilisant s'il est déjà en cache.
+    
+    Args:
+        model_name: Nom du modèle Whisper
+        device: Périphérique ("cpu", "cuda"...), détecté automatiquement si None
+        dtype: Précision des poids ("float32" ou "float16")
+    
+    Returns:
+        Le modèle Whisper
+    """
+    return WHISPER_MODELS.get(model_name, _resolve_device(device), dtype)
+
+
+def warm_up(model_names: Iterable[str] = ("base",), device: Optional[str] = None, dtype: str = "float32"):
+    """Précharge des modèles Whisper avant les premières transcriptions."""
+    resolved_device = _resolve_device(device)
+    WHISPER_MODELS.warm_up((name, resolved_device, dtype) for name in model_names)
+
+
+def _transcribe_samples(model, samples, vad: bool, **options) -> Dict:
+    """
+    Transcrit des échantillons avec Whisper.
+
+    Avec `vad`, seules les régions de parole sont transcrites, mises bout à
+    bout ; les horodatages des segments sont replacés sur la chronologie des
+    échantillons reçus. Les appels concurrents au même modèle sont exécutés
+    l'un après l'autre ; le décodage et la détection de parole, eux, restent
+    parallèles.
+    """
+    if not vad:
+        with _model_lock(model):
+            return model.transcribe(samples, language=LANGUAGE, **options)
+    speech, timeline = extract_speech(samples)
+    logging.info(f"Parole détectée : {timeline.speech_seconds:.0f}s sur {len(samples) / SAMPLE_RATE:.0f}s d'audio")
+    if len(speech) == 0:
+        return {"text": "", "segments": []}
+    with _model_lock(model):
+        result = model.transcribe(speech, language=LANGUAGE, **options)
+    return dict(result, segments=timeline.remap_segments(result["segments"]))
+
+
+def _transcribe_streaming(model, audio_path: str, output_path: str,
+                          window_seconds: float, overlap_seconds: float, vad: bool = False,
+                          digest=None) -> List[Dict]:
+    """
+    Transcrit l'audio fenêtre par fenêtre en ajoutant les segments au fichier de sortie.
+
+    Chaque segment est attribué à la fenêtre qui contient son milieu avant la
+    moitié du chevauchement suivant, ce qui évite les doublons entre fenêtres.
+    Le fichier est vidé sur disque après chaque fenêtre : une sortie partielle
+    reste exploitable si le processus est interrompu.
+
+    Si `digest` (hashlib) est fourni, il reçoit les échantillons décodés une
+    seule fois chacun, sans le chevauchement : l'empreinte du contenu est
+    celle du cache des transcriptions, sans décoder l'audio une seconde fois.
+
+    Returns:
+        Segments retenus, avec des horodatages relatifs au début du fichier
+    """
+    from .audio_stream import iter_windows
+
+    committed = []
+    boundary = 0.0
+    prompt = None
+    hashed = 0  # Échantillons déjà ajoutés à l'empreinte
+    with open(output_path, "w", encoding="utf-8") as f:
+        for offset, samples, is_last in iter_windows(audio_path, window_seconds, overlap_seconds):
+            if digest is not None:
+                digest.update(samples[hashed - round(offset * SAMPLE_RATE):].tobytes())
+                hashed = round(offset * SAMPLE_RATE) + len(samples)
+            logging.info(f"Transcription de la fenêtre à {offset:.0f}s ({len(samples) / SAMPLE_RATE:.0f}s d'audio)")
+            result = _transcribe_samples(model, samples, vad, initial_prompt=prompt)
+            next_boundary = float("inf") if is_last else offset + window_seconds - overlap_seconds / 2
+
+            for segment in result["segments"]:
+                start = offset + segment["start"]
+                end = offset + segment["end"]
+                middle = (start + end) / 2
+                if boundary <= middle < next_boundary:
+                    committed.append(dict(segment, start=start, end=end))
+                    f.write(segment["text"])
+            f.flush()
+
+            boundary = next_boundary
+            # Le texte déjà écrit sert de contexte à la fenêtre suivante
+            prompt = "".join(s["text"] for s in committed[-3:]) or None
+    return committed
+
+
+def _copy_segment_index(source_transcript: str, target_transcript: str):
+    """Copie la table des segments d'une transcription, ou retire celle de la cible si la source n'en a pas."""
+    source = segment_index_path(source_transcript)
+    target = segment_index_path(target_transcript)
+    if os.path.exists(source):
+        shutil.copyfile(source, target)
+    elif os.path.exists(target):
+        os.remove(target)
+
+
+def transcribe_audio(audio_path: str, output_dir: str = "transcriptions", model_name: str = "base",
+                     device: Optional[str] = None, dtype: str = "float32", stream: bool = False,
+                     window_seconds: float = 600.0, overlap_seconds: float = 5.0,
+                     use_cache: bool = True, vad: Optional[bool] = None) -> str:
     """
     Transcrit un fichier audio en texte.
     
+    La table des segments Whisper (horodatages, confiance) est enregistrée à
+    côté de la transcription, voir `SegmentIndex`.
+    
     Args:
         audio_path: Chemin vers le fichier audio
         output_dir: Dossier de sortie pour la transcription
         model_name: Nom du modèle Whisper à utiliser
+        device: Périphérique de calcul (détecté automatiquement si None)
+        dtype: Précision des poids du modèle ("float32" ou "float16")
+        stream: Si True, décode et transcrit l'audio par fenêtres (mémoire bornée)
+        window_seconds: Durée d'une fenêtre en mode streaming
+        overlap_seconds: Chevauchement entre fenêtres en mode streaming
+        use_cache: Si True, réutilise une transcription existante du même contenu audio
+        vad: Si True, ne transcrit que les régions de parole détectées (silences, pauses
+             et blancs écartés) ; par défaut transcription.vad dans la configuration
     
     Returns:
         Chemin vers le fichier de transcription
     """
+    if vad is None:
+        vad = get_setting("transcription", "vad", False)
+    # Une transcription limitée à la parole est mise en cache séparément
+    cache_model = f"{model_name}+vad" if vad else model_name
     try:
         # Crée le dossier de sortie s'il n'existe pas
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
-        # Charge le modèle Whisper
+        # Génère le nom du fichier de sortie
+        base_name = os.path.splitext(os.path.basename(audio_path))[0]
+        output_path = os.path.join(output_dir, f"{base_name}_transcription.txt")
+        
+        # Cherche une transcription existante du même contenu audio
+        samples = None
+        audio_key = None
+        if use_cache:
+            audio_key = TRANSCRIPTION_CACHE.known_audio_key(audio_path)
+            if audio_key is None and not stream:
+                # Décode une seule fois : les échantillons servent aussi à la transcription
+                samples, audio_key = TRANSCRIPTION_CACHE.decode_and_hash(audio_path)
+            # En streaming, l'empreinte d'un fichier inconnu est calculée pendant la
+            # transcription ; seule une copie identique octet pour octet est retrouvée
+            cached_path = audio_key and TRANSCRIPTION_CACHE.get(audio_key, cache_model, LANGUAGE)
+            if cached_path:
+                shutil.copyfile(cached_path, output_path)
+                _copy_segment_index(cached_path, output_path)
+                logging.info(f"Transcription trouvée dans le cache : {output_path}")
+                return output_path
+        
+        # Récupère le modèle Whisper (chargé une seule fois par processus)
         logging.info(f"Chargement du modèle Whisper '{model_name}'")
-        model = whisper.load_model(model_name)
+        model = get_whisper_model(model_name, device, dtype)
         
-        # Transcrit l'audio
         logging.info(f"Transcription de l'audio : {audio_path}")
-        result = model.transcribe(audio_path, language="fr")
+        if stream:
+            # Transcrit par fenêtres, en écrivant au fur et à mesure
+            digest = hashlib.sha256() if use_cache and audio_key is None else None
+            segments = _transcribe_streaming(model, audio_path, output_path, window_seconds, overlap_seconds,
+                                             vad, digest)
+            if digest is not None:
+                audio_key = digest.hexdigest()
+                TRANSCRIPTION_CACHE.remember(audio_path, audio_key)
+        else:
+            # Transcrit l'audio
+            # Décode en mémoire : pas de WAV intermédiaire, ni de ffmpeg pour le PCM 16 kHz
+            if samples is None:
+                samples = load_audio(audio_path)
+            result = _transcribe_samples(model, samples, vad)
+            segments = result["segments"]
+            
+            # Sauvegarde la transcription : la concaténation des segments, pour
+            # que les positions de la table des segments y correspondent
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write("".join(segment["text"] for segment in segments) if segments else result["text"])
         
-        # Génère le nom du fichier de sortie
-        base_name = os.path.splitext(os.path.basename(audio_path))[0]
-        output_path = os.path.join(output_dir, f"{base_name}_transcription.txt")
+        # Table des segments (horodatages et confiance) à côté de la transcription
+        write_segment_index(segment_index_path(output_path), segments)
         
-        # Sauvegarde la transcription
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(result["text"])
+        if audio_key:
+            TRANSCRIPTION_CACHE.put(audio_key, cache_model, LANGUAGE, output_path)
             
         logging.info(f"Transcription sauvegardée : {output_path}")
         return output_path
@@ -48,10 +259,22 @@ if __name__ == "__main__":
     parser.add_argument("audio_path", help="Chemin vers le fichier audio")
     parser.add_argument("--output-dir", default="transcriptions", help="Dossier de sortie pour la transcription")
     parser.add_argument("--model", default="base", help="Modèle Whisper à utiliser")
+    parser.add_argument("--device", help="Périphérique de calcul (cpu, cuda...)")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32",
+                        help="Précision des poids du modèle")
+    parser.add_argument("--stream", action="store_true",
+                        help="Transcrit par fenêtres avec une mémoire bornée (enregistrements longs)")
+    parser.add_argument("--window", type=float, default=600.0, help="Durée d'une fenêtre en secondes (mode streaming)")
+    parser.add_argument("--overlap", type=float, default=5.0, help="Chevauchement entre fenêtres en secondes (mode streaming)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore le cache des transcriptions")
+    parser.add_argument("--vad", action="store_true",
+                        help="Ne transcrit que les régions de parole (silences et pauses écartés)")
     args = parser.parse_args()
     
     try:
-        transcript_path = transcribe_audio(args.audio_path, args.output_dir, args.model)
+        transcript_path = transcribe_audio(args.audio_path, args.output_dir, args.model, args.device, args.dtype,
+                                           args.stream, args.window, args.overlap, not args.no_cache,
+                                           args.vad or None)
         print(f"Transcription générée : {transcript_path}")
     except Exception as e:
         print(f"Erreur : {str(e)}")
@@ -0,0 +1,33 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "default.json"
+
+_config_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """Charge la configuration JSON du projet.
+
+    Args:
+        config_path: Chemin vers un fichier de configuration (par défaut config/default.json)
+
+    Returns:
+        Dictionnaire de configuration (vide si le fichier est introuvable)
+    """
+    path = str(config_path or DEFAULT_CONFIG_PATH)
+    if path not in _config_cache:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                _config_cache[path] = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Configuration illisible ({path}) : {str(e)}")
+            _config_cache[path] = {}
+    return _config_cache[path]
+
+
+def get_setting(section: str, key: str, default: Any = None, config_path: Optional[str] = None) -> Any:
+    """Retourne une valeur de configuration, ou `default` si elle est absente."""
+    return load_config(config_path).get(section, {}).get(key, default)
@@ -0,0 +1,176 @@
+import time
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+def torch_model_size(model: Any) -> int:
+    """Estime la mémoire occupée par un modèle PyTorch (paramètres et buffers), en octets."""
+    size = 0
+    for tensors in (getattr(model, "parameters", None), getattr(model, "buffers", None)):
+        if tensors is None:
+            continue
+        for tensor in tensors():
+            size += tensor.numel() * tensor.element_size()
+    return size
+
+
+def onnx_model_size(model: Any) -> int:
+    """Estime la mémoire occupée par un modèle ONNX Runtime (optimum) d'après ses fichiers ONNX, en octets."""
+    model_dir = getattr(model, "model_save_dir", None)
+    if model_dir is None or not Path(model_dir).is_dir():
+        return 0
+    # Graphes et poids, y compris les données externes des gros modèles
+    return sum(path.stat().st_size for path in Path(model_dir).rglob("*")
+               if path.is_file() and path.name.endswith((".onnx", ".onnx_data", ".onnx.data")))
+
+
+class ModelRegistry:
+    """Cache de modèles partagé par le processus.
+
+    Les modèles sont chargés à la première demande, puis conservés et réutilisés.
+    Lorsque la mémoire estimée dépasse `max_memory_bytes`, les modèles les moins
+    récemment utilisés sont libérés (le modèle demandé n'est jamais évincé).
+    Un chargement qui a échoué n'est pas retenté à chaque demande : l'erreur est
+    renvoyée pendant `retry_after_seconds`, délai doublé à chaque nouvel échec
+    (au plus `max_retry_after_seconds`), ou jusqu'à `evict` ou `clear`.
+    """
+
+    def __init__(self, loader: Callable[..., Any],
+                 size_of: Callable[[Any], int] = torch_model_size,
+                 max_memory_bytes: Optional[int] = None,
+                 name: str = "modèles",
+                 retry_after_seconds: float = 60.0,
+                 max_retry_after_seconds: float = 3600.0):
+        """
+        Args:
+            loader: Fonction appelée avec les éléments de la clé pour charger un modèle
+            size_of: Fonction estimant la taille d'un modèle chargé, en octets
+            max_memory_bytes: Budget mémoire total (None ou 0 : illimité)
+            name: Nom utilisé dans les logs
+            retry_after_seconds: Délai avant de retenter un chargement qui a échoué
+            max_retry_after_seconds: Délai maximal après des échecs successifs
+        """
+        self.loader = loader
+        self.size_of = size_of
+        self.max_memory_bytes = max_memory_bytes
+        self.name = name
+        self.retry_after_seconds = retry_after_seconds
+        self.max_retry_after_seconds = max_retry_after_seconds
+        self._models: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading_locks: Dict[Tuple, threading.Lock] = {}
+        # Échecs de chargement : (erreur, instant du prochain essai, nombre d'échecs successifs)
+        self._failures: Dict[Tuple, Tuple[Exception, float, int]] = {}
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def memory_used(self) -> int:
+        """Mémoire estimée occupée par les modèles chargés, en octets."""
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return tuple(key) in self._models
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def failed(self, *key: Hashable) -> bool:
+        """Indique si le chargement du modèle a échoué et n'est pas encore à retenter."""
+        with self._lock:
+            failure = self._failures.get(key)
+            return failure is not None and time.monotonic() < failure[1]
+
+    def _raise_failure(self, key: Tuple):
+        failure = self._failures.get(key)
+        if failure is None:
+            return
+        error, retry_at, _ = failure
+        remaining = retry_at - time.monotonic()
+        if remaining > 0:
+            raise RuntimeError(f"Chargement impossible ({self.name}) : {key} : {str(error)} "
+                               f"(nouvel essai dans {remaining:.0f} s)") from error
+
+    def get(self, *key: Hashable) -> Any:
+        """Retourne le modèle correspondant à la clé, en le chargeant si nécessaire.
+
+        Raises:
+            Exception: Erreur du chargement, ou RuntimeError si un chargement précédent
+                       a échoué et que le délai avant un nouvel essai n'est pas écoulé
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key][0]
+            self._raise_failure(key)
+            loading_lock = self._loading_locks.setdefault(key, threading.Lock())
+
+        # Un seul chargement par clé, sans bloquer les autres clés
+        with loading_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return self._models[key][0]
+                self._raise_failure(key)
+
+            logging.info(f"Chargement ({self.name}) : {key}")
+            try:
+                model = self.loader(*key)
+            except Exception as e:
+                with self._lock:
+                    failures = self._failures[key][2] + 1 if key in self._failures else 1
+                    delay = min(self.retry_after_seconds * 2 ** (failures - 1), self.max_retry_after_seconds)
+                    self._failures[key] = (e, time.monotonic() + delay, failures)
+                    self._loading_locks.pop(key, None)
+                logging.error(f"Échec du chargement ({self.name}) : {key} : {str(e)} "
+                              f"(nouvel essai dans {delay:.0f} s)")
+                raise
+            size = self.size_of(model)
+
+            with self._lock:
+                self._failures.pop(key, None)
+                self._models[key] = (model, size)
+                self.loads += 1
+                self._loading_locks.pop(key, None)
+                self._evict_locked(keep=key)
+            return model
+
+    def warm_up(self, keys: Iterable[Tuple]) -> None:
+        """Précharge une liste de modèles (par exemple au démarrage d'un worker)."""
+        for key in keys:
+            self.get(*key)
+
+    def evict(self, *key: Hashable) -> bool:
+        """Libère un modèle du cache (ou oublie son échec de chargement). Retourne True s'il était chargé."""
+        with self._lock:
+            self._failures.pop(key, None)
+            return self._models.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Libère tous les modèles du cache et oublie les échecs de chargement."""
+        with self._lock:
+            self._models.clear()
+            self._failures.clear()
+
+    def _evict_locked(self, keep: Tuple) -> None:
+        if not self.max_memory_bytes:
+            return
+        total = sum(size for _, size in self._models.values())
+        for key in list(self._models.keys()):
+            if total <= self.max_memory_bytes:
+                break
+            if key == keep:
+                continue
+            _, size = self._models.pop(key)
+            total -= size
+            self.evictions += 1
+            logging.info(f"Éviction ({self.name}) : {key} ({size / 1024 ** 2:.0f} Mo libérés)")
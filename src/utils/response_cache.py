@@ -0,0 +1,136 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .config import get_setting
+
+
+class ResponseCache:
+    """Cache disque (SQLite) des réponses des modèles d'analyse.
+
+    La clé combine le modèle, le message système, les paramètres de l'appel et
+    l'empreinte du texte d'entrée. Les entrées expirent après `ttl_seconds`, et
+    les moins récemment utilisées sont supprimées au-delà de `max_bytes`.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            path: Fichier SQLite du cache
+            ttl_seconds: Durée de validité d'une entrée (None ou 0 : illimitée)
+            max_bytes: Taille maximale des réponses stockées (None ou 0 : illimitée)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, system: str, params: Dict[str, Any], text: str) -> str:
+        """Calcule la clé d'un appel à partir du modèle, du prompt, des paramètres et du texte."""
+        payload = json.dumps({
+            "model": model,
+            "system": system,
+            "params": params,
+            "text": hashlib.sha256(text.encode("utf-8")).hexdigest()
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne la réponse en cache pour cette clé, ou None (expirée ou absente)."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """Enregistre une réponse puis applique la limite de taille."""
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode("utf-8")), now, now)
+            )
+            if self.max_bytes:
+                self._evict_locked()
+            self._db.commit()
+
+    def get_or_compute(self, model: str, system: str, params: Dict[str, Any], text: str,
+                       compute: Callable[[], Any]) -> Any:
+        """Retourne la réponse en cache, ou l'obtient avec `compute()` et la met en cache."""
+        key = self.make_key(model, system, params, text)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def _evict_locked(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        removed = 0
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+        logging.debug(f"{removed} réponse(s) retirée(s) du cache")
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs de succès et d'échecs du cache pour ce processus."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Retourne le cache de réponses partagé par le processus, configuré par config/default.json."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                get_setting("analysis", "response_cache_path", ".cache/responses.sqlite"),
+                ttl_seconds=get_setting("analysis", "response_cache_ttl_hours", 0) * 3600,
+                max_bytes=get_setting("analysis", "response_cache_max_mb", 0) * 1024 ** 2
+            )
+        return _default_cache
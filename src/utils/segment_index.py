@@ -0,0 +1,222 @@
+import os
+import sys
+import mmap
+import logging
+import array
+import bisect
+import struct
+import hashlib
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# En-tête : signature (avec la version du format), nombre de segments, taille
+# (en octets) et empreinte SHA-256 de la transcription à laquelle renvoient les positions
+MAGIC = b"SEGIDX02"
+_HEADER = struct.Struct("<8sQQ32s")
+
+# Colonnes de la table, dans l'ordre du fichier : 8 octets par valeur, petit-boutiste
+COLUMNS = (
+    ("text_start", "q"),      # Position du texte du segment dans la transcription (octets UTF-8)
+    ("text_end", "q"),
+    ("start", "d"),           # Début et fin du segment (secondes)
+    ("end", "d"),
+    ("avg_logprob", "d"),     # Confiance moyenne des tokens du segment
+    ("no_speech_prob", "d"),  # Probabilité que le segment ne contienne pas de parole
+)
+
+SUFFIX = ".segments"
+
+
+class Segment(NamedTuple):
+    """Segment de transcription Whisper."""
+    start: float
+    end: float
+    avg_logprob: float
+    no_speech_prob: float
+    text: str
+
+
+def segment_index_path(transcript_path: str) -> str:
+    """Chemin de la table des segments d'une transcription (« x_transcription.txt » -> « x_transcription.segments »)."""
+    return os.path.splitext(transcript_path)[0] + SUFFIX
+
+
+def write_segment_index(index_path: str, segments: Iterable[Dict]):
+    """
+    Enregistre la table des segments d'une transcription, colonne par colonne.
+
+    La transcription doit être la concaténation exacte des textes des segments,
+    dans l'ordre : les positions sont calculées à partir de ces textes.
+
+    Args:
+        index_path: Chemin de la table (voir `segment_index_path`)
+        segments: Segments Whisper (clés text, start, end, avg_logprob et no_speech_prob)
+    """
+    columns = {name: array.array(typecode) for name, typecode in COLUMNS}
+    digest = hashlib.sha256()
+    position = 0
+    for segment in segments:
+        encoded = segment["text"].encode("utf-8")
+        digest.update(encoded)
+        size = len(encoded)
+        columns["text_start"].append(position)
+        columns["text_end"].append(position + size)
+        position += size
+        for name in ("start", "end", "avg_logprob", "no_speech_prob"):
+            columns[name].append(float(segment.get(name, 0.0)))
+
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(columns["start"]), position, digest.digest()))
+        for name, _ in COLUMNS:
+            column = columns[name]
+            if sys.byteorder != "little":
+                column.byteswap()
+            column.tofile(f)
+    os.replace(tmp_path, index_path)
+
+
+class SegmentIndex:
+    """Table des segments d'une transcription, lue à la demande.
+
+    La table et la transcription sont projetées en mémoire (mmap) : les
+    colonnes sont lues sans copie, et seul le texte des segments demandés est
+    décodé. Les segments sont triés par horodatage, ce qui permet d'aller
+    directement à une plage de temps.
+
+    Utilisation :
+        with SegmentIndex.open(transcript_path) as index:
+            texte = index.text_between(60.0, 120.0, min_avg_logprob=-1.0)
+    """
+
+    def __init__(self, index_path: str, transcript_path: str):
+        """
+        Args:
+            index_path: Chemin de la table des segments
+            transcript_path: Chemin de la transcription correspondante
+
+        Raises:
+            ValueError: Si le fichier n'est pas une table de segments valide
+        """
+        self._views: List[memoryview] = []
+        self._maps: List[mmap.mmap] = []
+        self._index_map = self._map(index_path)
+        if len(self._index_map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Table des segments tronquée : {index_path}")
+        magic, self.count, self.text_size, self.text_sha256 = _HEADER.unpack_from(self._index_map)
+        if magic != MAGIC or len(self._index_map) < _HEADER.size + 8 * self.count * len(COLUMNS):
+            self.close()
+            raise ValueError(f"Table des segments invalide : {index_path}")
+        self.columns = {}
+        offset = _HEADER.size
+        for name, typecode in COLUMNS:
+            size = 8 * self.count
+            self.columns[name] = self._column(offset, size, typecode)
+            offset += size
+        self._text = self._map(transcript_path)
+
+    @classmethod
+    def open(cls, transcript_path: str) -> Optional["SegmentIndex"]:
+        """
+        Ouvre la table des segments d'une transcription.
+
+        Returns:
+            La table, ou None si elle n'existe pas, est invalide ou ne correspond
+            plus à la transcription (par exemple corrigée à la main : même à
+            longueur égale, l'empreinte de la transcription a changé)
+        """
+        index_path = segment_index_path(transcript_path)
+        if not os.path.exists(index_path):
+            return None
+        try:
+            index = cls(index_path, transcript_path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Table des segments ignorée : {str(e)}")
+            return None
+        if index.text_size != len(index._text) or hashlib.sha256(index._text).digest() != index.text_sha256:
+            logging.info(f"Transcription modifiée depuis sa table des segments, table ignorée : {index_path}")
+            index.close()
+            return None
+        return index
+
+    def _map(self, path: str):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def _column(self, offset: int, size: int, typecode: str):
+        view = memoryview(self._index_map)[offset:offset + size]
+        self._views.append(view)
+        if sys.byteorder == "little":
+            column = view.cast(typecode)
+            self._views.append(column)
+            return column
+        column = array.array(typecode, view.tobytes())
+        column.byteswap()
+        return column
+
+    def __enter__(self) -> "SegmentIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def close(self):
+        """Libère les projections en mémoire."""
+        self.columns = {}
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def text(self, index: int) -> str:
+        """Texte d'un segment, lu dans la transcription."""
+        start, end = self.columns["text_start"][index], self.columns["text_end"][index]
+        return self._text[start:end].decode("utf-8")
+
+    def __getitem__(self, index: int) -> Segment:
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        index %= self.count
+        columns = self.columns
+        return Segment(columns["start"][index], columns["end"][index], columns["avg_logprob"][index],
+                       columns["no_speech_prob"][index], self.text(index))
+
+    def range_between(self, start: float, end: float) -> range:
+        """Indices des segments qui chevauchent la plage [start, end[ (secondes)."""
+        # Les segments se suivent : la recherche dichotomique porte sur leurs fins et leurs débuts
+        first = bisect.bisect_right(self.columns["end"], start)
+        last = bisect.bisect_left(self.columns["start"], end)
+        return range(first, max(first, last))
+
+    def iter_text(self, indices: Optional[Iterable[int]] = None,
+                  min_avg_logprob: Optional[float] = None,
+                  max_no_speech_prob: Optional[float] = None) -> Iterator[str]:
+        """
+        Textes des segments, en écartant ceux dont la confiance est trop faible.
+
+        Args:
+            indices: Segments à lire (tous par défaut)
+            min_avg_logprob: Confiance moyenne minimale (aucun filtre si None)
+            max_no_speech_prob: Probabilité maximale d'absence de parole (aucun filtre si None)
+        """
+        avg_logprob = self.columns["avg_logprob"]
+        no_speech_prob = self.columns["no_speech_prob"]
+        for index in range(self.count) if indices is None else indices:
+            if min_avg_logprob is not None and avg_logprob[index] < min_avg_logprob:
+                continue
+            if max_no_speech_prob is not None and no_speech_prob[index] > max_no_speech_prob:
+                continue
+            yield self.text(index)
+
+    def text_between(self, start: float, end: float, min_avg_logprob: Optional[float] = None) -> str:
+        """Texte prononcé entre deux instants (secondes), sans les segments peu fiables."""
+        return "".join(self.iter_text(self.range_between(start, end), min_avg_logprob))
@@ -0,0 +1,164 @@
+import os
+import shutil
+import sqlite3
+import hashlib
+import logging
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
+from .config import get_setting
+from .segment_index import segment_index_path
+
+_HASH_BLOCK = 1024 * 1024
+
+
+class TranscriptionCache:
+    """Cache disque des transcriptions, adressé par le contenu audio.
+
+    La clé d'une entrée combine l'empreinte de l'audio décodé, le modèle et la
+    langue : un même enregistrement téléchargé sous un autre nom, ou réencodé,
+    réutilise la transcription existante. Pour éviter de décoder l'audio à
+    chaque recherche, l'index mémorise l'empreinte brute de chaque fichier déjà vu.
+
+    L'index est une base SQLite : plusieurs processus (transcription par lots)
+    peuvent l'enrichir en même temps sans perdre d'entrées ; chaque transcription
+    est un fichier distinct, remplacé de façon atomique.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            cache_dir: Dossier du cache (par défaut : configuration, ou .cache/transcriptions)
+            max_bytes: Taille maximale des transcriptions en cache (0 ou None : illimitée)
+        """
+        self.cache_dir = Path(cache_dir or get_setting("transcription", "cache_dir", ".cache/transcriptions"))
+        if max_bytes is None:
+            max_bytes = get_setting("transcription", "cache_max_mb", 0) * 1024 ** 2
+        self.max_bytes = max_bytes
+        self.entries_dir = self.cache_dir / "entries"
+        self.index_path = self.cache_dir / "index.db"
+
+    # --- Empreintes -------------------------------------------------------
+
+    @contextmanager
+    def _index(self) -> Iterator[sqlite3.Connection]:
+        """Ouvre l'index le temps d'une transaction (une connexion par appel, sûre après un fork)."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.index_path, timeout=30)) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS stats (stat_key TEXT PRIMARY KEY, file_sha TEXT NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS files (file_sha TEXT PRIMARY KEY, audio_key TEXT NOT NULL)")
+            with db:
+                yield db
+
+    @staticmethod
+    def _stat_key(audio_path: str) -> str:
+        stat = os.stat(audio_path)
+        return f"{os.path.abspath(audio_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @staticmethod
+    def file_hash(audio_path: str) -> str:
+        """Empreinte SHA-256 des octets bruts du fichier."""
+        digest = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _file_sha(self, db: sqlite3.Connection, audio_path: str) -> str:
+        """Empreinte brute du fichier, calculée une seule fois par taille et date de modification."""
+        stat_key = self._stat_key(audio_path)
+        row = db.execute("SELECT file_sha FROM stats WHERE stat_key = ?", (stat_key,)).fetchone()
+        if row is not None:
+            return row[0]
+        file_sha = self.file_hash(audio_path)
+        db.execute("INSERT OR REPLACE INTO stats (stat_key, file_sha) VALUES (?, ?)", (stat_key, file_sha))
+        return file_sha
+
+    def known_audio_key(self, audio_path: str) -> Optional[str]:
+        """Retourne l'empreinte de contenu d'un fichier déjà vu, sans décoder l'audio."""
+        with self._index() as db:
+            row = db.execute("SELECT audio_key FROM files WHERE file_sha = ?",
+                             (self._file_sha(db, audio_path),)).fetchone()
+            return row[0] if row else None
+
+    def remember(self, audio_path: str, audio_key: str):
+        """Associe un fichier à l'empreinte de son contenu décodé."""
+        with self._index() as db:
+            db.execute("INSERT OR REPLACE INTO files (file_sha, audio_key) VALUES (?, ?)",
+                       (self._file_sha(db, audio_path), audio_key))
+
+    def decode_and_hash(self, audio_path: str) -> Tuple[Any, str]:
+        """Décode l'audio en PCM 16 kHz mono et calcule son empreinte en une seule passe.
+
+        Returns:
+            Tuple (échantillons float32, empreinte du contenu)
+        """
+        import numpy as np
+        from ..audio_stream import iter_pcm
+
+        digest = hashlib.sha256()
+        blocks = []
+        for block in iter_pcm(audio_path):
+            digest.update(block.tobytes())
+            blocks.append(block)
+        samples = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+        audio_key = digest.hexdigest()
+        self.remember(audio_path, audio_key)
+        return samples, audio_key
+
+    # --- Entrées ----------------------------------------------------------
+
+    def _entry_path(self, audio_key: str, model_name: str, language: str) -> Path:
+        entry_key = hashlib.sha256(f"{audio_key}:{model_name}:{language}".encode()).hexdigest()
+        return self.entries_dir / f"{entry_key}.txt"
+
+    def get(self, audio_key: str, model_name: str, language: str) -> Optional[str]:
+        """Retourne le chemin de la transcription en cache, ou None."""
+        entry_path = self._entry_path(audio_key, model_name, language)
+        if not entry_path.exists():
+            return None
+        os.utime(entry_path)  # Marque l'entrée comme récemment utilisée
+        return str(entry_path)
+
+    def put(self, audio_key: str, model_name: str, language: str, transcript_path: str) -> str:
+        """Ajoute une transcription au cache puis applique la limite de taille."""
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(audio_key, model_name, language)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copyfile(transcript_path, tmp_path)
+        os.replace(tmp_path, entry_path)
+        # La table des segments accompagne la transcription
+        index_path, entry_index_path = segment_index_path(transcript_path), segment_index_path(str(entry_path))
+        if os.path.exists(index_path):
+            shutil.copyfile(index_path, tmp_path)
+            os.replace(tmp_path, entry_index_path)
+        elif os.path.exists(entry_index_path):
+            os.remove(entry_index_path)
+        self._evict()
+        return str(entry_path)
+
+    def _evict(self):
+        if not self.max_bytes:
+            return
+        entries = []
+        for entry in self.entries_dir.glob("*.txt"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            index_path = Path(segment_index_path(str(entry)))
+            size = stat.st_size + (index_path.stat().st_size if index_path.exists() else 0)
+            entries.append((stat.st_mtime, size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+                Path(segment_index_path(str(entry))).unlink(missing_ok=True)
+                total -= size
+                logging.debug(f"Transcription retirée du cache : {entry.name}")
+            except OSError:
+                pass
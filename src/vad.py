@@ -0,0 +1,155 @@
+import bisect
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+from .audio_stream import SAMPLE_RATE
+
+# Durée d'une trame d'analyse de l'énergie
+FRAME_SECONDS = 0.03
+
+# Une trame est de la parole si son énergie dépasse le bruit de fond de
+# MARGIN_DB décibels ; le bruit de fond est le 10e centile des trames. Le seuil
+# reste au moins LOUDNESS_RANGE_DB sous le 90e centile (enregistrement presque
+# sans silence) et au-dessus de MIN_THRESHOLD_DB (silence numérique)
+MARGIN_DB = 10.0
+LOUDNESS_RANGE_DB = 20.0
+MIN_THRESHOLD_DB = -55.0
+
+# Silence inséré entre deux régions de parole mises bout à bout, pour que
+# Whisper ne colle pas les mots de part et d'autre d'une coupure
+GAP_SECONDS = 0.3
+
+Region = Tuple[int, int]
+
+
+def frame_energy_db(samples: np.ndarray, frame_length: int) -> np.ndarray:
+    """Énergie moyenne de chaque trame, en décibels (la dernière trame peut être incomplète)."""
+    n_full = len(samples) // frame_length
+    frames = samples[:n_full * frame_length].reshape(n_full, frame_length)
+    energy = np.einsum('ij,ij->i', frames, frames) / frame_length
+    tail = samples[n_full * frame_length:]
+    if len(tail):
+        energy = np.append(energy, np.dot(tail, tail) / len(tail))
+    return 10 * np.log10(energy + 1e-10)
+
+
+def speech_regions(samples: np.ndarray, sample_rate: int = SAMPLE_RATE,
+                   min_speech_seconds: float = 0.25, min_silence_seconds: float = 0.5,
+                   padding_seconds: float = 0.2) -> List[Region]:
+    """
+    Repère les régions de parole d'un enregistrement d'après l'énergie du signal.
+
+    Le seuil s'adapte au niveau de l'enregistrement. Les silences plus courts
+    que `min_silence_seconds` restent dans la région qui les entoure (pauses
+    entre les mots), les régions plus courtes que `min_speech_seconds` sont
+    écartées (clics, bruits) et chaque région est élargie de `padding_seconds`
+    pour ne pas couper le début ou la fin des mots. Un détecteur d'énergie ne
+    distingue pas la musique de la parole : une musique forte est conservée.
+
+    Args:
+        samples: Échantillons PCM mono float32
+        sample_rate: Fréquence d'échantillonnage
+
+    Returns:
+        Régions (premier échantillon, échantillon après le dernier), dans l'ordre
+    """
+    frame_length = max(1, int(FRAME_SECONDS * sample_rate))
+    if len(samples) == 0:
+        return []
+    energy = frame_energy_db(samples, frame_length)
+    noise_floor, loud = np.percentile(energy, [10, 90])
+    threshold = max(min(noise_floor + MARGIN_DB, loud - LOUDNESS_RANGE_DB), MIN_THRESHOLD_DB)
+
+    # Suites de trames au-dessus du seuil : [starts[i], ends[i][
+    voiced = np.concatenate(([0], (energy > threshold).astype(np.int8), [0]))
+    changes = np.flatnonzero(np.diff(voiced))
+    starts, ends = changes[::2], changes[1::2]
+    if len(starts) == 0:
+        return []
+
+    # Réunit les suites séparées par un silence court
+    breaks = np.flatnonzero(starts[1:] - ends[:-1] >= min_silence_seconds / FRAME_SECONDS)
+    starts = starts[np.concatenate(([0], breaks + 1))]
+    ends = ends[np.concatenate((breaks, [len(ends) - 1]))]
+
+    keep = (ends - starts) * FRAME_SECONDS >= min_speech_seconds
+    padding = int(padding_seconds * sample_rate)
+    regions: List[Region] = []
+    for start, end in zip(starts[keep] * frame_length - padding, ends[keep] * frame_length + padding):
+        start, end = max(0, int(start)), min(len(samples), int(end))
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+class SpeechTimeline:
+    """Correspondance entre l'audio réduit à la parole et l'enregistrement d'origine."""
+
+    def __init__(self, regions: Sequence[Region], sample_rate: int = SAMPLE_RATE, gap_seconds: float = GAP_SECONDS):
+        """
+        Args:
+            regions: Régions de parole gardées, en échantillons de l'enregistrement d'origine
+            sample_rate: Fréquence d'échantillonnage
+            gap_seconds: Silence inséré entre deux régions dans l'audio réduit
+        """
+        self.original_starts = [start / sample_rate for start, _ in regions]
+        self.durations = [(end - start) / sample_rate for start, end in regions]
+        self.compact_starts = []
+        position = 0.0
+        for duration in self.durations:
+            self.compact_starts.append(position)
+            position += duration + gap_seconds
+        self.speech_seconds = sum(self.durations)
+
+    def to_original(self, seconds: float, prefer_next: bool = False) -> float:
+        """
+        Convertit un instant de l'audio réduit en instant de l'enregistrement d'origine.
+
+        Args:
+            seconds: Instant dans l'audio réduit
+            prefer_next: Pour un instant situé dans un silence inséré, retourne le
+                         début de la région suivante (début d'un segment) plutôt que
+                         la fin de la précédente (fin d'un segment)
+        """
+        if not self.compact_starts:
+            return seconds
+        index = max(0, bisect.bisect_right(self.compact_starts, seconds) - 1)
+        offset = seconds - self.compact_starts[index]
+        if offset > self.durations[index]:
+            if prefer_next and index + 1 < len(self.compact_starts):
+                return self.original_starts[index + 1]
+            offset = self.durations[index]
+        return self.original_starts[index] + max(0.0, offset)
+
+    def remap_segments(self, segments: List[Dict]) -> List[Dict]:
+        """Replace les horodatages de segments Whisper sur la chronologie d'origine."""
+        return [dict(segment,
+                     start=self.to_original(segment["start"], prefer_next=True),
+                     end=self.to_original(segment["end"]))
+                for segment in segments]
+
+
+def extract_speech(samples: np.ndarray, sample_rate: int = SAMPLE_RATE,
+                   **detector_options) -> Tuple[np.ndarray, SpeechTimeline]:
+    """
+    Réduit un enregistrement à ses régions de parole, séparées par un court silence.
+
+    Args:
+        samples: Échantillons PCM mono float32
+        sample_rate: Fréquence d'échantillonnage
+        detector_options: Options de `speech_regions`
+
+    Returns:
+        Tuple (échantillons de parole, correspondance avec la chronologie d'origine)
+    """
+    regions = speech_regions(samples, sample_rate, **detector_options)
+    gap = np.zeros(int(GAP_SECONDS * sample_rate), dtype=np.float32)
+    pieces = []
+    for start, end in regions:
+        if pieces:
+            pieces.append(gap)
+        pieces.append(samples[start:end])
+    speech = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+    return speech, SpeechTimeline(regions, sample_rate, len(gap) / sample_rate)
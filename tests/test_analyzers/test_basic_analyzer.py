@@ -1 +1,95 @@
- 
\ No newline at end of file
+import time
+import unittest
+from unittest import mock
+from src.analyzers import basic_analyzer
+from src.analyzers.basic_analyzer import BasicAnalyzer
+from src.analyzers.keywords import KeywordMatcher
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_accent_and_case_insensitive(self):
+        """Teste la recherche sans tenir compte des accents ni de la casse."""
+        matcher = KeywordMatcher({"résumé": ["clé", "Essentiel"]})
+        self.assertEqual(matcher.search("Le point CLE du projet"), "résumé")
+        self.assertEqual(matcher.search("Un point essentiel"), "résumé")
+        self.assertIsNone(matcher.search("Rien à signaler"))
+        self.assertIsNone(KeywordMatcher({"résumé": ["clé"]}, accent_insensitive=False).search("cle"))
+
+    def test_group_priority(self):
+        """Teste que le premier groupe présent l'emporte, quelle que soit la position du mot-clé."""
+        matcher = KeywordMatcher({"installation": ["installer"], "utilisation": ["exemple"]})
+        self.assertEqual(matcher.search("Un exemple pour installer le projet"), "installation")
+
+class TestBasicAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = BasicAnalyzer()
+
+    def test_extract_sections(self):
+        """Teste l'attribution des paragraphes aux sections."""
+        text = ("Bonjour à tous.\n\nVoici comment installer le programme.\n\n"
+                "Il permet de transcrire des vidéos.\n\nUn petit détail.\n\nEn bref, c'est fini.")
+        sections = self.analyzer.extract_sections(text)
+        self.assertEqual(sections["Introduction"], "Bonjour à tous.\n\n")
+        self.assertEqual(sections["Installation et Configuration"], "Voici comment installer le programme.\n\n")
+        self.assertEqual(sections["Fonctionnalités"], "Il permet de transcrire des vidéos.\n\nUn petit détail.\n\n")
+        self.assertEqual(sections["Conclusion"], "En bref, c'est fini.\n\n")
+
+    def test_create_summary(self):
+        """Teste la sélection des phrases contenant un mot-clé, accents ignorés."""
+        text = ("Ceci est une phrase sans intérêt particulier. La cle du projet est sa simplicité. "
+                "Court. Cet outil PERMET de gagner du temps au quotidien !")
+        analyzer = BasicAnalyzer(summary_method="keywords")
+        self.assertEqual(analyzer.create_summary(text),
+                         "La cle du projet est sa simplicité. Cet outil PERMET de gagner du temps au quotidien")
+
+    def test_keywords_from_arguments(self):
+        """Teste des mots-clés personnalisés."""
+        analyzer = BasicAnalyzer(summary_keywords=["docker"], section_keywords={"Conclusion": ["merci"]},
+                                 summary_method="keywords")
+        self.assertEqual(analyzer.create_summary("On lance tout avec Docker compose."), "On lance tout avec Docker compose")
+        self.assertEqual(analyzer.extract_sections("Intro.\n\nMerci !")["Conclusion"], "Merci !\n\n")
+
+    def test_stream_matches_whole_text(self):
+        """Teste que l'analyse par morceaux donne le même résultat que l'analyse du texte entier."""
+        text = ("  Bonjour à tous   aujourd'hui Nous allons voir comment installer l'outil.\n\n"
+                "Il est important de bien le configurer !   Cet outil permet de gagner du temps? "
+                "En bref, c'est essentiel.  ")
+        for analyzer in (self.analyzer, BasicAnalyzer(summary_method="keywords")):
+            expected = analyzer.analyze(text)
+            for size in (1, 3, 7, 50):
+                chunks = [text[i:i + size] for i in range(0, len(text), size)]
+                summary, sections = analyzer.analyze_stream(chunks)
+                # Le contenu des sections peut être relu par morceaux
+                self.assertEqual((summary, {title: "".join(content) for title, content in sections.items()}),
+                                 expected)
+                self.assertEqual("".join(analyzer.iter_clean(chunks)), analyzer.clean_text(text))
+
+    def test_large_transcript(self):
+        """Teste que l'analyse d'une transcription de plusieurs mégaoctets reste rapide."""
+        paragraph = "Nous allons voir comment utiliser cet outil dans un cas concret et réaliste. " * 10
+        text = "\n\n".join([paragraph] * 3000)
+        start = time.perf_counter()
+        self.analyzer.extract_sections(text)
+        self.analyzer.create_summary(text)
+        self.analyzer.analyze_stream(text[i:i + 65536] for i in range(0, len(text), 65536))
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+    def test_stream_ranks_a_bounded_sample(self):
+        """Teste que le résumé par flux classe au plus MAX_TEXTRANK_SENTENCES phrases, dans l'ordre du texte."""
+        text = " ".join(f"Phrase numéro {i} du long exposé sur les outils." for i in range(200))
+        ranked = []
+
+        def record(sentences, max_length, method):
+            ranked.append(sentences)
+            return sentences[:1]
+
+        with mock.patch.object(basic_analyzer, "MAX_TEXTRANK_SENTENCES", 20), \
+                mock.patch.object(basic_analyzer, "summarize", side_effect=record):
+            summary, sections = self.analyzer.analyze_stream(text[i:i + 100] for i in range(0, len(text), 100))
+        self.assertEqual(len(ranked[0]), 20)
+        numbers = [int(sentence.split()[2]) for sentence in ranked[0]]
+        self.assertEqual(numbers, sorted(numbers))
+        self.assertGreater(numbers[-1], 20)
+        self.assertEqual("".join(sections["Introduction"]), self.analyzer.clean_text(text) + "\n\n")
+
+if __name__ == '__main__':
+    unittest.main()
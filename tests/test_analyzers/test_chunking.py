@@ -0,0 +1,57 @@
+import unittest
+from src.analyzers.chunking import TokenCounter, chunk_text, iter_sentences
+
+def count_words(text):
+    return len(text.split())
+
+class TestChunking(unittest.TestCase):
+    def test_iter_sentences(self):
+        """Teste le repérage des phrases et des paragraphes."""
+        text = "Bonjour à tous. Voici le plan !\n\nPremière partie"
+        sentences = [text[start:end] for start, end in iter_sentences(text)]
+        self.assertEqual(sentences, ["Bonjour à tous.", "Voici le plan !", "Première partie"])
+
+    def test_chunks_respect_budget_and_sentence_boundaries(self):
+        """Teste que chaque morceau tient dans le budget et finit en fin de phrase."""
+        text = " ".join(f"La phrase {i} parle du projet." for i in range(20))
+        chunks = chunk_text(text, max_tokens=12, count_tokens=count_words)
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(chunk.n_tokens, 12)
+            self.assertTrue(chunk.text.endswith("."))
+            self.assertEqual(text[chunk.start:chunk.end], chunk.text)
+        self.assertEqual(" ".join(chunk.text for chunk in chunks), text)
+
+    def test_overlap_repeats_previous_sentence(self):
+        """Teste le chevauchement entre morceaux consécutifs."""
+        text = "Un deux trois. Quatre cinq six. Sept huit neuf. Dix onze douze."
+        chunks = chunk_text(text, max_tokens=6, count_tokens=count_words, overlap_tokens=3)
+        self.assertEqual(chunks[1].text, "Quatre cinq six. Sept huit neuf.")
+
+    def test_long_sentence_is_split_on_words(self):
+        """Teste qu'une phrase plus longue que le budget est coupée entre deux mots."""
+        text = " ".join(["mot"] * 25) + "."
+        chunks = chunk_text(text, max_tokens=10, count_tokens=count_words)
+        self.assertEqual([chunk.n_tokens for chunk in chunks], [10, 10, 5])
+
+    def test_long_sentence_is_encoded_once(self):
+        """Teste que la découpe d'une longue phrase sans ponctuation n'encode pas des préfixes croissants."""
+        text = " ".join(["mot"] * 5000)
+        encoded = []
+
+        def token_ends(sentence):
+            encoded.append(len(sentence))
+            return list(range(3, len(sentence) + 1, 4))  # Un token par mot "mot"
+
+        def count(piece):
+            encoded.append(len(piece))
+            return count_words(piece)
+
+        chunks = chunk_text(text, max_tokens=100, count_tokens=TokenCounter(count, token_ends))
+        self.assertEqual([chunk.n_tokens for chunk in chunks], [100] * 50)
+        self.assertEqual(" ".join(chunk.text for chunk in chunks), text)
+        # La phrase est comptée puis encodée une fois, et chaque morceau compté une fois
+        self.assertLessEqual(sum(encoded), 3 * len(text))
+
+if __name__ == '__main__':
+    unittest.main()
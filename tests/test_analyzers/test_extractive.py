@@ -0,0 +1,72 @@
+import time
+import unittest
+import tracemalloc
+from unittest import mock
+from src.analyzers import extractive
+from src.analyzers.extractive import NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+    from src.analyzers.extractive import MAX_TEXTRANK_SENTENCES, _similarity, _tfidf, score_sentences, summarize
+
+SENTENCES = [
+    "Le projet transcrit automatiquement les vidéos de conférences",
+    "Les vidéos de conférences sont téléchargées puis transcrites par le projet",
+    "Il faisait beau ce jour-là à Lyon",
+    "La transcription des vidéos alimente ensuite une analyse du projet",
+    "Merci à tous pour votre attention",
+]
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy n'est pas installé")
+class TestExtractiveSummary(unittest.TestCase):
+    def test_central_sentences_rank_first(self):
+        """Teste que les phrases qui partagent le vocabulaire du texte sont les mieux classées."""
+        for method in ("textrank", "tfidf"):
+            scores = score_sentences(SENTENCES, method)
+            best = set(scores.argsort()[-3:])
+            self.assertEqual(best, {0, 1, 3}, method)
+
+    def test_summary_respects_length_and_order(self):
+        """Teste la limite de longueur et l'ordre d'origine des phrases retenues."""
+        summary = summarize(SENTENCES, max_length=130, max_sentences=3)
+        self.assertLessEqual(len(". ".join(summary)), 130)
+        self.assertEqual(summary, sorted(summary, key=SENTENCES.index))
+        self.assertEqual(summarize([], 100), [])
+        self.assertEqual(summarize(["Euh donc voilà"], 100), ["Euh donc voilà"])
+
+    def test_large_input_is_fast(self):
+        """Teste le classement de plusieurs milliers de phrases en un temps court."""
+        sentences = [f"La partie {i} présente le module {i % 37} et son réglage {i % 11}"
+                     for i in range(MAX_TEXTRANK_SENTENCES * 2)]
+        start = time.perf_counter()
+        summarize(sentences[:MAX_TEXTRANK_SENTENCES])
+        summarize(sentences)
+        self.assertLess(time.perf_counter() - start, 3.0)
+
+    def test_sparse_similarity_matches_dense_product(self):
+        """Teste la similarité par index inversé, y compris découpée en petits lots de paires."""
+        sentences = SENTENCES + [f"Le module {i % 3} du projet et ses vidéos {i % 2}" for i in range(20)]
+        rows, cols, weights, n_terms = _tfidf(sentences)
+        matrix = np.zeros((len(sentences), n_terms))
+        matrix[rows, cols] = weights
+        expected = matrix @ matrix.T
+        np.fill_diagonal(expected, 0.0)
+        for batch in (extractive.SIMILARITY_PAIR_BATCH, 7):
+            with mock.patch.object(extractive, "SIMILARITY_PAIR_BATCH", batch):
+                np.testing.assert_allclose(_similarity(rows, cols, weights, len(sentences)), expected)
+
+    def test_large_vocabulary_memory(self):
+        """Teste que la mémoire de TextRank ne dépend pas de la taille du vocabulaire."""
+        # Dix termes propres à chaque phrase : une matrice phrases x termes dense occuperait 180 Mo
+        sentences = [" ".join(f"terme{i}x{j}" for j in range(10)) + " projet" for i in range(MAX_TEXTRANK_SENTENCES)]
+        tracemalloc.start()
+        try:
+            score_sentences(sentences, "textrank")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # Quelques matrices phrases x phrases (18 Mo chacune) au plus
+        self.assertLess(peak, 100 * 2 ** 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from src.analyzers import huggingface_analyzer
+from src.analyzers.huggingface_analyzer import HF_PIPELINES, HuggingFaceAnalyzer
+from src.utils import model_registry
+
+class FakeTokenizer:
+    """Tokenizer factice : un mot par token, 20 tokens au plus dont 2 spéciaux."""
+    model_max_length = 20
+
+    def __call__(self, text, add_special_tokens=True, **kwargs):
+        return {"input_ids": text.split()}
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+class FakePipeline:
+    """Pipeline factice dont le résultat ne dépend que du texte, pour comparer lots et appels unitaires."""
+
+    def __init__(self, task, **kwargs):
+        self.task = task
+        self.calls = []
+        self.tokenizer = FakeTokenizer()
+        self.model = SimpleNamespace(config=SimpleNamespace(max_position_embeddings=512))
+
+    def _result(self, text):
+        if self.task == "summarization":
+            return [{"summary_text": f"résumé({len(text)})"}]
+        return [{"label": "LABEL_0", "score": (len(text) % 10) / 10}]
+
+    def __call__(self, inputs, batch_size=1, **params):
+        if isinstance(inputs, str):
+            self.calls.append([inputs])
+            return self._result(inputs)
+        self.calls.append(list(inputs))
+        if self.task == "summarization":
+            return [self._result(text)[0] for text in inputs]
+        return [self._result(text) for text in inputs]
+
+class TestHuggingFaceAnalyzer(unittest.TestCase):
+    def setUp(self):
+        """Remplace les modèles Hugging Face par des pipelines factices."""
+        patches = [
+            mock.patch.object(huggingface_analyzer, "HUGGING_FACE_AVAILABLE", True),
+            mock.patch.object(huggingface_analyzer, "pipeline", FakePipeline, create=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        HF_PIPELINES.clear()
+        self.addCleanup(HF_PIPELINES.clear)
+        self.analyzer = HuggingFaceAnalyzer(use_cache=False, batch_size=4)
+        self.text = "\n\n".join(f"Paragraphe {i} " + "du projet " * (i * 7 % 13) for i in range(12))
+
+    def test_batched_results_match_single_calls(self):
+        """Teste que le traitement par lots donne les mêmes résultats, dans le même ordre."""
+        paragraphs = self.text.split("\n\n")
+        expected = [FakePipeline("text-classification")(para)[0]["score"] for para in paragraphs]
+        self.assertEqual(self.analyzer._classify(paragraphs), expected)
+
+        summaries = self.analyzer._summarize(paragraphs, max_length=150)
+        self.assertEqual(summaries, [f"résumé({len(para)})" for para in paragraphs])
+
+    def test_single_pipeline_call_sorted_by_length(self):
+        """Teste que les textes sont envoyés en un appel, triés par longueur."""
+        self.analyzer.extract_sections(self.text)
+        classifier_calls = self.analyzer.classifier.calls
+        self.assertEqual(len(classifier_calls), 1)
+        lengths = [len(text) for text in classifier_calls[0]]
+        self.assertEqual(lengths, sorted(lengths))
+        self.assertEqual(len(self.analyzer.summarizer.calls), 1)
+
+    def test_chunks_fill_model_input(self):
+        """Teste le découpage par tokens, aligné sur les phrases, à la longueur d'entrée du modèle."""
+        text = " ".join(f"La partie {i} décrit le projet." for i in range(30))
+        chunks = self.analyzer.chunk(text, overlap_tokens=0)
+        # 18 tokens de texte par morceau, soit trois phrases de 6 mots
+        self.assertEqual(len(chunks), 10)
+        for chunk in chunks:
+            self.assertEqual(chunk.n_tokens, 18)
+            self.assertEqual(text[chunk.start:chunk.end], chunk.text)
+            self.assertTrue(chunk.text.endswith("."))
+
+        self.analyzer.create_summary(text)
+        self.assertCountEqual(self.analyzer.summarizer.calls[-1], [chunk.text for chunk in self.analyzer.chunk(text)])
+
+    def test_models_loaded_lazily_and_shared(self):
+        """Teste que les modèles sont chargés à la première utilisation, une seule fois par processus."""
+        other = HuggingFaceAnalyzer(use_cache=False)
+        self.assertEqual(len(HF_PIPELINES), 0)
+        loads = HF_PIPELINES.loads
+
+        self.analyzer.create_summary("Une phrase. Une autre phrase.")
+        self.assertIs(other.summarizer, self.analyzer.summarizer)
+        self.assertEqual(HF_PIPELINES.loads - loads, 1)
+        self.assertEqual(len(HF_PIPELINES), 1)
+
+    def test_failed_model_load_falls_back_visibly(self):
+        """Teste qu'un modèle impossible à charger n'est pas rechargé à chaque appel et que le repli est signalé."""
+        loads = []
+
+        def failing_pipeline(task, **kwargs):
+            loads.append(task)
+            raise OSError("Modèle introuvable")
+
+        with mock.patch.object(huggingface_analyzer, "pipeline", failing_pipeline):
+            with self.assertLogs(level="ERROR") as logs:
+                first = self.analyzer.create_summary("Une phrase. Une autre phrase.")
+                second = self.analyzer.create_summary("Une phrase. Une autre phrase.")
+        self.assertEqual(first, second)
+        self.assertEqual(loads, ["summarization"])
+        self.assertTrue(any("analyseur basique" in line for line in logs.output))
+        self.assertIn("repli", self.analyzer.display_name)
+
+    def test_failed_model_load_is_retried(self):
+        """Teste que l'analyseur réessaie de charger un modèle une fois le délai écoulé."""
+        failing = [True]
+
+        def flaky_pipeline(task, **kwargs):
+            if failing[0]:
+                raise OSError("Serveur de modèles injoignable")
+            return FakePipeline(task)
+
+        now = [1000.0]
+        with mock.patch.object(huggingface_analyzer, "pipeline", flaky_pipeline), \
+                mock.patch.object(model_registry.time, "monotonic", lambda: now[0]):
+            with self.assertLogs(level="ERROR"):
+                self.analyzer.create_summary("Une phrase. Une autre phrase.")
+            self.assertIn("repli", self.analyzer.display_name)
+            failing[0] = False
+            now[0] += HF_PIPELINES.retry_after_seconds
+            self.assertEqual(self.analyzer.display_name, "Hugging Face")
+            self.assertTrue(self.analyzer.create_summary("Une phrase. Une autre phrase.").startswith("résumé("))
+
+    def test_onnx_pipeline_size(self):
+        """Teste que la taille d'un pipeline ONNX Runtime est estimée d'après ses fichiers."""
+        with mock.patch.object(huggingface_analyzer, "onnx_model_size", return_value=1234):
+            pipe = FakePipeline("summarization")
+            self.assertEqual(huggingface_analyzer._pipeline_size(pipe), 1234)
+
+    def test_unknown_backend(self):
+        """Teste le refus d'une variante de modèle inconnue."""
+        with self.assertRaises(ValueError):
+            HuggingFaceAnalyzer(use_cache=False, backend="gpu")
+
+if __name__ == '__main__':
+    unittest.main()
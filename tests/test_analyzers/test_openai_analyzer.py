@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.utils.response_cache import ResponseCache
+from src.generators.markdown_generator import DocumentGenerator
+from src.analyzers.openai_analyzer import (OPENAI_AVAILABLE, CLEAN_PROMPT, MERGE_SUMMARIES_PROMPT,
+                                           SECTIONS_PROMPT, SUMMARY_PROMPT)
+
+if OPENAI_AVAILABLE:
+    from src.analyzers.openai_analyzer import AsyncOpenAIAnalyzer, OpenAIAnalyzer
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Simule l'API chat.completions avec une latence fixe."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        data = json.dumps({"object": "list", "data": [{"id": "gpt-3.5-turbo", "object": "model",
+                                                       "created": 0, "owned_by": "openai"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        system, user = body["messages"][0]["content"], body["messages"][1]["content"]
+
+        with server.lock:
+            server.requests += 1
+            server.prompts.append(system)
+            if system.startswith("Improve") and server.rate_limited < 1:
+                server.rate_limited += 1
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(json.dumps({"error": {"message": "Rate limit", "type": "rate_limit"}}).encode())
+                return
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+
+        time.sleep(0.2)
+        if system == SECTIONS_PROMPT:
+            content = "Introduction\nContexte\nFeatures\nFonctions\nUsage\nExemples\nConclusion\nFin"
+        elif system == SUMMARY_PROMPT:
+            content = "Résumé"
+        elif system.startswith("Improve"):
+            content = f"**{user}**"
+        else:
+            content = user
+
+        with server.lock:
+            server.in_flight -= 1
+        payload = {
+            "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]
+        }
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+@unittest.skipUnless(OPENAI_AVAILABLE, "le paquet openai n'est pas installé")
+class TestAsyncOpenAIAnalyzer(unittest.TestCase):
+    def setUp(self):
+        """Démarre un faux serveur OpenAI local."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MockOpenAIHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.rate_limited = 0
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.prompts = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        self.base_url = base_url
+        self.analyzer = AsyncOpenAIAnalyzer("sk-test", base_url=base_url, max_concurrency=3, backoff_base=0.01,
+                                            use_cache=False)
+        self.server.prompts = []
+
+    def tearDown(self):
+        """Arrête le serveur."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_analyze_runs_independent_calls_concurrently(self):
+        """Teste que les requêtes indépendantes partent en parallèle, dans la limite fixée."""
+        summary, sections = self.analyzer.analyze("Texte de la conférence")
+        self.assertEqual(summary, "Résumé")
+        self.assertEqual(sections["Features"], "**Fonctions**")
+        self.assertEqual(sections["Conclusion"], "**Fin**")
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 3)
+
+    def test_rate_limited_request_is_retried(self):
+        """Teste qu'une réponse 429 est réessayée au lieu de dégrader la section."""
+        sections = self.analyzer.extract_sections("Texte de la conférence")
+        self.assertEqual(self.server.rate_limited, 1)
+        self.assertTrue(all(content.startswith("**") for content in sections.values() if content))
+
+    def test_long_text_is_chunked_and_reduced(self):
+        """Teste le découpage d'un long texte puis la fusion des résumés partiels."""
+        analyzer = OpenAIAnalyzer("sk-test", base_url=self.base_url, max_chunk_tokens=40, use_cache=False)
+        self.server.prompts = []
+        text = " ".join(f"Phrase numéro {i} de la conférence sur le projet." for i in range(30))
+
+        cleaned = analyzer.clean_text(text)
+        self.assertGreater(self.server.prompts.count(CLEAN_PROMPT), 1)
+        self.assertIn("Phrase numéro 29", cleaned)
+
+        self.server.prompts = []
+        analyzer.create_summary(text)
+        self.assertGreater(self.server.prompts.count(SUMMARY_PROMPT), 1)
+        self.assertIn(MERGE_SUMMARIES_PROMPT, self.server.prompts)
+
+    def test_summary_reduction_stops_without_progress(self):
+        """Teste que la fusion des résumés s'arrête quand un tour ne les réduit pas (budget minuscule)."""
+        text = " ".join(f"Phrase {i}." for i in range(4))
+        for analyzer in (OpenAIAnalyzer("sk-test", base_url=self.base_url, max_chunk_tokens=2, use_cache=False),
+                         AsyncOpenAIAnalyzer("sk-test", base_url=self.base_url, max_chunk_tokens=2,
+                                             use_cache=False)):
+            self.server.prompts = []
+            summary = analyzer.create_summary(text)
+            # Repli sur l'analyseur basique, sans aucune requête de fusion
+            self.assertNotEqual(summary, "Résumé")
+            self.assertGreater(self.server.prompts.count(SUMMARY_PROMPT), 1)
+            self.assertNotIn(MERGE_SUMMARIES_PROMPT, self.server.prompts)
+
+    def test_rerun_uses_response_cache(self):
+        """Teste qu'une nouvelle analyse du même texte ne fait aucun appel à l'API."""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cache = ResponseCache(os.path.join(cache_dir, "responses.sqlite"))
+        analyzer = AsyncOpenAIAnalyzer("sk-test", base_url=self.base_url, backoff_base=0.01, cache=cache)
+
+        first = analyzer.analyze("Texte de la conférence")
+        self.server.requests = 0
+        second = analyzer.analyze("Texte de la conférence")
+        self.assertEqual(first, second)
+        self.assertEqual(self.server.requests, 0)
+        self.assertGreater(cache.stats()["hits"], 0)
+
+    def test_document_generator_uses_async_client(self):
+        """Teste que l'analyse incrémentale passe par le client asynchrone, dans la limite de concurrence."""
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        transcript = os.path.join(test_dir, "talk_transcription.txt")
+        output_path = os.path.join(test_dir, "talk_openai_analysis.md")
+        with open(transcript, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(f"Paragraphe numéro {i} de la conférence." for i in range(8)))
+
+        with mock.patch.object(OpenAIAnalyzer, "_chat", side_effect=AssertionError("client synchrone")), \
+                mock.patch.object(self.analyzer, "_async_client", wraps=self.analyzer._async_client) as factory:
+            DocumentGenerator(self.analyzer).generate_markdown(transcript, output_path)
+
+        # Le manifeste n'est écrit que si l'analyse incrémentale a réussi
+        self.assertTrue(os.path.exists(os.path.join(test_dir, "talk_openai_analysis.manifest.json")))
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual(self.server.rate_limited, 1)
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 3)
+        with open(output_path, encoding="utf-8") as f:
+            self.assertIn("Résumé", f.read())
+
+    def test_construction_makes_no_request(self):
+        """Teste que créer un analyseur n'envoie aucune requête et que la vérification est mise en cache."""
+        OpenAIAnalyzer("sk-test", base_url=self.base_url, use_cache=False)
+        AsyncOpenAIAnalyzer("sk-test", base_url=self.base_url, use_cache=False)
+        self.assertEqual(self.server.requests, 0)
+
+        first = OpenAIAnalyzer("sk-valide", base_url=self.base_url, use_cache=False, validate=True)
+        second = OpenAIAnalyzer("sk-valide", base_url=self.base_url, use_cache=False, validate=True)
+        self.assertEqual(self.server.requests, 1)
+        self.assertIs(first.client, second.client)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import wave
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src import audio_stream
+from src.audio_stream import SAMPLE_RATE, _is_native_pcm, iter_pcm, iter_windows
+
+class TestAudioStream(unittest.TestCase):
+    def setUp(self):
+        """Crée un dossier pour les fichiers WAV de test."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Nettoie l'environnement après les tests."""
+        shutil.rmtree(self.test_dir)
+
+    def write_wav(self, name, seconds, sample_rate=SAMPLE_RATE, channels=1):
+        """Écrit un WAV 16 bits dont chaque échantillon vaut son rang (modulo 30000)."""
+        samples = (np.arange(int(seconds * sample_rate) * channels) % 30000).astype(np.int16)
+        path = os.path.join(self.test_dir, name)
+        with wave.open(path, "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(samples.tobytes())
+        return path, samples.astype(np.float32) / 32768.0
+
+    def test_native_pcm_detection(self):
+        """Teste que seul un WAV 16 bits mono à 16 kHz est lu sans ffmpeg."""
+        self.assertTrue(_is_native_pcm(self.write_wav("natif.wav", 1)[0], SAMPLE_RATE))
+        self.assertFalse(_is_native_pcm(self.write_wav("8khz.wav", 1, sample_rate=8000)[0], SAMPLE_RATE))
+        self.assertFalse(_is_native_pcm(self.write_wav("stereo.wav", 1, channels=2)[0], SAMPLE_RATE))
+
+        renamed = os.path.join(self.test_dir, "natif.mp3")
+        shutil.copyfile(os.path.join(self.test_dir, "natif.wav"), renamed)
+        self.assertFalse(_is_native_pcm(renamed, SAMPLE_RATE))
+
+        corrupted = os.path.join(self.test_dir, "corrompu.wav")
+        with open(corrupted, "wb") as f:
+            f.write(b"pas un fichier WAV")
+        self.assertFalse(_is_native_pcm(corrupted, SAMPLE_RATE))
+
+    def test_native_wav_is_read_without_ffmpeg(self):
+        """Teste la lecture directe par blocs d'un WAV 16 kHz mono, sans lancer ffmpeg."""
+        path, expected = self.write_wav("natif.wav", 2.5)
+        with mock.patch.object(audio_stream.subprocess, "Popen", side_effect=AssertionError("ffmpeg lancé")):
+            blocks = list(iter_pcm(path, block_seconds=1.0))
+        self.assertEqual([len(block) for block in blocks], [SAMPLE_RATE, SAMPLE_RATE, SAMPLE_RATE // 2])
+        self.assertTrue(all(block.dtype == np.float32 for block in blocks))
+        np.testing.assert_array_equal(np.concatenate(blocks), expected)
+
+    def test_windows_overlap_and_last_flag(self):
+        """Teste le découpage en fenêtres qui se chevauchent, leurs positions et la dernière fenêtre."""
+        path, expected = self.write_wav("long.wav", 25)
+        windows = list(iter_windows(path, window_seconds=10.0, overlap_seconds=2.0))
+        # Pas de 8 s : fenêtres à 0, 8 et 16 s, la dernière plus courte
+        self.assertEqual([offset for offset, _, _ in windows], [0.0, 8.0, 16.0])
+        self.assertEqual([len(samples) / SAMPLE_RATE for _, samples, _ in windows], [10.0, 10.0, 9.0])
+        self.assertEqual([is_last for _, _, is_last in windows], [False, False, True])
+        for offset, samples, _ in windows:
+            start = int(offset * SAMPLE_RATE)
+            np.testing.assert_array_equal(samples, expected[start:start + len(samples)])
+
+    def test_single_and_empty_windows(self):
+        """Teste qu'un fichier d'une fenêtre exactement, ou vide, donne une seule fenêtre finale."""
+        path, _ = self.write_wav("exact.wav", 10)
+        windows = list(iter_windows(path, window_seconds=10.0, overlap_seconds=2.0))
+        self.assertEqual([(offset, len(samples), is_last) for offset, samples, is_last in windows],
+                         [(0.0, 10 * SAMPLE_RATE, True)])
+
+        path, _ = self.write_wav("vide.wav", 0)
+        windows = list(iter_windows(path, window_seconds=10.0, overlap_seconds=2.0))
+        self.assertEqual([(offset, len(samples), is_last) for offset, samples, is_last in windows],
+                         [(0.0, 0, True)])
+
+    def test_overlap_must_be_shorter_than_window(self):
+        """Teste le refus d'un chevauchement au moins aussi long que la fenêtre."""
+        path, _ = self.write_wav("natif.wav", 1)
+        with self.assertRaises(ValueError):
+            list(iter_windows(path, window_seconds=5.0, overlap_seconds=5.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src import batch_transcribe
+from src.batch_transcribe import transcribe_batch
+
+class StubTranscriber:
+    """Transcripteur factice, transmis aux workers : écrit le nom du fichier comme transcription."""
+
+    def warm_up(self, model_name, device, dtype, threads):
+        if model_name == "introuvable":
+            raise RuntimeError(f"Modèle inconnu : {model_name}")
+
+    def __call__(self, audio_path, output_dir, model_name, device, dtype, stream, use_cache):
+        name = os.path.splitext(os.path.basename(audio_path))[0]
+        if name == "corrompu":
+            raise ValueError("Audio illisible")
+        os.makedirs(output_dir, exist_ok=True)
+        transcript_path = os.path.join(output_dir, f"{name}_transcription.txt")
+        with open(transcript_path, "w", encoding="utf-8") as f:
+            f.write(name)
+        return transcript_path
+
+class TestBatchTranscribe(unittest.TestCase):
+    def setUp(self):
+        """Crée un dossier de fichiers audio factices."""
+        self.test_dir = tempfile.mkdtemp()
+        self.audio_dir = os.path.join(self.test_dir, "downloads")
+        self.output_dir = os.path.join(self.test_dir, "transcriptions")
+        self.report_path = os.path.join(self.test_dir, "rapport.json")
+        os.makedirs(self.audio_dir)
+        for name in ("atelier", "conference", "corrompu", "meetup"):
+            with open(os.path.join(self.audio_dir, f"{name}.wav"), "wb") as f:
+                f.write(b"RIFF")
+
+    def tearDown(self):
+        """Nettoie l'environnement après les tests."""
+        shutil.rmtree(self.test_dir)
+
+    def test_failures_do_not_stop_the_batch(self):
+        """Teste qu'un fichier en échec est rapporté sans interrompre les autres workers."""
+        report = transcribe_batch(self.audio_dir, self.output_dir, workers=2, report_path=self.report_path,
+                                  transcriber=StubTranscriber())
+        self.assertEqual((report["total"], report["succeeded"], report["failed"]), (4, 3, 1))
+        failed = [r for r in report["results"] if r["status"] == "error"]
+        self.assertEqual(os.path.basename(failed[0]["audio_path"]), "corrompu.wav")
+        self.assertEqual(failed[0]["error"], "Audio illisible")
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "meetup_transcription.txt")))
+
+    def test_worker_initialization_failure_is_reported(self):
+        """Teste qu'un worker qui ne démarre pas produit un rapport où chaque fichier est en échec."""
+        argv = ["transcribe-batch", self.audio_dir, "--output-dir", self.output_dir, "--model", "introuvable",
+                "--workers", "2", "--report", self.report_path]
+        with mock.patch("sys.argv", argv), mock.patch.object(batch_transcribe, "WhisperTranscriber", StubTranscriber):
+            with self.assertRaises(SystemExit) as context:
+                batch_transcribe.main()
+        self.assertEqual(context.exception.code, 1)
+
+        with open(self.report_path, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual((report["total"], report["succeeded"], report["failed"]), (4, 0, 4))
+        self.assertTrue(all(r["error"].startswith("Worker interrompu") for r in report["results"]))
+        self.assertFalse(os.path.exists(self.output_dir))
+
+if __name__ == '__main__':
+    unittest.main()
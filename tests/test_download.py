@@ -1 +1,89 @@
- 
\ No newline at end of file
+import os
+import wave
+import shutil
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from src.download_audio import download_audio_batch, read_urls
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+class TestDownloadAudio(unittest.TestCase):
+    def setUp(self):
+        """Démarre un serveur HTTP local qui sert des fichiers audio de test."""
+        self.test_dir = tempfile.mkdtemp()
+        self.served_dir = os.path.join(self.test_dir, "served")
+        self.output_dir = os.path.join(self.test_dir, "downloads")
+        os.makedirs(self.served_dir)
+        for name in ("talk1", "talk2", "talk3"):
+            with wave.open(os.path.join(self.served_dir, f"{name}.wav"), "wb") as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(16000)
+                f.writeframes(b"\x00\x00" * 1600)
+
+        handler = partial(QuietHandler, directory=self.served_dir)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        """Arrête le serveur et nettoie l'environnement."""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir)
+
+    def test_read_urls(self):
+        """Teste la lecture d'un fichier d'URLs avec commentaires."""
+        url_file = os.path.join(self.test_dir, "urls.txt")
+        with open(url_file, "w", encoding="utf-8") as f:
+            f.write("# Conférences\nhttps://a.example/1\n\nhttps://a.example/2\n")
+        self.assertEqual(read_urls(url_file), ["https://a.example/1", "https://a.example/2"])
+
+    def test_batch_download_and_archive(self):
+        """Teste le téléchargement concurrent puis l'archive des vidéos déjà récupérées."""
+        urls = [f"{self.base_url}/talk{i}.wav" for i in (1, 2, 3)]
+        results = download_audio_batch(urls, self.output_dir, max_workers=3, audio_format="native")
+        self.assertEqual([r["status"] for r in results], ["ok"] * 3)
+        for result in results:
+            self.assertTrue(os.path.exists(result["audio_path"]))
+
+        archive = os.path.join(self.output_dir, "download_archive.txt")
+        with open(archive, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 3)
+
+        # Relancer le lot ne retélécharge rien
+        for result in results:
+            os.remove(result["audio_path"])
+        download_audio_batch(urls, self.output_dir, max_workers=3, audio_format="native")
+        self.assertEqual(len([name for name in os.listdir(self.output_dir) if name.endswith(".wav")]), 0)
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg est requis pour la conversion en WAV")
+    def test_pcm16k_output(self):
+        """Teste la sortie WAV 16 kHz mono directement exploitable par le transcripteur."""
+        results = download_audio_batch([f"{self.base_url}/talk1.wav"], self.output_dir, audio_format="pcm16k")
+        with wave.open(results[0]["audio_path"], "rb") as f:
+            self.assertEqual((f.getnchannels(), f.getframerate()), (1, 16000))
+
+    def test_archived_video_is_skipped(self):
+        """Teste qu'une vidéo YouTube déjà dans l'archive est ignorée (yt-dlp ne retourne alors rien)."""
+        os.makedirs(self.output_dir)
+        with open(os.path.join(self.output_dir, "download_archive.txt"), "w", encoding="utf-8") as f:
+            f.write("youtube dQw4w9WgXcQ\n")
+        results = download_audio_batch(["https://www.youtube.com/watch?v=dQw4w9WgXcQ"], self.output_dir)
+        self.assertEqual(results[0]["status"], "skipped")
+        self.assertIsNone(results[0]["audio_path"])
+        self.assertIsNone(results[0]["error"])
+
+    def test_batch_download_reports_failures(self):
+        """Teste qu'un échec n'interrompt pas le reste du lot."""
+        results = download_audio_batch([f"{self.base_url}/absent.wav"], self.output_dir, max_workers=2)
+        self.assertEqual(results[0]["status"], "error")
+        self.assertIsNotNone(results[0]["error"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from src.analyzers import OPENAI_AVAILABLE
+from src.analyzers.basic_analyzer import BasicAnalyzer
+from src.main import analyze_transcripts, find_transcripts, get_analyzer
+
+class TestBatchAnalysis(unittest.TestCase):
+    def setUp(self):
+        """Crée un dossier de transcriptions de test."""
+        self.test_dir = tempfile.mkdtemp()
+        for name in ("atelier", "conference", "meetup"):
+            with open(os.path.join(self.test_dir, f"{name}_transcription.txt"), "w", encoding="utf-8") as f:
+                f.write("Introduction au projet.\n\nIl est important de savoir comment installer le programme.")
+
+    def tearDown(self):
+        """Nettoie l'environnement après les tests."""
+        shutil.rmtree(self.test_dir)
+
+    def test_find_transcripts_with_pattern(self):
+        """Teste le filtrage des transcriptions par motif glob."""
+        self.assertEqual(len(find_transcripts(self.test_dir)), 3)
+        paths = find_transcripts(self.test_dir, "conf*")
+        self.assertEqual([os.path.basename(p) for p in paths], ["conference_transcription.txt"])
+
+    def test_batch_skips_up_to_date_outputs(self):
+        """Teste que seules les transcriptions modifiées sont réanalysées."""
+        paths = find_transcripts(self.test_dir)
+        results = analyze_transcripts(paths, BasicAnalyzer(), "basic", jobs=2)
+        self.assertEqual([r["status"] for r in results], ["ok"] * 3)
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "atelier_basic_analysis.md")))
+
+        later = time.time() + 10
+        os.utime(paths[1], (later, later))
+        results = analyze_transcripts(paths, BasicAnalyzer(), "basic", jobs=2)
+        self.assertEqual([r["status"] for r in results], ["skipped", "ok", "skipped"])
+
+class TestGetAnalyzer(unittest.TestCase):
+    @unittest.skipUnless(OPENAI_AVAILABLE, "OpenAI n'est pas installé")
+    def test_openai_class_and_options(self):
+        """Teste la résolution de la classe OpenAI selon la concurrence, et le repli sans clé."""
+        analyzer = get_analyzer("openai", "sk-test", openai_concurrency=3, use_cache=False)
+        self.assertEqual(type(analyzer).__name__, "AsyncOpenAIAnalyzer")
+        self.assertEqual((analyzer.max_concurrency, analyzer.cache), (3, None))
+        self.assertEqual(type(get_analyzer("openai", "sk-test")).__name__, "OpenAIAnalyzer")
+        with self.assertLogs(level="ERROR"):
+            self.assertIs(type(get_analyzer("openai")), BasicAnalyzer)
+
+    def test_unknown_analyzer(self):
+        """Teste le refus d'un type d'analyseur inconnu."""
+        with self.assertRaises(ValueError):
+            get_analyzer("inconnu")
+
+if __name__ == '__main__':
+    unittest.main()
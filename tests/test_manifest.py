@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.generators.manifest import AnalysisManifest, fingerprint, run_key, split_paragraphs
+
+class TestSplitParagraphs(unittest.TestCase):
+    def test_blank_lines_are_kept(self):
+        """Teste que les paragraphes du texte sont conservés, séparés par une ligne vide."""
+        paragraphs = split_paragraphs("Un. Deux.\n\n  \n\nTrois.\n")
+        self.assertEqual([p.text for p in paragraphs], ["Un. Deux.", "Trois."])
+        self.assertEqual([p.separator for p in paragraphs], ["\n\n", "\n\n"])
+
+    def test_edit_only_changes_nearby_paragraphs(self):
+        """Teste qu'une correction dans une longue transcription d'un seul tenant ne déplace pas les autres coupures."""
+        sentences = [f"Voici la phrase numéro {i} de cette longue transcription." for i in range(400)]
+        text = " ".join(sentences)
+        paragraphs = split_paragraphs(text, target_chars=500)
+        self.assertGreater(len(paragraphs), 20)
+        self.assertEqual(" ".join(p.text for p in paragraphs), text)
+        self.assertTrue(all(len(p.text) <= 1000 + len(sentences[0]) for p in paragraphs))
+
+        sentences[200] = "Cette phrase a été corrigée à la main, et elle est nettement plus longue qu'avant."
+        edited = split_paragraphs(" ".join(sentences), target_chars=500)
+        before = {fingerprint(p.text) for p in paragraphs}
+        after = {fingerprint(p.text) for p in edited}
+        self.assertLessEqual(len(after - before), 2)
+
+class TestAnalysisManifest(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = AnalysisManifest.path_for(os.path.join(self.test_dir, "talk_openai_analysis.md"))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip(self):
+        """Teste l'enregistrement puis la relecture d'un manifeste, et le rejet d'un autre analyseur."""
+        self.assertTrue(self.path.endswith("talk_openai_analysis.manifest.json"))
+        manifest = AnalysisManifest("analyseur")
+        manifest.runs[run_key(["abc"])] = {"paragraphs": ["abc"], "cleaned": "Texte.",
+                                           "sections": {"Introduction": "Texte."}}
+        manifest.sections["Introduction"] = {"input": "def", "output": "Section"}
+        manifest.summary = {"input": "ghi", "output": "Résumé"}
+        manifest.save(self.path)
+
+        loaded = AnalysisManifest.load(self.path, "analyseur")
+        self.assertEqual(loaded.runs, manifest.runs)
+        self.assertEqual(loaded.section_output("Introduction", "def"), "Section")
+        self.assertIsNone(loaded.section_output("Introduction", "autre"))
+        self.assertEqual(loaded.summary_output("ghi"), "Résumé")
+        self.assertEqual(AnalysisManifest.load(self.path, "autre").runs, {})
+
+    def test_reusable_runs(self):
+        """Teste que seules les suites dont tous les paragraphes sont inchangés et dans l'ordre sont réutilisées."""
+        manifest = AnalysisManifest("analyseur")
+        for paragraphs in (["a", "b"], ["c"], ["d", "e"]):
+            manifest.runs[run_key(paragraphs)] = {"paragraphs": paragraphs, "cleaned": "", "sections": {}}
+        self.assertEqual(manifest.reusable_runs(["a", "b", "x", "c", "d", "f"]),
+                         {0: run_key(["a", "b"]), 3: run_key(["c"])})
+        self.assertEqual(manifest.reusable_runs(["b", "a"]), {})
+
+if __name__ == '__main__':
+    unittest.main()
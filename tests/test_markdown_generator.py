@@ -0,0 +1,222 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from typing import Dict
+from unittest import mock
+from src.analyzers.base import TextAnalyzer
+from src.analyzers.basic_analyzer import BasicAnalyzer
+from src.generators import markdown_generator
+from src.generators.markdown_generator import DocumentGenerator
+from src.generators.markdown_writer import MarkdownWriter
+from src.utils.config import get_setting
+
+class SlowAnalyzer(TextAnalyzer):
+    """Analyseur dont les étapes attendent, comme un appel réseau."""
+    stage_concurrency = "thread"
+    delay = 0.3
+
+    def clean_text(self, text: str) -> str:
+        return text.strip()
+
+    def create_summary(self, text: str, max_length: int = 1500) -> str:
+        time.sleep(self.delay)
+        return f"Résumé de {len(text)} caractères"
+
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        time.sleep(self.delay)
+        return {"Introduction": text}
+
+class SlowSummaryAnalyzer(SlowAnalyzer):
+    """Analyseur dont le résumé se termine bien après les sections."""
+
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        return {"Introduction": text}
+
+class ProcessAnalyzer(SlowAnalyzer):
+    """Analyseur exécuté dans le pool de processus ; ses étapes indiquent le processus utilisé."""
+    stage_concurrency = "process"
+    delay = 0
+
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        return {"Introduction": f"{text} (processus {os.getpid()})"}
+
+class IncrementalAnalyzer(TextAnalyzer):
+    """Analyseur incrémental qui compte les textes qu'il reçoit."""
+    incremental = True
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.model = "modèle-1"
+        self.calls = {"paragraphes": [], "sections": [], "résumé": 0}
+
+    def cache_key(self) -> str:
+        return self.model
+
+    def clean_paragraph(self, text: str) -> str:
+        if self.fail:
+            raise RuntimeError("service indisponible")
+        self.calls["paragraphes"].append(text)
+        return text.upper()
+
+    def split_sections(self, text: str) -> Dict[str, str]:
+        title = "Conclusion" if "BREF" in text else "Introduction"
+        return {"Introduction": "", "Conclusion": "", title: text}
+
+    def refine_section(self, title: str, content: str) -> str:
+        self.calls["sections"].append(title)
+        return f"[{title}] {content}"
+
+    def summarize_text(self, text: str, max_length: int = 1500) -> str:
+        self.calls["résumé"] += 1
+        return f"Résumé de {len(text)} caractères"
+
+    def clean_text(self, text: str) -> str:
+        return text.strip()
+
+    def create_summary(self, text: str, max_length: int = 1500) -> str:
+        return "Résumé de repli"
+
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        return {"Introduction": text}
+
+class TestDocumentGenerator(unittest.TestCase):
+    def setUp(self):
+        """Crée une transcription de test."""
+        self.test_dir = tempfile.mkdtemp()
+        self.transcript = os.path.join(self.test_dir, "talk_transcription.txt")
+        self.output_path = os.path.join(self.test_dir, "talk_analysis.md")
+        with open(self.transcript, "w", encoding="utf-8") as f:
+            f.write("  Voici comment installer le programme. Il est important de bien le configurer.  ")
+
+    def tearDown(self):
+        """Nettoie l'environnement après les tests."""
+        shutil.rmtree(self.test_dir)
+
+    def read_output(self):
+        with open(self.output_path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_basic_analyzer(self):
+        """Teste la génération complète d'un document avec l'analyseur basique."""
+        timings = DocumentGenerator(BasicAnalyzer()).generate_markdown(self.transcript, self.output_path)
+        document = self.read_output()
+        self.assertTrue(document.startswith("# Analyse de la Transcription\n"))
+        self.assertIn("## Installation et Configuration\nVoici comment installer", document)
+        self.assertEqual(set(timings), {"analyse", "écriture"})
+
+    def test_thread_stages_run_concurrently(self):
+        """Teste que les sections et le résumé sont calculés en même temps, avec les durées par étape."""
+        start = time.perf_counter()
+        timings = DocumentGenerator(SlowAnalyzer()).generate_markdown(self.transcript, self.output_path)
+        self.assertLess(time.perf_counter() - start, 2 * SlowAnalyzer.delay)
+        self.assertGreaterEqual(timings["sections"], SlowAnalyzer.delay)
+        self.assertGreaterEqual(timings["résumé"], SlowAnalyzer.delay)
+        self.assertIn("## Résumé\nRésumé de 77 caractères", self.read_output())
+
+    def test_sections_written_before_slow_summary(self):
+        """Teste que les sections sont écrites dès qu'elles sont prêtes, avant un résumé plus lent."""
+        events = []
+        write_section, write_summary = MarkdownWriter.write_section, MarkdownWriter.write_summary
+
+        def record_section(writer, title, content):
+            events.append(title)
+            write_section(writer, title, content)
+
+        def record_summary(writer, summary):
+            events.append("résumé")
+            write_summary(writer, summary)
+
+        with mock.patch.object(MarkdownWriter, "write_section", autospec=True, side_effect=record_section), \
+                mock.patch.object(MarkdownWriter, "write_summary", autospec=True, side_effect=record_summary):
+            DocumentGenerator(SlowSummaryAnalyzer()).generate_markdown(self.transcript, self.output_path)
+        self.assertEqual(events, ["Introduction", "résumé"])
+        # Dans le document, le résumé reste avant les sections
+        document = self.read_output()
+        self.assertLess(document.index("## Résumé\nRésumé de 77 caractères"),
+                        document.index("## Introduction\nVoici comment installer"))
+
+    def test_process_stages(self):
+        """Teste l'exécution des étapes dans d'autres processus."""
+        DocumentGenerator(ProcessAnalyzer()).generate_markdown(self.transcript, self.output_path)
+        document = self.read_output()
+        self.assertIn("## Introduction\nVoici comment installer", document)
+        self.assertNotIn(f"(processus {os.getpid()})", document)
+        # Taille du pool réglée dans la configuration
+        self.assertEqual(markdown_generator._get_process_pool()._max_workers, get_setting("analysis", "stage_processes"))
+
+    def write_transcript(self, paragraphs):
+        with open(self.transcript, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(paragraphs))
+
+    def test_incremental_reanalysis(self):
+        """Teste que seuls les paragraphes modifiés et les sections concernées sont réanalysés."""
+        # Six paragraphes, dont cinq d'environ 5000 caractères sans fin de phrase (donc non coupés) :
+        # regroupés deux par deux en première analyse
+        detail = " détail du sujet" * 300
+        paragraphs = [f"Point {i}{detail}" for i in range(5)] + ["En bref, merci."]
+        self.write_transcript(paragraphs)
+        analyzer = IncrementalAnalyzer()
+        generator = DocumentGenerator(analyzer)
+        generator.generate_markdown(self.transcript, self.output_path)
+        self.assertEqual(sorted(text.split(" détail")[0] for text in analyzer.calls["paragraphes"]),
+                         ["Point 0", "Point 2", "Point 4"])
+        self.assertEqual(sorted(analyzer.calls["sections"]), ["Conclusion", "Introduction"])
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "talk_analysis.manifest.json")))
+
+        # Transcription inchangée : rien ne repasse par l'analyseur
+        analyzer.calls = {"paragraphes": [], "sections": [], "résumé": 0}
+        first = self.read_output()
+        generator.generate_markdown(self.transcript, self.output_path)
+        self.assertEqual(analyzer.calls, {"paragraphes": [], "sections": [], "résumé": 0})
+        self.assertEqual(self.read_output().split("---")[0], first.split("---")[0])
+
+        # Un paragraphe corrigé : les paragraphes de son groupe sont réanalysés un par un
+        paragraphs[1] = f"Point 1 corrigé{detail}"
+        self.write_transcript(paragraphs)
+        generator.generate_markdown(self.transcript, self.output_path)
+        self.assertEqual(sorted(text.split(" détail")[0] for text in analyzer.calls["paragraphes"]),
+                         ["Point 0", "Point 1 corrigé"])
+        self.assertEqual(analyzer.calls["sections"], ["Introduction"])
+        self.assertEqual(analyzer.calls["résumé"], 1)
+        document = self.read_output()
+        self.assertIn("## Introduction\n[Introduction] POINT 0 DÉTAIL", document)
+        self.assertIn("POINT 1 CORRIGÉ DÉTAIL", document)
+        self.assertIn("## Conclusion\n[Conclusion] POINT 4 DÉTAIL", document)
+
+        # Puis une seconde correction dans ce groupe : seul ce paragraphe est réanalysé
+        analyzer.calls = {"paragraphes": [], "sections": [], "résumé": 0}
+        paragraphs[0] = f"Point 0 corrigé{detail}"
+        self.write_transcript(paragraphs)
+        generator.generate_markdown(self.transcript, self.output_path)
+        self.assertEqual([text.split(" détail")[0] for text in analyzer.calls["paragraphes"]], ["Point 0 corrigé"])
+
+        # Sans manifeste, tout est réanalysé, par groupes
+        analyzer.calls = {"paragraphes": [], "sections": [], "résumé": 0}
+        DocumentGenerator(analyzer, use_manifest=False).generate_markdown(self.transcript, self.output_path)
+        self.assertEqual(len(analyzer.calls["paragraphes"]), 3)
+
+    def test_settings_change_invalidates_manifest(self):
+        """Teste qu'un changement des réglages de l'analyseur (cache_key) fait tout réanalyser."""
+        self.write_transcript(["Premier point.", "En bref, merci."])
+        analyzer = IncrementalAnalyzer()
+        generator = DocumentGenerator(analyzer)
+        generator.generate_markdown(self.transcript, self.output_path)
+        analyzer.calls = {"paragraphes": [], "sections": [], "résumé": 0}
+        generator.generate_markdown(self.transcript, self.output_path)
+        self.assertEqual(analyzer.calls["résumé"], 0)
+
+        analyzer.model = "modèle-2"
+        generator.generate_markdown(self.transcript, self.output_path)
+        self.assertEqual(analyzer.calls["résumé"], 1)
+        self.assertEqual(sorted(analyzer.calls["sections"]), ["Conclusion", "Introduction"])
+
+    def test_incremental_failure_falls_back(self):
+        """Teste qu'un échec de l'analyseur donne une analyse complète, sans manifeste."""
+        DocumentGenerator(IncrementalAnalyzer(fail=True)).generate_markdown(self.transcript, self.output_path)
+        self.assertIn("## Résumé\nRésumé de repli", self.read_output())
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "talk_analysis.manifest.json")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.generators.markdown_writer import MarkdownWriter
+
+class TestMarkdownWriter(unittest.TestCase):
+    def setUp(self):
+        """Crée un dossier de sortie de test."""
+        self.test_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.test_dir, "sortie", "talk_basic_analysis.md")
+
+    def tearDown(self):
+        """Nettoie l'environnement après les tests."""
+        shutil.rmtree(self.test_dir)
+
+    def read_output(self):
+        with open(self.output_path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_summary_patched_before_sections(self):
+        """Teste qu'un résumé écrit après les sections apparaît avant elles."""
+        with MarkdownWriter(self.output_path, "basique") as writer:
+            writer.write_section("Introduction", iter(["Bonjour ", "à tous."]))
+            writer.write_section("Utilisation", "   ")
+            writer.write_summary("Le résumé.")
+            writer.write_section("Conclusion", "Merci.")
+        document = self.read_output()
+        self.assertLess(document.index("## Résumé\nLe résumé."), document.index("## Introduction\nBonjour à tous.\n\n"))
+        self.assertLess(document.index("## Introduction"), document.index("## Conclusion\nMerci.\n\n"))
+        self.assertNotIn("## Utilisation", document)
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), ["talk_basic_analysis.md"])
+
+    def test_error_keeps_previous_document(self):
+        """Teste qu'une erreur pendant l'écriture laisse le document précédent intact."""
+        os.makedirs(os.path.dirname(self.output_path))
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            f.write("ancienne analyse")
+
+        def failing_content():
+            yield "début de section"
+            raise RuntimeError("analyse interrompue")
+
+        with self.assertRaises(RuntimeError):
+            with MarkdownWriter(self.output_path, "basique") as writer:
+                writer.write_summary("Résumé")
+                writer.write_section("Introduction", failing_content())
+        self.assertEqual(self.read_output(), "ancienne analyse")
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), ["talk_basic_analysis.md"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from src.utils import model_registry
+from src.utils.model_registry import ModelRegistry, onnx_model_size
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        """Initialise un registre avec un chargeur factice."""
+        self.loaded = []
+
+        def loader(name, device, dtype):
+            self.loaded.append((name, device, dtype))
+            return {"name": name}
+
+        sizes = {"tiny": 1, "base": 2, "medium": 5}
+        self.registry = ModelRegistry(loader, size_of=lambda model: sizes[model["name"]], max_memory_bytes=6)
+
+    def test_model_loaded_once(self):
+        """Teste qu'un modèle déjà chargé est réutilisé."""
+        first = self.registry.get("base", "cpu", "float32")
+        second = self.registry.get("base", "cpu", "float32")
+        self.assertIs(first, second)
+        self.assertEqual(len(self.loaded), 1)
+        self.assertEqual(self.registry.hits, 1)
+
+    def test_lru_eviction_under_budget(self):
+        """Teste l'éviction du modèle le moins récemment utilisé."""
+        self.registry.get("tiny", "cpu", "float32")
+        self.registry.get("base", "cpu", "float32")
+        self.registry.get("tiny", "cpu", "float32")
+        self.registry.get("medium", "cpu", "float32")
+        self.assertNotIn(("base", "cpu", "float32"), self.registry)
+        self.assertIn(("tiny", "cpu", "float32"), self.registry)
+        self.assertLessEqual(self.registry.memory_used, 6)
+
+    def test_warm_up(self):
+        """Teste le préchargement explicite."""
+        self.registry.warm_up([("tiny", "cpu", "float32"), ("base", "cpu", "float32")])
+        self.assertEqual(len(self.registry), 2)
+
+    def test_failed_load_is_not_retried(self):
+        """Teste qu'un chargement en échec n'est pas retenté pendant le délai, sauf s'il est oublié."""
+        calls = []
+
+        def loader(name):
+            calls.append(name)
+            raise OSError("Modèle introuvable")
+
+        registry = ModelRegistry(loader, size_of=lambda model: 0)
+        with self.assertLogs(level="ERROR"), self.assertRaises(OSError):
+            registry.get("absent")
+        with self.assertRaises(RuntimeError):
+            registry.get("absent")
+        self.assertEqual(len(calls), 1)
+
+        registry.clear()
+        with self.assertLogs(level="ERROR"), self.assertRaises(OSError):
+            registry.get("absent")
+        self.assertEqual(len(calls), 2)
+
+    def test_failed_load_is_retried_after_delay(self):
+        """Teste qu'un chargement en échec est retenté après un délai qui double à chaque échec."""
+        calls = []
+        now = [1000.0]
+
+        def loader(name):
+            calls.append(name)
+            if len(calls) < 3:
+                raise OSError("Serveur de modèles injoignable")
+            return {"name": name}
+
+        registry = ModelRegistry(loader, size_of=lambda model: 0, retry_after_seconds=10)
+        with mock.patch.object(model_registry.time, "monotonic", lambda: now[0]):
+            with self.assertLogs(level="ERROR"), self.assertRaises(OSError):
+                registry.get("distant")
+            self.assertTrue(registry.failed("distant"))
+            now[0] += 10
+            self.assertFalse(registry.failed("distant"))
+            with self.assertLogs(level="ERROR"), self.assertRaises(OSError):
+                registry.get("distant")
+            # Deuxième échec : 20 s d'attente
+            now[0] += 15
+            with self.assertRaises(RuntimeError):
+                registry.get("distant")
+            now[0] += 5
+            self.assertEqual(registry.get("distant"), {"name": "distant"})
+            self.assertFalse(registry.failed("distant"))
+        self.assertEqual(len(calls), 3)
+
+    def test_onnx_model_size_from_files(self):
+        """Teste l'estimation de la taille d'un modèle ONNX Runtime d'après ses fichiers."""
+        model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, model_dir)
+        for name, size in (("encoder_model.onnx", 300), ("decoder_model.onnx", 200),
+                           ("decoder_model.onnx_data", 1000), ("config.json", 50)):
+            with open(os.path.join(model_dir, name), "wb") as f:
+                f.write(b"\x00" * size)
+        self.assertEqual(onnx_model_size(SimpleNamespace(model_save_dir=model_dir)), 1500)
+        self.assertEqual(onnx_model_size(SimpleNamespace()), 0)
+
+if __name__ == '__main__':
+    unittest.main()
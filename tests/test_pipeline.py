@@ -0,0 +1,87 @@
+import time
+import random
+import threading
+import unittest
+from typing import Dict
+from src.pipeline import run_stages
+
+class FakeStages:
+    """Étapes factices qui enregistrent leur concurrence."""
+
+    def __init__(self, download_delay: float = 0.0, transcribe_delay: float = 0.0):
+        self.download_delay = download_delay
+        self.transcribe_delay = transcribe_delay
+        self.lock = threading.Lock()
+        self.pending = 0              # Téléchargés (ou en cours) et pas encore transcrits
+        self.max_pending = 0
+        self.transcribing = 0
+        self.max_transcribing = 0
+        self.transcribed = []
+        self.analyzed = []
+
+    def download(self, item: Dict):
+        with self.lock:
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+        time.sleep(self.download_delay * random.random())
+        if "absent" in item["url"]:
+            raise RuntimeError("vidéo introuvable")
+        item["audio_path"] = f"{item['url']}.wav"
+
+    def transcribe(self, item: Dict):
+        with self.lock:
+            self.transcribing += 1
+            self.max_transcribing = max(self.max_transcribing, self.transcribing)
+        time.sleep(self.transcribe_delay)
+        with self.lock:
+            self.transcribing -= 1
+            self.pending -= 1
+            self.transcribed.append(item["url"])
+        item["transcript_path"] = f"{item['audio_path']}.txt"
+
+    def analyze(self, item: Dict):
+        with self.lock:
+            self.analyzed.append(item["url"])
+        item["analysis_path"] = f"{item['transcript_path']}.md"
+
+    def run(self, urls, **options):
+        return run_stages(urls, self.download, self.transcribe, self.analyze, **options)
+
+class TestRunStages(unittest.TestCase):
+    def test_results_follow_input_order(self):
+        """Teste que les résultats suivent l'ordre des URLs malgré des durées de téléchargement variables."""
+        urls = [f"video{i}" for i in range(12)] + ["video0"]
+        stages = FakeStages(download_delay=0.02)
+        results = stages.run(urls, download_workers=4, transcribe_workers=2, analyze_workers=2)
+        self.assertEqual([r["url"] for r in results], [f"video{i}" for i in range(12)])
+        self.assertEqual([r["status"] for r in results], ["ok"] * 12)
+        self.assertEqual(results[3]["analysis_path"], "video3.wav.txt.md")
+        self.assertEqual(set(results[3]["timings"]), {"admission", "téléchargement", "transcription", "analyse"})
+
+    def test_transcription_fans_out(self):
+        """Teste que plusieurs threads de transcription traitent des éléments en même temps."""
+        stages = FakeStages(transcribe_delay=0.05)
+        stages.run([f"video{i}" for i in range(6)], transcribe_workers=3, max_pending_downloads=6)
+        self.assertEqual(stages.max_transcribing, 3)
+        self.assertEqual(sorted(stages.transcribed), sorted(f"video{i}" for i in range(6)))
+
+    def test_failure_skips_later_stages(self):
+        """Teste qu'un échec est rapporté avec son étape et que l'élément n'est ni transcrit ni analysé."""
+        stages = FakeStages()
+        results = stages.run(["video1", "absent", "video2"])
+        self.assertEqual([r["status"] for r in results], ["ok", "error", "ok"])
+        self.assertEqual(results[1]["error"], "téléchargement : vidéo introuvable")
+        self.assertNotIn("absent", stages.transcribed)
+        self.assertNotIn("absent", stages.analyzed)
+        self.assertNotIn("transcription", results[1]["timings"])
+
+    def test_pending_downloads_are_bounded(self):
+        """Teste que les téléchargements n'avancent pas de plus de max_pending_downloads sur la transcription."""
+        stages = FakeStages(transcribe_delay=0.02)
+        results = stages.run([f"video{i}" for i in range(10)], download_workers=4, max_pending_downloads=2)
+        self.assertEqual([r["status"] for r in results], ["ok"] * 10)
+        self.assertLessEqual(stages.max_pending, 2)
+        self.assertEqual(stages.max_transcribing, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from src.utils.response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        """Initialise un cache dans un dossier temporaire."""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = ResponseCache(os.path.join(self.test_dir, "responses.sqlite"))
+        self.calls = 0
+
+    def tearDown(self):
+        """Nettoie l'environnement après les tests."""
+        shutil.rmtree(self.test_dir)
+
+    def compute(self):
+        self.calls += 1
+        return f"réponse {self.calls}"
+
+    def test_hit_and_miss_counters(self):
+        """Teste qu'un appel identique réutilise la réponse en cache."""
+        first = self.cache.get_or_compute("gpt", "Résume", {"max_tokens": 500}, "texte", self.compute)
+        second = self.cache.get_or_compute("gpt", "Résume", {"max_tokens": 500}, "texte", self.compute)
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_every_input(self):
+        """Teste que le modèle, le prompt, les paramètres et le texte changent la clé."""
+        key = ResponseCache.make_key("gpt", "Résume", {"max_tokens": 500}, "texte")
+        self.assertNotEqual(key, ResponseCache.make_key("autre", "Résume", {"max_tokens": 500}, "texte"))
+        self.assertNotEqual(key, ResponseCache.make_key("gpt", "Nettoie", {"max_tokens": 500}, "texte"))
+        self.assertNotEqual(key, ResponseCache.make_key("gpt", "Résume", {"max_tokens": 100}, "texte"))
+        self.assertNotEqual(key, ResponseCache.make_key("gpt", "Résume", {"max_tokens": 500}, "texte 2"))
+
+    def test_expired_entries_are_recomputed(self):
+        """Teste l'expiration des entrées après leur durée de validité."""
+        self.cache.ttl_seconds = 0.05
+        self.cache.get_or_compute("gpt", "Résume", {}, "texte", self.compute)
+        time.sleep(0.1)
+        self.cache.get_or_compute("gpt", "Résume", {}, "texte", self.compute)
+        self.assertEqual(self.calls, 2)
+
+    def test_size_bounded_eviction(self):
+        """Teste la suppression des entrées les moins récemment utilisées."""
+        self.cache.max_bytes = 40
+        for i in range(5):
+            self.cache.set(f"cle-{i}", "x" * 10)
+        self.assertIsNone(self.cache.get("cle-0"))
+        self.assertEqual(self.cache.get("cle-4"), "x" * 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.search_index import SearchIndex
+from src.utils.segment_index import segment_index_path, write_segment_index
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        """Crée un dossier de transcriptions et un index vide."""
+        self.test_dir = tempfile.mkdtemp()
+        self.transcriptions = os.path.join(self.test_dir, "transcriptions")
+        os.mkdir(self.transcriptions)
+        self.write("docker_transcription.txt", "Bonjour à tous. Aujourd'hui on déploie avec Docker compose.\n\n"
+                                               "Ensuite on configure le serveur.")
+        self.write("python_basic_analysis.md", "## Résumé\nUn atelier sur Python et les données.")
+        self.write("notes.txt", "Docker, mais ce fichier n'est pas une transcription.")
+        self.index = SearchIndex(os.path.join(self.test_dir, "search.sqlite"))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.test_dir)
+
+    def write(self, name: str, text: str):
+        with open(os.path.join(self.transcriptions, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_search_with_offsets(self):
+        """Teste la recherche, insensible à la casse et aux accents, avec la position du passage."""
+        self.assertEqual(self.index.update(self.transcriptions), {"indexed": 2, "unchanged": 0, "removed": 0})
+        hits = self.index.search("DOCKER")
+        self.assertEqual(len(hits), 1)
+        self.assertTrue(hits[0].path.endswith("docker_transcription.txt"))
+        self.assertIn("[Docker]", hits[0].snippet)
+        with open(hits[0].path, encoding="utf-8") as f:
+            self.assertTrue(f.read()[hits[0].offset:].startswith("Bonjour à tous."))
+        self.assertEqual(self.index.search("serveur configuré")[0].offset, 61)
+        self.assertEqual(self.index.search("donnees")[0].kind, "analysis")
+        self.assertEqual(self.index.search("docker python"), [])
+        self.assertEqual(len(self.index.search("docker OR python", raw=True)), 2)
+
+    def test_incremental_update(self):
+        """Teste que seuls les fichiers nouveaux ou modifiés sont relus, et que les fichiers supprimés sont retirés."""
+        self.index.update(self.transcriptions)
+        self.assertEqual(self.index.update(self.transcriptions), {"indexed": 0, "unchanged": 2, "removed": 0})
+
+        self.write("docker_transcription.txt", "Cette fois on parle de Kubernetes.")
+        os.remove(os.path.join(self.transcriptions, "python_basic_analysis.md"))
+        self.assertEqual(self.index.update(self.transcriptions), {"indexed": 1, "unchanged": 0, "removed": 1})
+        self.assertEqual(self.index.search("docker"), [])
+        self.assertEqual(len(self.index.search("kubernetes")), 1)
+        self.assertEqual(self.index.search("python"), [])
+
+    def test_update_keeps_subdirectory_files(self):
+        """Teste que la mise à jour d'un dossier ne retire pas les fichiers indexés de ses sous-dossiers."""
+        archive = os.path.join(self.transcriptions, "archive")
+        os.mkdir(archive)
+        with open(os.path.join(archive, "ancien_transcription.txt"), "w", encoding="utf-8") as f:
+            f.write("Une ancienne conférence sur Kubernetes.")
+        self.assertEqual(self.index.update(archive)["indexed"], 1)
+        self.assertEqual(self.index.update(self.transcriptions), {"indexed": 2, "unchanged": 0, "removed": 0})
+        self.assertEqual(len(self.index.search("kubernetes")), 1)
+
+    def test_missing_directory(self):
+        """Teste qu'un dossier absent est signalé clairement."""
+        with self.assertRaisesRegex(FileNotFoundError, "Dossier introuvable"):
+            self.index.update(os.path.join(self.test_dir, "absent"))
+
+    def test_segment_timestamps(self):
+        """Teste que les passages d'une transcription avec table des segments portent leurs horodatages."""
+        segments = [{"text": " Introduction rapide.", "start": 0.0, "end": 3.0},
+                    {"text": " Maintenant, le déploiement avec Ansible.", "start": 3.0, "end": 9.5}]
+        transcript = os.path.join(self.transcriptions, "ansible_transcription.txt")
+        self.write("ansible_transcription.txt", "".join(segment["text"] for segment in segments))
+        write_segment_index(segment_index_path(transcript), segments)
+        self.index.update(self.transcriptions)
+        hit = self.index.search("ansible")[0]
+        self.assertEqual((hit.start, hit.end, hit.offset), (3.0, 9.5, 22))
+
+if __name__ == '__main__':
+    unittest.main()
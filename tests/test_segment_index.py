@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.utils.segment_index import SegmentIndex, segment_index_path, write_segment_index
+
+SEGMENTS = [
+    {"text": " Bonjour à tous.", "start": 0.0, "end": 2.5, "avg_logprob": -0.2, "no_speech_prob": 0.01},
+    {"text": " Euh, hum.", "start": 2.5, "end": 4.0, "avg_logprob": -1.8, "no_speech_prob": 0.6},
+    {"text": " Voici comment installer l'outil.", "start": 4.0, "end": 7.0, "avg_logprob": -0.3,
+     "no_speech_prob": 0.02},
+]
+
+class TestSegmentIndex(unittest.TestCase):
+    def setUp(self):
+        """Écrit une transcription et sa table des segments."""
+        self.test_dir = tempfile.mkdtemp()
+        self.transcript = os.path.join(self.test_dir, "talk_transcription.txt")
+        with open(self.transcript, "w", encoding="utf-8") as f:
+            f.write("".join(segment["text"] for segment in SEGMENTS))
+        write_segment_index(segment_index_path(self.transcript), SEGMENTS)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_read_segments(self):
+        """Teste la relecture des segments, avec des textes non ASCII."""
+        self.assertTrue(segment_index_path(self.transcript).endswith("talk_transcription.segments"))
+        with SegmentIndex.open(self.transcript) as index:
+            self.assertEqual(len(index), 3)
+            self.assertEqual(index[0].text, " Bonjour à tous.")
+            self.assertEqual(index[-1].start, 4.0)
+            self.assertEqual(index[1].avg_logprob, -1.8)
+
+    def test_time_range_and_confidence(self):
+        """Teste l'accès à une plage de temps et l'écart des segments peu fiables."""
+        with SegmentIndex.open(self.transcript) as index:
+            self.assertEqual(list(index.range_between(3.0, 5.0)), [1, 2])
+            self.assertEqual(list(index.range_between(10.0, 20.0)), [])
+            self.assertEqual(index.text_between(0.0, 10.0, min_avg_logprob=-1.0),
+                             " Bonjour à tous. Voici comment installer l'outil.")
+            self.assertEqual(list(index.iter_text(max_no_speech_prob=0.5)),
+                             [" Bonjour à tous.", " Voici comment installer l'outil."])
+
+    def test_stale_or_missing_index(self):
+        """Teste qu'une transcription corrigée à la main ou sans table n'a pas de table utilisable."""
+        with open(self.transcript, "a", encoding="utf-8") as f:
+            f.write(" Correction.")
+        self.assertIsNone(SegmentIndex.open(self.transcript))
+        os.remove(segment_index_path(self.transcript))
+        self.assertIsNone(SegmentIndex.open(self.transcript))
+
+    def test_same_length_edit_invalidates_index(self):
+        """Teste qu'une correction de même taille, qui déplace une frontière de caractère, invalide la table."""
+        with open(self.transcript, encoding="utf-8") as f:
+            text = f.read()
+        # « à » (2 octets) remplacé par « a » et une espace : taille identique, frontières décalées
+        edited = text.replace("à", "a ", 1)
+        self.assertEqual(len(edited.encode("utf-8")), len(text.encode("utf-8")))
+        with open(self.transcript, "w", encoding="utf-8") as f:
+            f.write(edited)
+        self.assertIsNone(SegmentIndex.open(self.transcript))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import de l'interface en ligne de commande puis analyse basique d'un document,
+# mesurés dans un processus neuf
+STARTUP_SCRIPT = """
+import sys, json, time, tempfile, os
+start = time.perf_counter()
+from src.main import get_analyzer
+from src.generators.markdown_generator import DocumentGenerator
+analyzer = get_analyzer("basic")
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "essai_transcription.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Introduction au projet. Il est important de savoir comment installer le programme.")
+    DocumentGenerator(analyzer).generate_markdown(path, os.path.join(tmp, "essai_basic_analysis.md"))
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in ("torch", "transformers", "openai", "whisper", "tiktoken") if m in sys.modules)
+print(json.dumps({"seconds": elapsed, "heavy_modules": heavy}))
+"""
+
+# Durée maximale tolérée, très au-dessus de la valeur habituelle (quelques dixièmes de seconde)
+MAX_STARTUP_SECONDS = 3.0
+
+class TestStartup(unittest.TestCase):
+    def test_basic_analyzer_starts_without_heavy_imports(self):
+        """Teste que l'analyseur basique démarre vite, sans importer torch, transformers ni openai."""
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        self.assertEqual(result["heavy_modules"], [])
+        self.assertLess(result["seconds"], MAX_STARTUP_SECONDS)
+
+if __name__ == '__main__':
+    unittest.main()
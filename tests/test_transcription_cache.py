@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from src.utils.segment_index import SegmentIndex, segment_index_path, write_segment_index
+from src.utils.transcription_cache import TranscriptionCache
+
+def _remember(cache_dir, audio_path, audio_key):
+    TranscriptionCache(cache_dir, max_bytes=0).remember(audio_path, audio_key)
+
+class TestTranscriptionCache(unittest.TestCase):
+    def setUp(self):
+        """Initialise un cache et des fichiers audio factices."""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = TranscriptionCache(os.path.join(self.test_dir, "cache"), max_bytes=0)
+        self.audio = os.path.join(self.test_dir, "video.wav")
+        with open(self.audio, "wb") as f:
+            f.write(b"RIFF" + b"\x00" * 64)
+        self.transcript = os.path.join(self.test_dir, "video_transcription.txt")
+        with open(self.transcript, "w", encoding="utf-8") as f:
+            f.write("Bonjour à tous")
+
+    def tearDown(self):
+        """Nettoie l'environnement après les tests."""
+        shutil.rmtree(self.test_dir)
+
+    def test_unknown_file_has_no_key(self):
+        """Teste qu'un fichier jamais vu n'a pas d'empreinte connue."""
+        self.assertIsNone(self.cache.known_audio_key(self.audio))
+
+    def test_same_content_under_another_name(self):
+        """Teste qu'une copie renommée du même audio retrouve la transcription."""
+        self.cache.remember(self.audio, "cle-audio")
+        self.cache.put("cle-audio", "base", "fr", self.transcript)
+
+        renamed = os.path.join(self.test_dir, "autre titre.wav")
+        shutil.copyfile(self.audio, renamed)
+        audio_key = self.cache.known_audio_key(renamed)
+        self.assertEqual(audio_key, "cle-audio")
+        with open(self.cache.get(audio_key, "base", "fr"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Bonjour à tous")
+
+    def test_concurrent_processes_keep_every_entry(self):
+        """Teste que des processus qui enrichissent l'index en même temps ne perdent aucune entrée."""
+        paths = []
+        for i in range(12):
+            path = os.path.join(self.test_dir, f"video{i}.wav")
+            with open(path, "wb") as f:
+                f.write(b"RIFF" + bytes([i]) * 64)
+            paths.append(path)
+        cache_dir = str(self.cache.cache_dir)
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_remember, [cache_dir] * len(paths), paths, [f"cle-{i}" for i in range(len(paths))]))
+        self.assertEqual([self.cache.known_audio_key(path) for path in paths],
+                         [f"cle-{i}" for i in range(len(paths))])
+
+    def test_key_includes_model_and_language(self):
+        """Teste qu'un autre modèle ou une autre langue ne partage pas l'entrée."""
+        self.cache.put("cle-audio", "base", "fr", self.transcript)
+        self.assertIsNone(self.cache.get("cle-audio", "medium", "fr"))
+        self.assertIsNone(self.cache.get("cle-audio", "base", "en"))
+
+    def test_size_based_eviction(self):
+        """Teste l'éviction des entrées les plus anciennes au-delà de la taille maximale."""
+        self.cache.max_bytes = 30
+        self.cache.put("a", "base", "fr", self.transcript)
+        os.utime(self.cache.get("a", "base", "fr"), (0, 0))
+        self.cache.put("b", "base", "fr", self.transcript)
+        self.cache.put("c", "base", "fr", self.transcript)
+        self.assertIsNone(self.cache.get("a", "base", "fr"))
+        self.assertIsNotNone(self.cache.get("c", "base", "fr"))
+
+    def test_segment_index_is_cached(self):
+        """Teste que la table des segments est mise en cache avec la transcription."""
+        write_segment_index(segment_index_path(self.transcript),
+                            [{"text": "Bonjour à tous", "start": 0.0, "end": 1.5, "avg_logprob": -0.3}])
+        cached_path = self.cache.put("cle-audio", "base", "fr", self.transcript)
+        with SegmentIndex.open(cached_path) as index:
+            self.assertEqual(index[0].text, "Bonjour à tous")
+
+if __name__ == '__main__':
+    unittest.main()
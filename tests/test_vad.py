@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from src.vad import SpeechTimeline, extract_speech, speech_regions
+
+SAMPLE_RATE = 16000
+
+def silence(seconds: float, rng) -> np.ndarray:
+    return rng.normal(0, 0.001, int(seconds * SAMPLE_RATE)).astype(np.float32)
+
+def voice(seconds: float, rng) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    return tone.astype(np.float32) + silence(seconds, rng)
+
+class TestVoiceActivityDetection(unittest.TestCase):
+    def setUp(self):
+        """Enregistrement : 2 s de silence, 1,5 s de parole, une pause courte, 1 s de parole, 3 s de silence, 1 s de parole."""
+        rng = np.random.default_rng(0)
+        self.samples = np.concatenate([silence(2, rng), voice(1.5, rng), silence(0.2, rng), voice(1, rng),
+                                       silence(3, rng), voice(1, rng), silence(2, rng)])
+
+    def test_speech_regions(self):
+        """Teste que les silences longs sont écartés et les pauses courtes conservées."""
+        regions = [(start / SAMPLE_RATE, end / SAMPLE_RATE) for start, end in speech_regions(self.samples)]
+        self.assertEqual(len(regions), 2)
+        for (start, end), (expected_start, expected_end) in zip(regions, [(1.8, 4.9), (7.5, 8.9)]):
+            self.assertAlmostEqual(start, expected_start, delta=0.05)
+            self.assertAlmostEqual(end, expected_end, delta=0.05)
+        self.assertEqual(speech_regions(np.zeros(SAMPLE_RATE, dtype=np.float32)), [])
+        self.assertEqual(speech_regions(np.zeros(0, dtype=np.float32)), [])
+
+    def test_timestamps_are_remapped(self):
+        """Teste que les horodatages de l'audio réduit sont replacés sur la chronologie d'origine."""
+        speech, timeline = extract_speech(self.samples)
+        self.assertLess(len(speech), len(self.samples) / 2)
+        self.assertAlmostEqual(timeline.speech_seconds, 4.5, delta=0.1)
+        first, second = timeline.durations[0], timeline.compact_starts[1]
+        segments = timeline.remap_segments([
+            {"text": " Bonjour.", "start": 0.0, "end": 1.0},
+            # Segment commencé dans le silence inséré : il commence avec la région suivante
+            {"text": " Suite.", "start": first + 0.1, "end": second + 0.5},
+        ])
+        self.assertAlmostEqual(segments[0]["start"], 1.8, delta=0.05)
+        self.assertAlmostEqual(segments[0]["end"], 2.8, delta=0.05)
+        self.assertAlmostEqual(segments[1]["start"], timeline.original_starts[1])
+        self.assertAlmostEqual(segments[1]["end"], timeline.original_starts[1] + 0.5)
+        self.assertEqual(segments[1]["text"], " Suite.")
+        self.assertEqual(SpeechTimeline([]).to_original(3.0), 3.0)
+
+if __name__ == '__main__':
+    unittest.main()